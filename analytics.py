@@ -0,0 +1,158 @@
+from operator import itemgetter
+
+import numpy as np
+import pandas as pd
+
+# 🌟 추정 1RM 공식들 (w: 무게 배열, r: 횟수 배열) - 모두 배열 단위로 한 번에 계산
+ONE_RM_FORMULAS = {
+    "epley": lambda w, r: w * (1.0 + r / 30.0),
+    # Brzycki는 37회 이상이면 분모가 0 이하가 되므로 계산하지 않음(NaN)
+    "brzycki": lambda w, r: np.where(r < 37, w * 36.0 / np.maximum(37.0 - r, 1.0), np.nan),
+    "lombardi": lambda w, r: w * np.power(r, 0.10),
+}
+FORMULA_LABELS = {"epley": "Epley", "brzycki": "Brzycki", "lombardi": "Lombardi"}
+
+DAILY_COLUMNS = ["volume", "one_rm", "sets"]
+
+
+class TrainingData:
+    """세트 기록을 (날짜, 종목, 무게, 횟수) 열 배열로 한 번만 읽어두고 여러 지표를 벡터 연산으로 계산"""
+
+    def __init__(self, dates, exercises, weights, reps):
+        # 날짜 문자열은 종류가 적으므로 고유값만 한 번씩 변환해서 펼침
+        codes, uniques = pd.factorize(np.asarray(dates, dtype=object))
+        parsed = pd.to_datetime(pd.Index(uniques, dtype=object), format="%Y-%m-%d").to_numpy(dtype="datetime64[ns]")
+        self.dates = parsed[codes]
+        # 종목도 고유값 몇 개뿐 - factorize 한 코드로 바로 Categorical을 만듦 (pd.Categorical(배열)보다 빠름)
+        codes, uniques = pd.factorize(np.asarray(exercises, dtype=object), sort=True)
+        self.exercises = pd.Categorical.from_codes(codes, uniques)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.reps = np.asarray(reps, dtype=np.float64)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """[(date, exercise, weight, reps), ...] → TrainingData"""
+        # 🚀 DataFrame을 거치지 않고 열마다 np.fromiter로 바로 배열을 채움 (행 → 열 변환이 처음 그리기 시간의 대부분)
+        n = len(rows)
+        def column(i, dtype):
+            return np.fromiter(map(itemgetter(i), rows), dtype=dtype, count=n)
+        return cls(column(0, object), column(1, object), column(2, np.float64), column(3, np.float64))
+
+    @classmethod
+    def from_db(cls, db, exercise=None, start_date="2000-01-01", end_date="9999-12-31"):
+        return cls.from_rows(db.get_sets(exercise, start_date, end_date))
+
+    def __len__(self):
+        return len(self.weights)
+
+    def volume(self):
+        return self.weights * self.reps
+
+    def one_rm(self, formula="epley"):
+        return ONE_RM_FORMULAS[formula](self.weights, self.reps)
+
+    def _mask(self, exercise):
+        if exercise is None:
+            return slice(None)
+        return np.asarray(self.exercises == exercise)
+
+    def daily(self, exercise=None, formula="epley"):
+        """날짜별 총 볼륨 / 최고 추정 1RM / 세트 수 (index: 날짜)"""
+        mask = self._mask(exercise)
+        weights, reps = self.weights[mask], self.reps[mask]
+        frame = pd.DataFrame({
+            "date": self.dates[mask],
+            "volume": weights * reps,
+            "one_rm": ONE_RM_FORMULAS[formula](weights, reps),
+        })
+        if frame.empty:
+            return pd.DataFrame(columns=DAILY_COLUMNS, index=pd.DatetimeIndex([], name="date"))
+        grouped = frame.groupby("date", sort=True)
+        daily = grouped.agg(volume=("volume", "sum"), one_rm=("one_rm", "max"), sets=("volume", "size"))
+        return daily
+
+    def personal_records(self, formula="epley"):
+        """종목별로 추정 1RM 최고 기록을 갱신한 세트만 (날짜순)"""
+        one_rm = self.one_rm(formula)
+        frame = pd.DataFrame({
+            "date": self.dates,
+            "exercise": self.exercises,
+            "weight": self.weights,
+            "reps": self.reps,
+            "one_rm": one_rm,
+        }).sort_values(["exercise", "date"], kind="stable")
+        # 🚀 종목별 누적 최댓값을 한 번에 구하고 한 칸 밀어 "그 세트 이전까지의 최고"로 씀 (NaN인 세트는 기록을 끊지 않음)
+        exercise = frame["exercise"]
+        best = frame["one_rm"].fillna(-np.inf).groupby(exercise, observed=True).cummax()
+        best_before = best.groupby(exercise, observed=True).shift(fill_value=-np.inf)
+        return frame[frame["one_rm"] > best_before].sort_values("date", kind="stable").reset_index(drop=True)
+
+
+def daily_from_trend(trend):
+    """DB 요약 결과 [(date, 볼륨, 최고 1RM)] → TrainingData.daily()와 같은 모양의 DataFrame"""
+    if not trend:
+        return pd.DataFrame(columns=DAILY_COLUMNS, index=pd.DatetimeIndex([], name="date"))
+    dates, volumes, one_rms = zip(*trend)
+    return pd.DataFrame(
+        {"volume": np.asarray(volumes, dtype=np.float64), "one_rm": np.asarray(one_rms, dtype=np.float64), "sets": np.nan},
+        index=pd.DatetimeIndex(pd.to_datetime(list(dates)), name="date"),
+    )
+
+
+def load_training_data(db, exercises, start_date, end_date):
+    """종목(들)·기간별 TrainingData. 세트를 읽고 열 배열로 바꾸는 비용(벡터 연산보다 큼)은 처음 한 번만 -
+    WorkoutDB 캐시에 두므로 공식을 바꿔 다시 그려도 재사용하고, 세트가 바뀌면 workout_records 캐시와 같이 비워짐"""
+    key = exercises if exercises is None or isinstance(exercises, str) else tuple(exercises)
+    return db.cached("workout_records", "training_data", (key, start_date, end_date),
+                     lambda: TrainingData.from_db(db, exercises, start_date, end_date))
+
+
+def load_daily(db, exercise, start_date, end_date, formula="epley"):
+    """화면용 일별 지표. Epley는 DB 요약(날짜당 한 줄)을 쓰고, 다른 공식은 세트를 받아 벡터 연산"""
+    if formula == "epley":
+        return daily_from_trend(db.get_volume_and_1rm_trend(exercise, start_date, end_date))
+    return load_training_data(db, exercise, start_date, end_date).daily(exercise, formula)
+
+
+def align_daily(dailies):
+    """{종목: daily} → 모든 종목을 같은 날짜 index로 맞춤 (그 종목을 안 한 날은 NaN)"""
+    index = pd.DatetimeIndex([], name="date")
+    for daily in dailies.values():
+        index = index.union(daily.index)
+    return {exercise: daily.reindex(index) for exercise, daily in dailies.items()}
+
+
+def load_multi_daily(db, exercises, start_date, end_date, formula="epley"):
+    """여러 종목 비교용 {종목: daily}. 종목 수와 상관없이 조회 한 번, 날짜 index는 모두 같음"""
+    exercises = list(dict.fromkeys(exercises))
+    if not exercises:
+        return {}
+    if formula == "epley":
+        by_exercise = {exercise: [] for exercise in exercises}
+        for d, exercise, volume, one_rm in db.get_multi_trend(exercises, start_date, end_date):
+            by_exercise[exercise].append((d, volume, one_rm))
+        return align_daily({exercise: daily_from_trend(trend) for exercise, trend in by_exercise.items()})
+    data = load_training_data(db, exercises, start_date, end_date)
+    return align_daily({exercise: data.daily(exercise, formula) for exercise in exercises})
+
+
+def rolling_average(daily, column="one_rm", window=7):
+    """운동한 날 기준 최근 window회 이동 평균"""
+    return daily[column].rolling(window, min_periods=1).mean()
+
+
+def resample(daily, rule="W"):
+    """주(W)/월(M) 단위로 묶기: 볼륨은 합계, 1RM은 최댓값, 운동 안 한 구간은 제외"""
+    rule = {"M": "MS", "W": "W-MON"}.get(rule, rule)
+    grouped = daily.resample(rule, label="left", closed="left")
+    result = pd.DataFrame({"volume": grouped["volume"].sum(), "one_rm": grouped["one_rm"].max(), "sets": grouped["sets"].sum(min_count=1)})
+    return result[result["one_rm"].notna()]
+
+
+def record_flags(daily, column="one_rm"):
+    """해당 날짜에 지금까지의 최고 기록을 새로 세웠는지 (True/False 배열)"""
+    values = daily[column].to_numpy(dtype=np.float64)
+    if len(values) == 0:
+        return np.zeros(0, dtype=bool)
+    best_before = np.concatenate(([-np.inf], np.fmax.accumulate(values)[:-1]))
+    return values > best_before
@@ -0,0 +1,79 @@
+"""📊 분석 엔진 벤치마크: 기존 파이썬 루프 vs NumPy/pandas 벡터 연산
+
+    python benchmarks/bench_analytics.py [세트 수]   (기본 1,000,000세트)
+
+새 방식은 세트를 열 배열로 바꾸는 비용(from_rows, 열마다 np.fromiter)까지 넣은 합계로 비교합니다.
+화면은 한 번 만든 TrainingData 를 캐시해 두고(analytics.load_training_data) 다시 그릴 때는 벡터 연산만 합니다.
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from analytics import TrainingData, resample, rolling_average
+from db_supabase import aggregate_daily_trend
+
+
+def make_history(n_sets, n_days=3650, exercises=("스쿼트", "벤치프레스", "데드리프트", "오버헤드프레스")):
+    rng = random.Random(42)
+    start = np.datetime64("2016-01-01")
+    day_strings = [str(start + i) for i in range(n_days)]
+    return [(day_strings[rng.randrange(n_days)], rng.choice(exercises), rng.randrange(8, 120) * 2.5, rng.randint(1, 15))
+            for _ in range(n_sets)]
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def speed(base, elapsed):
+    if elapsed <= base:
+        return f"{base / elapsed:5.1f}배 빠름"
+    return f"{elapsed / base:5.1f}배 느림"
+
+
+def main():
+    n_sets = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rows = make_history(n_sets)
+    exercise = "스쿼트"
+    print(f"세트 {n_sets:,}개 / 종목 '{exercise}' 기준")
+
+    # 화면은 고른 종목의 세트만 받으므로(get_sets(exercise)) 두 방식 모두 그 종목 세트에서 시작
+    sets = [row for row in rows if row[1] == exercise]
+
+    # 기존 방식: 세트마다 파이썬 루프 (get_volume_and_1rm_trend 와 같은 계산)
+    loop_time, loop_result = timed(lambda: aggregate_daily_trend([(d, w, r) for d, _, w, r in sets]))
+
+    load_time, data = timed(lambda: TrainingData.from_rows(sets))
+    vec_time, daily = timed(lambda: data.daily(exercise))
+    redraw_time, _ = timed(lambda: data.daily(exercise, "brzycki"))
+    extra_time, _ = timed(lambda: (
+        data.daily(exercise, "brzycki"), data.daily(exercise, "lombardi"),
+        rolling_average(daily), resample(daily, "W"), resample(daily, "M"),
+    ))
+    pr_time, _ = timed(lambda: data.personal_records())
+    all_load_time, _ = timed(lambda: TrainingData.from_rows(rows))
+
+    same = len(loop_result) == len(daily) and np.array_equal([r[2] for r in loop_result], daily["one_rm"].to_numpy()) \
+        and np.allclose([r[1] for r in loop_result], daily["volume"].to_numpy())
+    first_time = load_time + vec_time
+    print(f"  ('{exercise}' 세트 {len(sets):,}개)")
+    print(f"  기존 루프 (일별 볼륨/Epley 1RM)            : {loop_time * 1000:9.1f} ms")
+    print(f"  새 방식 처음 그리기 (읽기 + 벡터 연산)      : {first_time * 1000:9.1f} ms  → {speed(loop_time, first_time)}")
+    print(f"    - 열 배열로 읽기 (from_rows)              : {load_time * 1000:9.1f} ms")
+    print(f"    - 벡터 연산 (일별 볼륨/Epley 1RM)         : {vec_time * 1000:9.1f} ms")
+    print(f"  새 방식 다시 그리기 (캐시된 배열, 공식 변경): {redraw_time * 1000:9.1f} ms  → {speed(loop_time, redraw_time)}")
+    print(f"  벡터 연산 (공식 2개+이동평균+주/월)         : {extra_time * 1000:9.1f} ms")
+    print(f"  PR 세트 찾기 (종목별 cummax)                : {pr_time * 1000:9.1f} ms")
+    print(f"  참고: 전체 종목 {n_sets:,}세트 읽기 (from_rows): {all_load_time * 1000:9.1f} ms")
+    print(f"  결과 일치: {'✅' if same else '❌'}")
+
+
+if __name__ == '__main__':
+    main()
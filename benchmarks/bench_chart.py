@@ -0,0 +1,99 @@
+"""📈 분석 그래프 다시 그리기 벤치마크: 기존 방식(축 지우고 전부 새로 그리기) vs TrendChart
+
+    python benchmarks/bench_chart.py [날짜 수 ...]   (기본 30 100 365 1000 3650)
+"""
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from analytics import record_flags, rolling_average
+from chart_render import TrendChart
+
+
+def make_daily(n_days, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2016-01-01", periods=n_days, freq="D", name="date")
+    one_rm = 60 + np.cumsum(rng.normal(0.05, 1.0, n_days)).clip(-40, None)
+    volume = rng.integers(20, 120, n_days) * 50.0
+    sets = rng.integers(3, 25, n_days).astype(float)
+    return pd.DataFrame({"volume": volume, "one_rm": one_rm, "sets": sets}, index=index)
+
+
+def old_paint(figure, ax1, ax2, daily):
+    # 기존 AnalysisWindow.paint_graph 와 같은 순서 (clear → 날짜 문자열 축 → 점마다 글자 → tight_layout → draw)
+    ax1.clear()
+    ax2.clear()
+    dates = list(daily.index.strftime('%m-%d'))
+    volumes = daily['volume'].tolist()
+    onerms = daily['one_rm'].round(1).tolist()
+    trend_avg = rolling_average(daily).tolist()
+    records = record_flags(daily)
+    ax1.bar(dates, volumes, color='#E2E8F0', edgecolor='#CBD5E0', label='총 볼륨 (kg)', width=0.5)
+    ax1.set_ylim(0, max(volumes) * 1.3)
+    ax2.plot(dates, onerms, marker='o', color='#E53E3E', linewidth=3, markersize=8, label='추정 1RM (kg)')
+    ax2.plot(dates, trend_avg, linestyle='--', color='#805AD5', linewidth=2, label='1RM 7회 이동평균')
+    ax2.scatter([d for d, r in zip(dates, records) if r], [v for v, r in zip(onerms, records) if r],
+                marker='*', s=220, color='#D69E2E', zorder=5, label='최고 기록 갱신')
+    for i, v in enumerate(onerms):
+        ax2.text(i, v + (max(onerms) * 0.02), f"{v}kg", ha='center', va='bottom')
+    ax1.set_title("'스쿼트' 성장 퍼포먼스")
+    lines_1, labels_1 = ax1.get_legend_handles_labels()
+    lines_2, labels_2 = ax2.get_legend_handles_labels()
+    ax1.legend(lines_1 + lines_2, labels_1 + labels_2, loc='upper left')
+    figure.tight_layout()
+    figure.canvas.draw()
+
+
+def timed(fn, repeat=3):
+    # 가장 빠른 회차 기준 (첫 회의 글꼴 캐시 등은 제외)
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    warnings.filterwarnings("ignore", category=UserWarning)  # 한글 글꼴 없음, tight_layout 실패 경고 숨김
+    sizes = [int(a) for a in sys.argv[1:]] or [30, 100, 365, 1000, 3650]
+    print(f"{'날짜 수':>8} | {'기존 (ms)':>10} | {'새로 그리기 (ms)':>16} | {'blit (ms)':>10} | 배율")
+    for n_days in sizes:
+        daily = make_daily(n_days)
+        # 같은 축 범위에서 값만 조금 바뀐 조회 (공식 변경/기록 수정 후 다시 조회 같은 경우)
+        nudged = daily.assign(one_rm=daily['one_rm'] * 1.001)
+
+        old_fig, old_ax1 = plt.subplots(figsize=(9, 5))
+        old_ax2 = old_ax1.twinx()
+        old_time = timed(lambda: old_paint(old_fig, old_ax1, old_ax2, daily), repeat=1 if n_days > 1000 else 3)
+        plt.close(old_fig)
+
+        fig, _ = plt.subplots(figsize=(9, 5))
+        chart = TrendChart(fig, fig.canvas)
+
+        def full():
+            chart.layout_key = None  # 축 범위가 바뀐 것처럼 배경까지 다시
+            chart.update(daily, "스쿼트", "Epley")
+
+        full_time = timed(full)
+        chart.update(daily, "스쿼트", "Epley")
+        layout_before = chart.layout_key
+        blit_time = timed(lambda: chart.update(nudged, "스쿼트", "Epley"))
+        same_layout = chart.layout_key == layout_before
+        plt.close(fig)
+
+        print(f"{n_days:>8,} | {old_time * 1000:10.1f} | {full_time * 1000:16.1f} | {blit_time * 1000:10.1f} | "
+              f"{old_time / full_time:5.1f}배 / {old_time / blit_time:5.1f}배{'' if same_layout else ' (blit 안 됨)'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""🍽️ 음식 자동완성 색인 벤치마크: 매번 목록 전체 훑기 vs FoodIndex
+
+    python benchmarks/bench_food_index.py [음식 수]   (기본 50,000개)
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from food_index import FoodIndex, to_jamo
+
+BASES = ["닭가슴살", "닭다리살", "현미밥", "백미밥", "고구마", "바나나", "오트밀", "그릭요거트", "연어", "소고기", "돼지목살",
+         "두부", "계란", "아몬드", "단백질쉐이크", "브로콜리", "샐러드", "김치찌개", "된장찌개", "불고기", "비빔밥", "떡볶이"]
+STYLES = ["구운", "삶은", "훈제", "양념", "저염", "매콤", "간장", "크림", "통", "냉동", "수제", "오리지널"]
+BRANDS = ["마트", "편의점", "홈메이드", "브랜드A", "브랜드B", "브랜드C", "식당"]
+# (검색어, 설명)
+QUERIES = [("닭", "한 글자"), ("ㄷㄱㅅ", "초성"), ("닭가ㅅ", "치는 도중"), ("훈제 연어", "두 낱말"), ("가슴살", "중간 글자"),
+           ("닥가슴살 100", "오타"), ("없는음식이름", "없는 말")]
+
+
+def make_foods(n_foods, seed=7):
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < n_foods:
+        names.add(f"{rng.choice(STYLES)} {rng.choice(BASES)} {rng.choice(BRANDS)} {rng.randint(1, 500)}g")
+    guide = [{"food_name": name, "protein": rng.randint(0, 40), "calories": rng.randint(20, 800)} for name in sorted(names)]
+    history = [(row["food_name"], row["calories"], rng.randint(0, 80), row["protein"], rng.randint(0, 30), rng.randint(1, 50))
+               for row in rng.sample(guide, 300)]
+    return guide, history
+
+
+def scan(guide, query, limit=10):
+    # 색인 없이: 음식마다 자모로 풀어서 포함 여부 비교
+    key = to_jamo(query)
+    return [row for row in guide if key in to_jamo(row["food_name"])][:limit]
+
+
+def timed(fn, repeat=200):
+    # 중앙값 기준 (한 번 튀는 값 제외)
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return sorted(times)[len(times) // 2]
+
+
+def main():
+    n_foods = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    guide, history = make_foods(n_foods)
+    started = time.perf_counter()
+    index = FoodIndex.build(guide, history)
+    print(f"음식 {len(index):,}개 색인 만들기: {time.perf_counter() - started:.2f}초")
+
+    print(f"{'검색어':<22} | {'훑기 (ms)':>10} | {'색인 (ms)':>10} | 첫 결과")
+    for query, label in QUERIES:
+        scan_time = timed(lambda: scan(guide, query), repeat=3)
+        index_time = timed(lambda: index.lookup(query))
+        found = index.lookup(query)
+        print(f"{query + f' ({label})':<22} | {scan_time * 1000:10.1f} | {index_time * 1000:10.3f} | {found[0]['name'] if found else '-'}")
+
+    started = time.perf_counter()
+    for i in range(1000):
+        index.add_eaten(f"새 음식 {i}", 100, 10, 10, 1)
+    print(f"음식 1,000개 하나씩 추가: 개당 {(time.perf_counter() - started):.3f}ms")
+
+
+if __name__ == '__main__':
+    main()
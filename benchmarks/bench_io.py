@@ -0,0 +1,78 @@
+"""📦 가져오기/내보내기 벤치마크 + 확인: CSV 로 내보냈다가 새 DB 로 가져와서 줄 수가 같은지
+
+    python benchmarks/bench_io.py [세트 수]   (기본 20,000개)
+
+Supabase(PostgREST)처럼 요청 한 번에 1000줄까지만 주는 저장소로도 내보내서,
+짧은 페이지를 끝으로 착각해 1000줄에서 멈추지 않는지 확인합니다.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_io import export_table, import_file
+from db_sqlite import SQLiteBackend, new_client_key
+from db_supabase import MAX_ROWS_PER_REQUEST, WorkoutDB
+
+EXERCISES = ["스쿼트", "벤치프레스", "데드리프트", "오버헤드프레스", "바벨로우"]
+
+
+class CappedBackend(SQLiteBackend):
+    """get_rows_page 가 한 번에 MAX_ROWS_PER_REQUEST 줄까지만 돌려주는 SQLite (Supabase 흉내)"""
+
+    def get_rows_page(self, table, columns, key, after, limit):
+        return super().get_rows_page(table, columns, key, after, min(limit, MAX_ROWS_PER_REQUEST))
+
+
+def make_sets(n_sets, seed=42):
+    rng = random.Random(seed)
+    return [{"date": f"20{rng.randint(16, 26)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+             "exercise": rng.choice(EXERCISES), "set_num": rng.randint(1, 5), "weight": rng.randint(20, 200) * 1.0,
+             "reps": rng.randint(1, 15), "client_key": new_client_key()} for _ in range(n_sets)]
+
+
+def count_lines(path):
+    with open(path, encoding="utf-8-sig") as f:
+        return sum(1 for _ in f) - 1  # 머리글 제외
+
+
+def main():
+    n_sets = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    failed = False
+    with tempfile.TemporaryDirectory() as folder:
+        source_path = os.path.join(folder, "source.db")
+        source = SQLiteBackend(source_path)
+        sets = make_sets(n_sets)
+        for i in range(0, n_sets, 5000):
+            source.upsert_rows("workout_records", sets[i:i + 5000], "client_key")
+        source.close()
+
+        print(f"{'저장소':<20} | {'내보낸 줄':>10} | {'시간 (ms)':>10} | 결과")
+        for label, backend in (("SQLite", SQLiteBackend(source_path)),
+                               (f"{MAX_ROWS_PER_REQUEST}줄 제한", CappedBackend(source_path))):
+            path = os.path.join(folder, f"{label}.csv")
+            started = time.perf_counter()
+            exported = export_table(WorkoutDB(backend, cache=None), "workout_records", path)
+            elapsed = time.perf_counter() - started
+            ok = exported == n_sets == count_lines(path)
+            failed = failed or not ok
+            print(f"{label:<20} | {exported:>10,} | {elapsed * 1000:10.1f} | {'✅' if ok else f'❌ {n_sets:,}줄이어야 함'}")
+
+        target = WorkoutDB(SQLiteBackend(os.path.join(folder, "target.db")), cache=None)
+        started = time.perf_counter()
+        imported, skipped, _ = import_file(target, "workout_records", path)
+        elapsed = time.perf_counter() - started
+        # client_key 가 파일에 있으므로 같은 파일을 다시 가져와도 줄이 늘지 않아야 함
+        import_file(target, "workout_records", path)
+        total = target.backend._query("SELECT COUNT(*) FROM workout_records")[0][0]
+        ok = imported == n_sets and total == n_sets and not skipped
+        failed = failed or not ok
+        print(f"{'가져오기 (2번)':<20} | {total:>10,} | {elapsed * 1000:10.1f} | {'✅' if ok else f'❌ {n_sets:,}줄이어야 함'}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
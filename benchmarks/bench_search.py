@@ -0,0 +1,73 @@
+"""🔍 노트 검색 벤치마크: LIKE 로 전부 훑기 vs FTS5 색인 (3글자 이상은 trigram, 짧은 검색어는 bigram)
+
+    python benchmarks/bench_search.py [노트 수]   (기본 100,000개)
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_sqlite import SQLiteBackend, new_client_key
+
+WORDS = ["스쿼트", "벤치프레스", "데드리프트", "오버헤드프레스", "브레이싱", "견갑골", "무릎", "발끝", "그립", "아치",
+         "호흡", "템포", "디로딩", "점진적", "과부하", "단백질", "수면", "스트레칭", "폼롤러", "코어", "하체", "등운동",
+         "중량", "반복", "세트", "휴식", "자극", "통증", "컨디션", "루틴"]
+SYLLABLES = "가나다라마바사아자차카타파하거너더러머버서어저처커터퍼허고노도로모보소오조초"
+# (검색어, 설명) - 실제 노트처럼 대부분의 낱말은 드물게 나옴
+QUERIES = [("브레이싱", "자주 나오는 말"), ("오버헤드프레스 스트레칭", "두 낱말"), ("없는검색어", "없는 말"),
+           ("코어", "2글자 말"), ("무릎 하체", "2글자 두 낱말"), ("없는 검색", "2글자 없는 말")]
+
+
+def make_notes(n_notes, seed=42):
+    rng = random.Random(seed)
+    # 운동 용어 30개 + 아무 뜻 없는 낱말 2만 개 (노트 하나에 운동 용어는 몇 개만)
+    filler = ["".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))) for _ in range(20_000)]
+    notes = []
+    for _ in range(n_notes):
+        words = rng.choices(filler, k=rng.randint(20, 120)) + rng.sample(WORDS, 3)
+        rng.shuffle(words)
+        notes.append({"title": " ".join(rng.sample(WORDS, 2)), "content": " ".join(words), "client_key": new_client_key()})
+    return notes
+
+
+def timed(fn, repeat=5):
+    # 가장 빠른 회차 기준 (첫 회의 페이지 캐시 등은 제외)
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    n_notes = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as folder:
+        backend = SQLiteBackend(os.path.join(folder, "bench.db"))
+        if not backend.fts:
+            print("이 SQLite 는 FTS5 trigram 을 지원하지 않아 LIKE 만 쓸 수 있습니다.")
+            return
+        started = time.perf_counter()
+        notes = make_notes(n_notes)
+        for i in range(0, n_notes, 5000):
+            backend.upsert_rows("notes", notes[i:i + 5000], "client_key")
+        print(f"노트 {n_notes:,}개 저장 + 색인: {time.perf_counter() - started:.1f}초")
+
+        print(f"{'검색어':<24} | {'찾은 노트':>8} | {'LIKE (ms)':>10} | {'FTS (ms)':>9} | 배율")
+        # 드문 말: 가운데쯤 노트 본문에서 3글자 이상 낱말 하나
+        rare = next(w for w in notes[n_notes // 2]["content"].split() if len(w) >= 3 and w not in WORDS)
+        for query, label in QUERIES[:2] + [(rare, "드문 말")] + QUERIES[2:]:
+            found = len(backend.search_notes(query, n_notes))
+            backend.fts = backend.bigram_fts = False
+            like_time, _ = timed(lambda: backend.search_notes(query, 20))
+            backend.fts = backend.bigram_fts = True
+            fts_time, _ = timed(lambda: backend.search_notes(query, 20))
+            print(f"{query + f' ({label})':<24} | {found:>8,} | {like_time * 1000:10.1f} | {fts_time * 1000:9.1f} | {like_time / fts_time:6.2f}배")
+        backend.close()
+
+
+if __name__ == '__main__':
+    main()
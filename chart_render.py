@@ -0,0 +1,261 @@
+import math
+
+import numpy as np
+from matplotlib.collections import PolyCollection
+from matplotlib.ticker import FuncFormatter, MaxNLocator
+
+from analytics import align_daily, record_flags, resample, rolling_average
+
+# 🌟 이보다 날짜가 많으면 주(그래도 많으면 월) 단위로 묶어서 그림
+MAX_POINTS = 300
+# 막대 위 "00kg" 글자는 최대 이만큼만 (k번째 점마다 하나씩)
+MAX_LABELS = 25
+# 종목 비교 차트의 선 색 (종목 순서대로)
+COMPARE_COLORS = ['#E53E3E', '#3182CE', '#38A169', '#D69E2E', '#805AD5', '#DD6B20', '#319795', '#D53F8C']
+
+
+def decimate(daily, max_points=MAX_POINTS):
+    """(그릴 DataFrame, 묶음 단위 이름 또는 None)"""
+    if len(daily) <= max_points:
+        return daily, None
+    weekly = resample(daily, "W")
+    if len(weekly) <= max_points:
+        return weekly, "주"
+    return resample(daily, "M"), "월"
+
+
+def decimate_many(dailies, max_points=MAX_POINTS):
+    """같은 날짜 index로 맞춘 {종목: daily}를 한꺼번에 묶기 → (묶은 dict, 묶음 단위 이름 또는 None)"""
+    n = max((len(daily) for daily in dailies.values()), default=0)
+    if n <= max_points:
+        return dailies, None
+    weekly = align_daily({exercise: resample(daily, "W") for exercise, daily in dailies.items()})
+    if max(len(daily) for daily in weekly.values()) <= max_points:
+        return weekly, "주"
+    return align_daily({exercise: resample(daily, "M") for exercise, daily in dailies.items()}), "월"
+
+
+def tick_format(index, unit):
+    """x축 날짜 글자 형식: 월 단위면 연-월, 한 해 안이면 월-일"""
+    if unit == "월":
+        return '%Y-%m'
+    return '%m-%d' if len(index) == 0 or index[0].year == index[-1].year else '%y-%m-%d'
+
+
+def label_positions(n, max_labels=MAX_LABELS):
+    """글자를 붙일 점 번호들: k번째마다 + 마지막 점은 항상"""
+    if n == 0:
+        return []
+    step = max(1, math.ceil(n / max_labels))
+    positions = list(range(0, n, step))
+    if positions[-1] != n - 1:
+        positions[-1] = n - 1
+    return positions
+
+
+def _nice_ceil(value):
+    # 조회할 때마다 축 범위가 조금씩 달라지면 배경을 매번 다시 그려야 하므로 깔끔한 값으로 올림
+    if value <= 0:
+        return 1.0
+    magnitude = 10 ** math.floor(math.log10(value))
+    return math.ceil(value / magnitude * 2) / 2 * magnitude
+
+
+def _nice_floor(value):
+    if value <= 0:
+        return 0.0
+    magnitude = 10 ** math.floor(math.log10(value))
+    return math.floor(value / magnitude * 2) / 2 * magnitude
+
+
+class TrendChart:
+    """볼륨 막대 + 추정 1RM 선 차트를 그리는 객체 (AnalysisWindow 전용)
+
+    축/막대/선/글자 객체는 처음에 한 번만 만들고 조회할 때마다 데이터만 바꿉니다.
+    데이터 객체는 animated로 두고 축·눈금·범례만 배경으로 저장해 두었다가,
+    축 범위와 제목이 그대로면 배경 위에 데이터만 다시 그려서 blit 합니다.
+    """
+
+    def __init__(self, figure, canvas):
+        self.figure = figure
+        self.canvas = canvas
+        self.ax1 = figure.axes[0] if figure.axes else figure.add_subplot(111)
+        self.ax2 = self.ax1.twinx()
+        self.tick_labels = []
+        self.layout_key = None
+        self.background = None
+
+        self.bars = PolyCollection([], facecolors='#E2E8F0', edgecolors='#CBD5E0', label='총 볼륨 (kg)')
+        self.ax1.add_collection(self.bars)
+        self.line, = self.ax2.plot([], [], marker='o', color='#E53E3E', linewidth=3, markersize=8, label='추정 1RM (kg)')
+        self.avg_line, = self.ax2.plot([], [], linestyle='--', color='#805AD5', linewidth=2, label='1RM 7회 이동평균')
+        self.pr_markers, = self.ax2.plot([], [], linestyle='none', marker='*', markersize=16, color='#D69E2E', zorder=5, label='최고 기록 갱신')
+        self.labels = [self.ax2.text(0, 0, '', ha='center', va='bottom', color='#C53030', fontweight='bold', visible=False)
+                       for _ in range(MAX_LABELS)]
+        self.empty_text = self.ax1.text(0.5, 0.5, '', transform=self.ax1.transAxes, ha='center', va='center', fontsize=14, color='gray')
+        self.animated = [self.bars, self.line, self.avg_line, self.pr_markers] + self.labels
+        for artist in self.animated:
+            artist.set_animated(True)
+
+        # 정적인 부분(배경)은 한 번만 설정
+        self.ax1.set_ylabel('총 볼륨 (kg)', color='#718096', fontweight='bold', fontsize=12)
+        self.ax1.tick_params(axis='y', labelcolor='#718096')
+        self.ax2.set_ylabel('추정 1RM (kg)', color='#E53E3E', fontweight='bold', fontsize=12)
+        self.ax2.tick_params(axis='y', labelcolor='#E53E3E')
+        self.ax1.grid(axis='y', linestyle='--', alpha=0.3)
+        # 날짜마다 눈금을 만들지 않고 최대 12개만
+        self.ax1.xaxis.set_major_locator(MaxNLocator(nbins=12, integer=True))
+        self.ax1.xaxis.set_major_formatter(FuncFormatter(self._format_tick))
+        self.legend = self.ax1.legend([self.bars, self.line, self.avg_line, self.pr_markers],
+                                      [a.get_label() for a in (self.bars, self.line, self.avg_line, self.pr_markers)], loc='upper left')
+        # tight_layout은 글자 크기를 전부 재서 느리므로 여백을 고정
+        figure.subplots_adjust(left=0.08, right=0.92, top=0.88, bottom=0.12)
+
+        canvas.mpl_connect('draw_event', self._on_draw)
+
+    def _format_tick(self, x, pos):
+        i = int(round(x))
+        return self.tick_labels[i] if 0 <= i < len(self.tick_labels) else ''
+
+    def _on_draw(self, event):
+        # 전체 그리기가 끝날 때마다 배경을 저장하고 그 위에 데이터를 얹음
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        for artist in self.animated:
+            if artist.get_visible():
+                self.figure.draw_artist(artist)
+
+    def _refresh(self, layout_key):
+        if layout_key != self.layout_key or self.background is None:
+            # 축 범위/눈금/제목이 바뀌면 배경부터 다시 (tight_layout 없이)
+            self.layout_key = layout_key
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self.background)
+        self._draw_animated()
+        self.canvas.blit(self.figure.bbox)
+
+    def show_empty(self, message):
+        for artist in self.animated:
+            artist.set_visible(False)
+        self.empty_text.set_text(message)
+        self.ax1.set_title('')
+        self.ax1.set_xlabel('')
+        self.tick_labels = []
+        self._refresh(("empty", message))
+
+    def update(self, daily, exercise, formula_label):
+        shown, unit = decimate(daily)
+        n = len(shown)
+        x = np.arange(n, dtype=float)
+        volumes = shown['volume'].to_numpy(dtype=float)
+        onerms = np.round(shown['one_rm'].to_numpy(dtype=float), 1)
+        trend_avg = rolling_average(shown).to_numpy(dtype=float)
+        records = record_flags(shown)
+
+        # x축은 0..n-1 숫자, 글자는 포매터가 날짜로 바꿔서 보여줌
+        self.tick_labels = list(shown.index.strftime(tick_format(shown.index, unit)))
+
+        width = 0.5 if n < 60 else 0.8
+        self.bars.set_verts([((i - width / 2, 0), (i - width / 2, v), (i + width / 2, v), (i + width / 2, 0)) for i, v in zip(x, volumes)])
+        self.line.set_data(x, onerms)
+        self.line.set_markersize(8 if n <= 60 else 3)
+        self.avg_line.set_data(x, trend_avg)
+        self.pr_markers.set_data(x[records], onerms[records])
+
+        # 🌟 공식이 계산하지 못한 날(NaN)은 글자를 붙이지 않음 ("nankg" 방지)
+        has_onerm = ~np.isnan(onerms)
+        positions = [i for i in label_positions(n) if has_onerm[i]]
+        offset = np.nanmax(onerms) * 0.02 if has_onerm.any() else 0.0
+        for text, i in zip(self.labels, positions):
+            text.set_position((i, onerms[i] + offset))
+            text.set_text(f"{onerms[i]}kg")
+            text.set_visible(True)
+        for text in self.labels[len(positions):]:
+            text.set_visible(False)
+        for artist in (self.bars, self.avg_line):
+            artist.set_visible(True)
+        # 🌟 1RM이 전부 NaN이면(예: Brzycki에 37회 이상) 1RM 선과 PR 표시를 숨기고 오른쪽 축은 그대로 둠
+        for artist in (self.line, self.pr_markers):
+            artist.set_visible(bool(has_onerm.any()))
+        self.empty_text.set_text('')
+
+        volume_top = _nice_ceil(np.nanmax(volumes) * 1.3)
+        if has_onerm.any():
+            onerm_bottom = _nice_floor(np.nanmin(onerms) * 0.9)
+            onerm_top = _nice_ceil(np.nanmax(onerms) * 1.1)
+        else:
+            onerm_bottom, onerm_top = self.ax2.get_ylim()
+        self.ax1.set_xlim(-0.6, n - 0.4)
+        self.ax1.set_ylim(0, volume_top)
+        self.ax2.set_ylim(onerm_bottom, onerm_top)
+
+        title = f"🚀 '{exercise}' 성장 퍼포먼스" + (f" ({unit} 단위로 묶음)" if unit else "")
+        xlabel = f'운동한 {unit}' if unit else '운동한 날짜 (월-일)'
+        self.ax1.set_title(title, fontsize=16, fontweight='bold', pad=20)
+        self.ax1.set_xlabel(xlabel, fontweight='bold', fontsize=11, color='#4A5568')
+        self.legend.get_texts()[1].set_text(f'추정 1RM (kg, {formula_label})')
+
+        self._refresh((n, tuple(self.tick_labels[:1] + self.tick_labels[-1:]), volume_top, onerm_bottom, onerm_top, title, formula_label))
+
+
+class CompareChart:
+    """여러 종목의 추정 1RM을 한 축에 겹쳐 그리는 차트
+
+    종목별 선은 한 번 만든 뒤 데이터만 바꿔 끼우고, 선택에서 빠진 종목의 선만 지웁니다.
+    기록이 없는 날(NaN)은 건너뛰고 이어서 그립니다.
+    """
+
+    def __init__(self, figure, canvas):
+        self.figure = figure
+        self.canvas = canvas
+        self.ax = figure.add_subplot(111)
+        self.lines = {}
+        self.tick_labels = []
+        self.ax.set_ylabel('추정 1RM (kg)', color='#4A5568', fontweight='bold', fontsize=12)
+        self.ax.grid(axis='y', linestyle='--', alpha=0.3)
+        self.ax.xaxis.set_major_locator(MaxNLocator(nbins=12, integer=True))
+        self.ax.xaxis.set_major_formatter(FuncFormatter(self._format_tick))
+        self.empty_text = self.ax.text(0.5, 0.5, '', transform=self.ax.transAxes, ha='center', va='center', fontsize=14, color='gray')
+        figure.subplots_adjust(left=0.08, right=0.95, top=0.88, bottom=0.12)
+
+    def _format_tick(self, x, pos):
+        i = int(round(x))
+        return self.tick_labels[i] if 0 <= i < len(self.tick_labels) else ''
+
+    def update(self, dailies, formula_label):
+        shown, unit = decimate_many(dailies)
+        index = next(iter(shown.values())).index if shown else []
+        n = len(index)
+        x = np.arange(n, dtype=float)
+        self.tick_labels = list(index.strftime(tick_format(index, unit))) if n else []
+
+        for exercise in [e for e in self.lines if e not in shown]:
+            self.lines.pop(exercise).remove()
+        for i, (exercise, daily) in enumerate(shown.items()):
+            values = np.round(daily['one_rm'].to_numpy(dtype=float), 1)
+            has_value = ~np.isnan(values)
+            line = self.lines.get(exercise)
+            if line is None:
+                line, = self.ax.plot([], [], marker='o', linewidth=2.5, label=exercise)
+                self.lines[exercise] = line
+            line.set_color(COMPARE_COLORS[i % len(COMPARE_COLORS)])
+            line.set_markersize(6 if n <= 60 else 2)
+            line.set_data(x[has_value], values[has_value])
+            line.set_visible(bool(has_value.any()))
+
+        # 🌟 값이 하나도 없는 종목(공식이 전부 NaN)은 축 범위 계산에서 빠짐 - 모두 비면 이전 축 범위 유지
+        values = np.concatenate([np.asarray(line.get_ydata(), dtype=float) for line in self.lines.values()]) if self.lines else np.array([])
+        if values.size == 0:
+            self.empty_text.set_text("선택하신 기간 내에\n비교할 기록이 없습니다.")
+            self.ax.set_title('')
+        else:
+            self.empty_text.set_text('')
+            self.ax.set_xlim(-0.6, max(n, 1) - 0.4)
+            self.ax.set_ylim(_nice_floor(values.min() * 0.9), _nice_ceil(values.max() * 1.1))
+            self.ax.set_title("🆚 종목별 추정 1RM 비교" + (f" ({unit} 단위로 묶음)" if unit else ""), fontsize=16, fontweight='bold', pad=20)
+        self.ax.set_xlabel(f'운동한 {unit}' if unit else '운동한 날짜 (월-일)', fontweight='bold', fontsize=11, color='#4A5568')
+        self.ax.legend(list(self.lines.values()), [f"{e} ({formula_label})" for e in self.lines], loc='upper left')
+        self.canvas.draw_idle()
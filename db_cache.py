@@ -0,0 +1,120 @@
+import threading
+import time
+from collections import OrderedDict
+
+# 🌟 테이블별 캐시 유지 시간(초): 잘 안 바뀌는 종목/가이드는 길게, 기록은 짧게
+DEFAULT_TTLS = {
+    "exercises": 600,
+    "diet_guide": 3600,
+    "meal_templates": 3600,
+    "workout_records": 300,
+    "notes": 300,
+    "diet_records": 300,
+    "body_weight": 300,
+}
+
+
+class QueryCache:
+    """테이블 단위 TTL + LRU 방식의 조회 결과 캐시
+
+    key는 (table, 함수 이름, 인자들) 이고, 같은 테이블에 쓰기가 일어나면
+    invalidate()로 해당 테이블(또는 특정 날짜 등 인자)만 골라서 지웁니다.
+    """
+
+    def __init__(self, ttls=None, max_entries=512, default_ttl=300):
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.versions = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_load(self, table, name, args, loader):
+        key = (table, name, args)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            version = self.versions.get(table, 0)
+
+        value = loader()
+
+        with self.lock:
+            # 불러오는 사이에 같은 테이블에 쓰기가 있었다면 옛날 값은 저장하지 않음
+            if self.versions.get(table, 0) == version:
+                self._store(key, value)
+        return value
+
+    def put(self, table, name, args, value, version=None):
+        """미리 불러온 값을 직접 넣어둠 (프리패치 등). version을 주면 그 사이 쓰기가 있었을 때 버림"""
+        with self.lock:
+            if version is not None and self.versions.get(table, 0) != version:
+                return
+            self._store((table, name, args), value)
+
+    def version(self, table):
+        """불러오기 전에 받아두었다가 put(version=...)에 넘기면 오래된 값 저장을 막음"""
+        with self.lock:
+            return self.versions.get(table, 0)
+
+    def peek(self, table, name, args):
+        """있으면 값을, 없거나 만료됐으면 None (hit/miss 집계에는 포함 안 함)"""
+        with self.lock:
+            entry = self.entries.get((table, name, args))
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+            return None
+
+    def _store(self, key, value):
+        ttl = self.ttls.get(key[0], self.default_ttl)
+        self.entries[key] = (time.monotonic() + ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, table, arg=None):
+        """table 캐시 삭제. arg를 주면 그 값(예: 날짜)을 인자로 쓴 항목만 삭제"""
+        with self.lock:
+            self.versions[table] = self.versions.get(table, 0) + 1
+            for key in [k for k in self.entries if k[0] == table and (arg is None or arg in k[2])]:
+                del self.entries[key]
+
+    def patch(self, table, arg, updater):
+        """invalidate(table, arg) 와 같지만 버리는 대신 고쳐서 남길 수 있음 (쓰기 직후 다시 읽지 않도록)
+
+        updater({(이름, 인자들): 지금 값}) 가 돌려준 {(이름, 인자들): 새 값} 만 다시 저장하고 나머지는 지움.
+        잠금을 잡은 채로 호출되므로 그 사이 다른 쓰기가 끼어들어 값이 어긋나지 않음
+        """
+        with self.lock:
+            self.versions[table] = self.versions.get(table, 0) + 1
+            now = time.monotonic()
+            keys = [k for k in self.entries if k[0] == table and arg in k[2]]
+            current = {k[1:]: self.entries[k][1] for k in keys if self.entries[k][0] > now}
+            for key in keys:
+                del self.entries[key]
+            for (name, args), value in updater(current).items():
+                self._store((table, name, args), value)
+
+    def clear(self):
+        with self.lock:
+            for table in list(self.versions) + list(self.ttls):
+                self.versions[table] = self.versions.get(table, 0) + 1
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self.entries),
+            }
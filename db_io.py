@@ -0,0 +1,274 @@
+import hashlib
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from db_sqlite import SYNC_KEYS
+
+# 📦 가져오기/내보내기 대상 테이블과 열 형식 (열 순서 = 내보내는 파일의 열 순서)
+#    date: YYYY-MM-DD / text: 빈 값 불가 / text?: 비면 '' / int, float: 0 이상 숫자 / int?: 비면 0
+#    key: 비면 줄 내용으로 만든 client_key (content_key)
+TABLE_SCHEMAS = {
+    "workout_records": {"date": "date", "exercise": "text", "set_num": "int", "weight": "float", "reps": "int", "client_key": "key"},
+    "diet_records": {"date": "date", "meal_type": "text", "food_name": "text", "calories": "int?", "carbs": "int?",
+                     "protein": "int?", "fat": "int?", "client_key": "key"},
+    "body_weight": {"date": "date", "weight": "float"},
+    "notes": {"title": "text", "content": "text?", "client_key": "key"},
+    "diet_guide": {"food_name": "text", "protein": "int?", "calories": "int?"},
+}
+REQUIRED_KINDS = ("date", "text", "int", "float")
+# 내보낼 때 페이지를 나누는 열 (body_weight 는 id 가 없음)
+PAGE_KEYS = {"body_weight": "date"}
+CHUNK_SIZE = 5000
+MAX_ERROR_EXAMPLES = 5
+
+
+def _parquet():
+    # Parquet 은 선택 기능이라 쓸 때만 import
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet 파일을 쓰려면 pyarrow 가 필요합니다: pip install pyarrow") from None
+    return pa, pq
+
+
+def detect_format(path, fmt=None):
+    if fmt:
+        return fmt
+    return "parquet" if path.lower().endswith((".parquet", ".pq")) else "csv"
+
+
+class Progress:
+    """처리한 줄 수를 한 줄에 덮어쓰며 출력 (0.5초에 한 번만)"""
+
+    def __init__(self, label, stream=sys.stderr, interval=0.5):
+        self.label = label
+        self.stream = stream
+        self.interval = interval
+        self.started = time.perf_counter()
+        self.shown_at = 0.0
+        self.width = 0
+
+    def update(self, done, fraction=None, skipped=0, force=False):
+        now = time.perf_counter()
+        if not force and now - self.shown_at < self.interval:
+            return
+        self.shown_at = now
+        percent = f" {fraction * 100:5.1f}%" if fraction is not None else ""
+        skipped_text = f" (건너뜀 {skipped:,}줄)" if skipped else ""
+        text = f"  {self.label}:{percent} {done:,}줄{skipped_text} {now - self.started:.1f}초"
+        # 이전 줄보다 짧으면 남은 글자를 공백으로 지움
+        self.stream.write("\r" + text.ljust(self.width))
+        self.width = len(text)
+        self.stream.flush()
+
+    def finish(self, done, skipped=0):
+        self.update(done, None, skipped, force=True)
+        self.stream.write("\n")
+
+
+def read_chunks(path, fmt, chunk_size=CHUNK_SIZE):
+    """(DataFrame 조각, 지금까지 읽은 비율 0~1) 을 차례로 - 파일 전체를 메모리에 올리지 않음"""
+    if fmt == "parquet":
+        _, pq = _parquet()
+        parquet_file = pq.ParquetFile(path)
+        total = parquet_file.metadata.num_rows or 1
+        done = 0
+        for batch in parquet_file.iter_batches(batch_size=chunk_size):
+            done += batch.num_rows
+            yield batch.to_pandas(), done / total
+        return
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size or 1
+        # 값은 모두 문자열로 받고 검증할 때 형식을 맞춤 (빈 칸은 NaN 대신 '')
+        for chunk in pd.read_csv(f, chunksize=chunk_size, dtype=str, keep_default_na=False, encoding="utf-8-sig"):
+            yield chunk, min(f.tell() / size, 1.0)
+
+
+def check_header(table, columns):
+    """필수 열이 빠졌으면 ValueError (줄마다 같은 오류를 내지 않도록 처음에 한 번만)"""
+    missing = [c for c, kind in TABLE_SCHEMAS[table].items() if kind in REQUIRED_KINDS and c not in columns]
+    if missing:
+        raise ValueError(f"{table} 파일에 필수 열이 없습니다: {missing}")
+
+
+def _blank(series):
+    if series.dtype == object or pd.api.types.is_string_dtype(series):
+        return series.isna() | (series.astype(str).str.strip() == "")
+    return series.isna()
+
+
+def content_key(table, content, source_line):
+    """client_key 가 없는 줄의 키: 내용과 파일의 줄 번호가 같으면 키도 같음 → 같은 파일을 다시 가져와도 줄이 늘지 않음
+    내용이 똑같은 줄이 여러 개여도(같은 음식을 두 번 먹은 날 등) 줄 번호로 구분되고, 줄 하나를 고쳐도 다른 줄의 키는 그대로"""
+    text = "\x1f".join([table, *(str(value) for value in content), str(source_line)])
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:32]
+
+
+def validate_chunk(table, frame, first_line=2):
+    """조각 하나를 검증 → (저장할 dict 목록, 잘못된 줄 수, [(줄 번호, 오류 설명)] 예시)
+
+    first_line: 이 조각의 첫 줄이 파일에서 몇 번째 줄인지 (오류 메시지, content_key 용)
+    """
+    schema = TABLE_SCHEMAS[table]
+    frame = frame.reset_index(drop=True)
+    values, invalid = {}, {}
+    for column, kind in schema.items():
+        raw = frame[column] if column in frame.columns else pd.Series([None] * len(frame), dtype=object)
+        blank = _blank(raw)
+        if kind == "date":
+            parsed = raw if pd.api.types.is_datetime64_any_dtype(raw) else \
+                pd.to_datetime(raw.astype(str).str.strip(), format="%Y-%m-%d", errors="coerce")
+            invalid[column] = parsed.isna()
+            values[column] = parsed.dt.strftime("%Y-%m-%d")
+        elif kind in ("text", "text?"):
+            text = raw.where(~blank, "").astype(str)
+            text = text.str.strip() if kind == "text" else text
+            invalid[column] = text == "" if kind == "text" else pd.Series(False, index=frame.index)
+            values[column] = text
+        elif kind == "key":
+            invalid[column] = pd.Series(False, index=frame.index)
+            values[column] = raw.where(~blank, "").astype(str).str.strip()
+        else:
+            numbers = pd.to_numeric(raw.where(~blank), errors="coerce")
+            if kind == "int?":
+                numbers = numbers.where(~blank, 0)
+            bad = numbers.isna() | (numbers < 0)
+            if kind in ("int", "int?"):
+                bad |= numbers.notna() & (numbers != numbers.round())
+            invalid[column] = bad
+            values[column] = numbers
+
+    # 빈 키는 형식을 맞춘 나머지 열 값 + 줄 번호로 채움 (파일마다 "5" / "5.0" 처럼 달라도 같은 키)
+    # 조각 안에서만 계산하므로 파일이 커져도 메모리는 chunk_size 줄만큼
+    content_columns = [c for c, kind in schema.items() if kind != "key"]
+    for column in (c for c, kind in schema.items() if kind == "key"):
+        keys = values[column].tolist()
+        for i, content in enumerate(zip(*(values[c].tolist() for c in content_columns))):
+            if not keys[i]:
+                keys[i] = content_key(table, content, first_line + i)
+        values[column] = pd.Series(keys, index=frame.index, dtype=object)
+
+    invalid_frame = pd.DataFrame(invalid)
+    bad_rows = invalid_frame.any(axis=1).to_numpy()
+    examples = []
+    for i in np.flatnonzero(bad_rows)[:MAX_ERROR_EXAMPLES]:
+        column = invalid_frame.columns[invalid_frame.iloc[i].to_numpy()][0]
+        raw = frame[column].iloc[i] if column in frame.columns else None
+        examples.append((first_line + int(i), f"{column} 값이 올바르지 않음: {raw!r}"))
+
+    clean = pd.DataFrame(values)[~bad_rows]
+    # 같은 키가 한 조각에 두 번 있으면 마지막 줄만 (Postgres upsert 는 한 문장에서 같은 줄을 두 번 못 고침)
+    clean = clean.drop_duplicates(subset=[SYNC_KEYS[table]], keep="last")
+    rows = []
+    for record in clean.to_dict("records"):
+        for column, kind in schema.items():
+            if kind in ("int", "int?"):
+                record[column] = int(record[column])
+            elif kind == "float":
+                record[column] = float(record[column])
+        rows.append(record)
+    return rows, int(bad_rows.sum()), examples
+
+
+def write_rows(db, table, rows):
+    """검증된 줄들을 upsert 한 번으로 저장"""
+    if rows:
+        db.bulk_upsert(table, rows, SYNC_KEYS[table])
+    if table == "workout_records" and rows:
+        # 처음 보는 종목 이름도 종목 목록에 추가 (이미 있으면 그대로)
+        db.bulk_upsert("exercises", [{"name": name} for name in sorted({r["exercise"] for r in rows})], "name")
+
+
+def import_file(db, table, path, fmt=None, chunk_size=CHUNK_SIZE, progress=None):
+    """파일을 chunk_size 줄씩 읽어 검증 후 저장 → (저장한 줄 수, 건너뛴 줄 수, 오류 예시)"""
+    fmt = detect_format(path, fmt)
+    imported, skipped, examples = 0, 0, []
+    line = 2  # 1번째 줄은 머리글
+    for frame, fraction in read_chunks(path, fmt, chunk_size):
+        if line == 2:
+            check_header(table, frame.columns)
+        rows, bad, chunk_examples = validate_chunk(table, frame, line)
+        write_rows(db, table, rows)
+        imported += len(rows)
+        skipped += bad
+        examples.extend(chunk_examples[:MAX_ERROR_EXAMPLES - len(examples)])
+        line += len(frame)
+        if progress:
+            progress.update(imported, fraction, skipped)
+    if progress:
+        progress.finish(imported, skipped)
+    return imported, skipped, examples
+
+
+def seed_guide(db, path, columns, fmt=None, chunk_size=CHUNK_SIZE, progress=None):
+    """영양성분 DB 파일로 식단 가이드 채우기 → (저장한 음식 수, 건너뛴 줄 수, 오류 예시)
+
+    columns: {가이드 열: 파일 열} (예: {"food_name": "식품명", "calories": "에너지(kcal)"})
+    소수는 반올림하고, '-'/'tr' 처럼 숫자가 아닌 영양 값은 빈 값(0)으로 봄. 같은 이름은 값만 바뀜
+    """
+    fmt = detect_format(path, fmt)
+    renames = {source: target for target, source in columns.items()}
+    seeded, skipped, examples = 0, 0, []
+    line = 2
+    for frame, fraction in read_chunks(path, fmt, chunk_size):
+        if line == 2:
+            missing = [source for source in renames if source not in frame.columns]
+            if missing:
+                raise ValueError(f"파일에 없는 열: {missing} (파일 열: {list(frame.columns)})")
+        frame = frame[list(renames)].rename(columns=renames)
+        for column in ("protein", "calories"):
+            if column in frame.columns:
+                numbers = pd.to_numeric(frame[column], errors="coerce").round()
+                frame[column] = ["" if pd.isna(v) else str(int(v)) for v in numbers]
+        rows, bad, chunk_examples = validate_chunk("diet_guide", frame, line)
+        # 🚀 조각 하나(수천 개)를 upsert 한 번으로
+        seeded += len(db.upsert_diet_guide(rows)) if rows else 0
+        skipped += bad
+        examples.extend(chunk_examples[:MAX_ERROR_EXAMPLES - len(examples)])
+        line += len(frame)
+        if progress:
+            progress.update(seeded, fraction, skipped)
+    if progress:
+        progress.finish(seeded, skipped)
+    return seeded, skipped, examples
+
+
+def export_table(db, table, path, fmt=None, chunk_size=CHUNK_SIZE, progress=None):
+    """테이블을 chunk_size 줄씩 읽어서 바로 파일에 씀 → 내보낸 줄 수"""
+    fmt = detect_format(path, fmt)
+    columns = list(TABLE_SCHEMAS[table])
+    pages = db.iter_table(table, columns, PAGE_KEYS.get(table, "id"), chunk_size)
+    exported = 0
+    if fmt == "parquet":
+        pa, pq = _parquet()
+        writer = None
+        try:
+            for page in pages:
+                batch = pa.Table.from_pandas(pd.DataFrame.from_records(page, columns=columns), preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, batch.schema)
+                writer.write_table(batch.cast(writer.schema))
+                exported += len(page)
+                if progress:
+                    progress.update(exported)
+            if writer is None:
+                pq.write_table(pa.Table.from_pandas(pd.DataFrame(columns=columns), preserve_index=False), path)
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        with open(path, "w", newline="", encoding="utf-8-sig") as f:
+            pd.DataFrame(columns=columns).to_csv(f, index=False)
+            for page in pages:
+                pd.DataFrame.from_records(page, columns=columns).to_csv(f, header=False, index=False)
+                exported += len(page)
+                if progress:
+                    progress.update(exported)
+    if progress:
+        progress.finish(exported)
+    return exported
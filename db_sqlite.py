@@ -0,0 +1,689 @@
+import json
+import operator
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+
+from db_supabase import NOTE_PREVIEW_CHARS, SNIPPET_CHARS, SNIPPET_MARKS, StorageBackend, note_snippet, template_from_row
+
+# 🌟 로컬 SQLite 저장소: 네트워크 없이 WorkoutDB 전체 기능을 그대로 제공
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS workout_records (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date TEXT NOT NULL,
+    exercise TEXT NOT NULL,
+    set_num INTEGER NOT NULL,
+    weight REAL NOT NULL,
+    reps INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS exercises (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS diet_records (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date TEXT NOT NULL,
+    meal_type TEXT NOT NULL,
+    food_name TEXT NOT NULL,
+    calories INTEGER NOT NULL DEFAULT 0,
+    carbs INTEGER NOT NULL DEFAULT 0,
+    protein INTEGER NOT NULL DEFAULT 0,
+    fat INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS body_weight (
+    date TEXT PRIMARY KEY,
+    weight REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS diet_guide (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    food_name TEXT NOT NULL,
+    protein INTEGER NOT NULL DEFAULT 0,
+    calories INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS meal_templates (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    meal_type TEXT NOT NULL,
+    items TEXT NOT NULL DEFAULT '[]'
+);
+
+CREATE INDEX IF NOT EXISTS idx_workout_records_date ON workout_records (date);
+CREATE INDEX IF NOT EXISTS idx_workout_records_exercise_date ON workout_records (exercise, date);
+CREATE INDEX IF NOT EXISTS idx_diet_records_date_meal ON diet_records (date, meal_type);
+"""
+
+# 🌟 날짜별 요약 테이블: 원본에 쓰기가 일어날 때마다 트리거로 조금씩 갱신됨
+SUMMARY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily_exercise_summary (
+    date TEXT NOT NULL,
+    exercise TEXT NOT NULL,
+    volume REAL NOT NULL DEFAULT 0,
+    max_1rm REAL NOT NULL DEFAULT 0,
+    set_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (date, exercise)
+);
+CREATE TABLE IF NOT EXISTS daily_diet_summary (
+    date TEXT PRIMARY KEY,
+    calories INTEGER NOT NULL DEFAULT 0,
+    carbs INTEGER NOT NULL DEFAULT 0,
+    protein INTEGER NOT NULL DEFAULT 0,
+    fat INTEGER NOT NULL DEFAULT 0,
+    item_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_daily_exercise_summary_exercise_date ON daily_exercise_summary (exercise, date);
+
+CREATE TRIGGER IF NOT EXISTS trg_workout_records_summary_insert AFTER INSERT ON workout_records BEGIN
+    INSERT INTO daily_exercise_summary (date, exercise, volume, max_1rm, set_count)
+    VALUES (new.date, new.exercise, new.weight * new.reps, new.weight * (1.0 + new.reps / 30.0), 1)
+    ON CONFLICT (date, exercise) DO UPDATE SET
+        volume = volume + excluded.volume,
+        max_1rm = MAX(max_1rm, excluded.max_1rm),
+        set_count = set_count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_workout_records_summary_delete AFTER DELETE ON workout_records BEGIN
+    DELETE FROM daily_exercise_summary WHERE date = old.date AND exercise = old.exercise;
+    INSERT INTO daily_exercise_summary (date, exercise, volume, max_1rm, set_count)
+    SELECT date, exercise, SUM(weight * reps), MAX(weight * (1.0 + reps / 30.0)), COUNT(*)
+    FROM workout_records WHERE date = old.date AND exercise = old.exercise GROUP BY date, exercise;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_workout_records_summary_update AFTER UPDATE ON workout_records BEGIN
+    DELETE FROM daily_exercise_summary WHERE (date = old.date AND exercise = old.exercise) OR (date = new.date AND exercise = new.exercise);
+    INSERT INTO daily_exercise_summary (date, exercise, volume, max_1rm, set_count)
+    SELECT date, exercise, SUM(weight * reps), MAX(weight * (1.0 + reps / 30.0)), COUNT(*)
+    FROM workout_records WHERE (date = old.date AND exercise = old.exercise) OR (date = new.date AND exercise = new.exercise)
+    GROUP BY date, exercise;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_diet_records_summary_insert AFTER INSERT ON diet_records BEGIN
+    INSERT INTO daily_diet_summary (date, calories, carbs, protein, fat, item_count)
+    VALUES (new.date, new.calories, new.carbs, new.protein, new.fat, 1)
+    ON CONFLICT (date) DO UPDATE SET
+        calories = calories + excluded.calories,
+        carbs = carbs + excluded.carbs,
+        protein = protein + excluded.protein,
+        fat = fat + excluded.fat,
+        item_count = item_count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_diet_records_summary_delete AFTER DELETE ON diet_records BEGIN
+    UPDATE daily_diet_summary SET
+        calories = calories - old.calories,
+        carbs = carbs - old.carbs,
+        protein = protein - old.protein,
+        fat = fat - old.fat,
+        item_count = item_count - 1
+    WHERE date = old.date;
+    DELETE FROM daily_diet_summary WHERE date = old.date AND item_count <= 0;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_diet_records_summary_update AFTER UPDATE ON diet_records BEGIN
+    UPDATE daily_diet_summary SET
+        calories = calories - old.calories,
+        carbs = carbs - old.carbs,
+        protein = protein - old.protein,
+        fat = fat - old.fat,
+        item_count = item_count - 1
+    WHERE date = old.date;
+    DELETE FROM daily_diet_summary WHERE date = old.date AND item_count <= 0;
+    INSERT INTO daily_diet_summary (date, calories, carbs, protein, fat, item_count)
+    VALUES (new.date, new.calories, new.carbs, new.protein, new.fat, 1)
+    ON CONFLICT (date) DO UPDATE SET
+        calories = calories + excluded.calories,
+        carbs = carbs + excluded.carbs,
+        protein = protein + excluded.protein,
+        fat = fat + excluded.fat,
+        item_count = item_count + 1;
+END;
+"""
+
+# 🔍 노트 전문 검색: trigram(3글자 조각) FTS5 색인 → 띄어쓰기 없는 한글도 부분 일치로 찾음
+#    external content 라 본문을 두 번 저장하지 않고, notes 에 쓰면 트리거가 색인도 같이 고침
+NOTES_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(title, content, content='notes', content_rowid='id', tokenize='trigram');
+CREATE TRIGGER IF NOT EXISTS trg_notes_fts_insert AFTER INSERT ON notes BEGIN
+    INSERT INTO notes_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_notes_fts_delete AFTER DELETE ON notes BEGIN
+    INSERT INTO notes_fts (notes_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_notes_fts_update AFTER UPDATE OF title, content ON notes BEGIN
+    INSERT INTO notes_fts (notes_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+    INSERT INTO notes_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+END;
+"""
+# 🔍 3글자 미만 검색어용 bigram 색인: 2글자 조각들을 토큰으로 넣은 FTS5 (본문은 저장하지 않는 contentless)
+#    공백만 토큰을 나누도록 글자·숫자·문장부호·기호를 모두 토큰 글자로 둠
+#    조각은 note_grams() 가 만들고 트리거에서 부르므로, 이 연결(SQLiteBackend) 밖에서 notes 를 고치면 함수가 없어 실패함
+NOTES_BIGRAM_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS notes_bigrams USING fts5(title, content, content='',
+    tokenize="unicode61 remove_diacritics 0 categories 'L* M* N* P* S* Co'");
+CREATE TRIGGER IF NOT EXISTS trg_notes_bigrams_insert AFTER INSERT ON notes BEGIN
+    INSERT INTO notes_bigrams (rowid, title, content) VALUES (new.id, note_grams(new.title), note_grams(new.content));
+END;
+CREATE TRIGGER IF NOT EXISTS trg_notes_bigrams_delete AFTER DELETE ON notes BEGIN
+    INSERT INTO notes_bigrams (notes_bigrams, rowid, title, content) VALUES ('delete', old.id, note_grams(old.title), note_grams(old.content));
+END;
+CREATE TRIGGER IF NOT EXISTS trg_notes_bigrams_update AFTER UPDATE OF title, content ON notes BEGIN
+    INSERT INTO notes_bigrams (notes_bigrams, rowid, title, content) VALUES ('delete', old.id, note_grams(old.title), note_grams(old.content));
+    INSERT INTO notes_bigrams (rowid, title, content) VALUES (new.id, note_grams(new.title), note_grams(new.content));
+END;
+"""
+# 검색 순위에서 제목 일치를 본문 일치보다 몇 배 쳐줄지 (bm25 열 가중치)
+TITLE_WEIGHT = 5.0
+# 이름/키로 줄을 다시 읽을 때 IN (...) 한 번에 넣는 값 수 (예전 SQLite 의 변수 999개 제한 아래로)
+LOOKUP_BATCH = 500
+
+# 원본 테이블에서 요약을 처음부터 다시 계산하는 쿼리 (검증/재구축용)
+EXPECTED_EXERCISE_SUMMARY = """
+SELECT date, exercise, SUM(weight * reps) AS volume, MAX(weight * (1.0 + reps / 30.0)) AS max_1rm, COUNT(*) AS set_count
+FROM workout_records GROUP BY date, exercise
+"""
+EXPECTED_DIET_SUMMARY = """
+SELECT date, SUM(calories) AS calories, SUM(carbs) AS carbs, SUM(protein) AS protein, SUM(fat) AS fat, COUNT(*) AS item_count
+FROM diet_records GROUP BY date
+"""
+
+# 테이블별로 직접 쓸 수 있는 열 (id 제외). upsert_rows/delete_where 에서 열 이름 검증에 사용
+TABLE_COLUMNS = {
+    "workout_records": ("date", "exercise", "set_num", "weight", "reps", "client_key"),
+    "exercises": ("name",),
+    "notes": ("title", "content", "client_key"),
+    "diet_records": ("date", "meal_type", "food_name", "calories", "carbs", "protein", "fat", "client_key"),
+    "body_weight": ("date", "weight"),
+    "diet_guide": ("food_name", "protein", "calories"),
+    "meal_templates": ("name", "meal_type", "items"),
+}
+# 기기 간 동기화 때 같은 줄을 알아보기 위한 고유 키(client_key)를 갖는 테이블
+CLIENT_KEY_TABLES = ("workout_records", "notes", "diet_records")
+# 테이블별로 서버와 로컬에서 같은 줄을 가리키는 키 (델타 동기화/삭제 기록에 사용)
+SYNC_KEYS = {
+    "workout_records": "client_key",
+    "exercises": "name",
+    "notes": "client_key",
+    "diet_records": "client_key",
+    "body_weight": "date",
+    "diet_guide": "food_name",
+    "meal_templates": "name",
+}
+SYNC_TIMESTAMP = "strftime('%Y-%m-%dT%H:%M:%f', 'now')"
+
+
+def new_client_key():
+    return uuid.uuid4().hex
+
+
+def _bigrams(text):
+    # 붙어 있는 두 글자씩 전부 ('abc d' → 'ab bc c  d') - 공백이 낀 조각은 토크나이저가 한 글자 토큰으로 자름
+    return " ".join(map(operator.add, text, text[1:]))
+
+
+def note_grams(text):
+    """notes_bigrams 에 넣을 토큰 문자열: 2글자 조각들(순서대로) + 끝 글자"""
+    text = text.lower()
+    return _bigrams(text) + " " + text[-1:]
+
+
+def bigram_match(terms):
+    """검색어들 → notes_bigrams MATCH 식. 2글자 이상은 조각들이 붙어 나오는 구(phrase), 1글자는 그 글자로 시작하는 토큰"""
+    phrases = []
+    for term in (t.lower() for t in terms):
+        phrase = term if len(term) == 1 else _bigrams(term)
+        phrases.append('"' + phrase.replace('"', '""') + ('"*' if len(term) == 1 else '"'))
+    return " ".join(phrases)
+
+
+def _check_columns(table, columns):
+    allowed = TABLE_COLUMNS.get(table)
+    if allowed is None:
+        raise ValueError(f"알 수 없는 테이블: {table}")
+    unknown = [c for c in columns if c not in allowed]
+    if unknown:
+        raise ValueError(f"{table} 테이블에 없는 열: {unknown}")
+
+
+def upsert_rows_sql(conn, table, rows, on_conflict):
+    """rows(dict 목록)를 on_conflict 열 기준으로 넣거나 덮어씀 (트랜잭션은 호출한 쪽에서)"""
+    if not rows:
+        return
+    columns = list(rows[0].keys())
+    _check_columns(table, columns + [on_conflict])
+    updates = [c for c in columns if c != on_conflict]
+    if updates:
+        # 값이 그대로인 줄은 건드리지 않음 → 트리거도 안 돌고 conn.total_changes 로 실제 변경만 셀 수 있음
+        action = ("DO UPDATE SET " + ", ".join(f"{c} = excluded.{c}" for c in updates)
+                  + " WHERE " + " OR ".join(f"{c} IS NOT excluded.{c}" for c in updates))
+    else:
+        action = "DO NOTHING"
+    sql = (f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)}) "
+           f"ON CONFLICT ({on_conflict}) {action}")
+    conn.executemany(sql, [tuple(row[c] for c in columns) for row in rows])
+
+
+def delete_where_sql(conn, table, match):
+    """match의 모든 열 값이 같은 줄 삭제 (트랜잭션은 호출한 쪽에서)"""
+    _check_columns(table, [c for c in match if c != "id"])  # id 로 지우는 건 어느 테이블이나 가능
+    where = " AND ".join(f"{c} = ?" for c in match)
+    conn.execute(f"DELETE FROM {table} WHERE {where}", tuple(match.values()))
+
+
+class SQLiteBackend(StorageBackend):
+    name = "sqlite"
+
+    def __init__(self, path="workout.db", track_changes=False):
+        # 워커 스레드에서도 같은 연결을 쓰므로 check_same_thread를 끄고 lock으로 직렬화
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.create_function("note_grams", 1, note_grams, deterministic=True)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        if path != ":memory:":
+            # WAL: 쓰기가 읽기를 막지 않고, 커밋은 로그 파일에 덧붙이기만 해서 빠름
+            self.conn.execute("PRAGMA journal_mode = WAL")
+        self.lock = threading.RLock()
+        with self.lock, self.conn:
+            self.conn.executescript(SCHEMA)
+            self._migrate_client_keys()
+            self._migrate_diet_guide()
+            if track_changes:
+                self._install_change_tracking()
+            has_summary = self.conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'daily_exercise_summary'").fetchone()
+            self.conn.executescript(SUMMARY_SCHEMA)
+            self.fts = self._install_notes_search()
+            self.bigram_fts = self._install_notes_bigrams()
+        if not has_summary:
+            # 요약 테이블이 없던 예전 DB 파일이면 기존 기록으로 한 번 채워둠
+            self.rebuild_daily_summary()
+
+    def _migrate_client_keys(self):
+        # 예전 DB 파일에는 client_key 열이 없으므로 추가하고 기존 줄에도 키를 채움
+        for table in CLIENT_KEY_TABLES:
+            columns = [row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")]
+            if "client_key" not in columns:
+                self.conn.execute(f"ALTER TABLE {table} ADD COLUMN client_key TEXT")
+            self.conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{table}_client_key ON {table} (client_key)")
+            self.conn.execute(f"UPDATE {table} SET client_key = lower(hex(randomblob(16))) WHERE client_key IS NULL")
+
+    def _migrate_diet_guide(self):
+        # 음식 이름이 고유 키 (sql/008 과 같음) - 예전 DB 파일의 중복 이름은 가장 최근 줄만 남김
+        if self.conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'idx_diet_guide_food_name'").fetchone():
+            return
+        self.conn.execute("UPDATE diet_guide SET food_name = trim(food_name) WHERE food_name <> trim(food_name)")
+        self.conn.execute("DELETE FROM diet_guide WHERE id NOT IN (SELECT MAX(id) FROM diet_guide GROUP BY food_name)")
+        self.conn.execute("CREATE UNIQUE INDEX idx_diet_guide_food_name ON diet_guide (food_name)")
+
+    def _install_notes_search(self):
+        # FTS5 trigram 이 없는 SQLite(3.34 미만)면 LIKE 검색만 사용
+        existed = self.conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'notes_fts'").fetchone()
+        try:
+            self.conn.executescript(NOTES_FTS_SCHEMA)
+        except sqlite3.OperationalError as e:
+            print("노트 검색 색인(FTS5)을 쓸 수 없어 LIKE 로 검색합니다:", e)
+            return False
+        if not existed:
+            # 예전 DB 파일이면 기존 노트로 색인을 한 번 채움
+            self.conn.execute("INSERT INTO notes_fts (notes_fts) VALUES ('rebuild')")
+        return True
+
+    def _install_notes_bigrams(self):
+        # trigram 과 달리 FTS5 만 있으면 됨 (본문을 저장하지 않는 contentless 테이블이라 rebuild 대신 직접 채움)
+        existed = self.conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'notes_bigrams'").fetchone()
+        try:
+            self.conn.executescript(NOTES_BIGRAM_SCHEMA)
+        except sqlite3.OperationalError as e:
+            print("짧은 검색어 색인(FTS5)을 쓸 수 없어 LIKE 로 검색합니다:", e)
+            return False
+        if not existed:
+            self.conn.execute("INSERT INTO notes_bigrams (rowid, title, content) SELECT id, note_grams(title), note_grams(content) FROM notes")
+        return True
+
+    def _install_change_tracking(self):
+        # 서버 역할(동기화 테스트용 대역)일 때만: updated_at 자동 기록 + 삭제 기록(sync_tombstones)
+        self.conn.execute(f"""CREATE TABLE IF NOT EXISTS sync_tombstones (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            row_key TEXT NOT NULL,
+            deleted_at TEXT NOT NULL DEFAULT ({SYNC_TIMESTAMP}))""")
+        for table, key in SYNC_KEYS.items():
+            columns = [row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")]
+            if "updated_at" not in columns:
+                self.conn.execute(f"ALTER TABLE {table} ADD COLUMN updated_at TEXT")
+            self.conn.execute(f"UPDATE {table} SET updated_at = {SYNC_TIMESTAMP} WHERE updated_at IS NULL")
+            self.conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_updated_at ON {table} (updated_at)")
+            data_columns = ", ".join(c for c in columns if c != "updated_at")
+            self.conn.executescript(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_touch_insert AFTER INSERT ON {table} BEGIN
+                    UPDATE {table} SET updated_at = {SYNC_TIMESTAMP} WHERE rowid = NEW.rowid;
+                END;
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_touch_update AFTER UPDATE OF {data_columns} ON {table} BEGIN
+                    UPDATE {table} SET updated_at = {SYNC_TIMESTAMP} WHERE rowid = NEW.rowid;
+                END;
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_tombstone AFTER DELETE ON {table} BEGIN
+                    INSERT INTO sync_tombstones (table_name, row_key) VALUES ('{table}', OLD.{key});
+                END;
+            """)
+
+    def get_changes(self, table, columns, key, since=None):
+        """since 이후 바뀐 줄을 dict 목록으로 (updated_at 포함, 오래된 순)"""
+        _check_columns(table, list(columns) + [key])
+        sql = f"SELECT {', '.join(columns)}, updated_at FROM {table}"
+        params = ()
+        if since:
+            sql += " WHERE updated_at > ?"
+            params = (since,)
+        with self.lock:
+            cursor = self.conn.execute(sql + f" ORDER BY updated_at, {key}", params)
+            names = [d[0] for d in cursor.description]
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    def get_tombstones(self, since=None):
+        rows = self._query("SELECT table_name, row_key, deleted_at FROM sync_tombstones WHERE deleted_at > ? ORDER BY deleted_at, id",
+                           (since or "",))
+        return [{"table_name": t, "row_key": k, "deleted_at": d} for t, k, d in rows]
+
+    def get_rows_page(self, table, columns, key, after, limit):
+        _check_columns(table, columns)
+        if key not in ("id",) + TABLE_COLUMNS[table]:
+            raise ValueError(f"{table} 테이블에 없는 열: {key}")
+        sql = f"SELECT {key}, {', '.join(columns)} FROM {table}"
+        params = ()
+        if after is not None:
+            sql += f" WHERE {key} > ?"
+            params = (after,)
+        return self._query(sql + f" ORDER BY {key} LIMIT ?", (*params, limit))
+
+    @contextmanager
+    def transaction(self):
+        """여러 쓰기를 한 트랜잭션으로 묶기 (with 블록이 끝나면 커밋, 예외 시 롤백)"""
+        with self.lock, self.conn:
+            yield self.conn
+
+    def upsert_rows(self, table, rows, on_conflict):
+        with self.transaction() as conn:
+            upsert_rows_sql(conn, table, rows, on_conflict)
+
+    def delete_where(self, table, match):
+        with self.transaction() as conn:
+            delete_where_sql(conn, table, match)
+
+    def _query(self, sql, params=()):
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def _execute(self, sql, params=()):
+        with self.lock, self.conn:
+            return self.conn.execute(sql, params)
+
+    def pool_stats(self):
+        return {"connections": 1}
+
+    def rebuild_daily_summary(self, verify_only=False):
+        """요약 테이블을 원본과 비교해 어긋난 줄 수를 돌려주고, verify_only가 아니면 원본 기준으로 다시 만듦"""
+        with self.lock, self.conn:
+            # (원본엔 있는데 요약이 없거나 값이 다른 줄) + (원본엔 없는데 요약에만 남은 줄)
+            exercise_mismatches = self.conn.execute(f"""
+                SELECT COUNT(*) FROM ({EXPECTED_EXERCISE_SUMMARY}) e
+                LEFT JOIN daily_exercise_summary s ON s.date = e.date AND s.exercise = e.exercise
+                WHERE s.date IS NULL OR s.set_count != e.set_count
+                   OR ABS(s.volume - e.volume) > 1e-6 OR ABS(s.max_1rm - e.max_1rm) > 1e-6
+            """).fetchone()[0] + self.conn.execute("""
+                SELECT COUNT(*) FROM daily_exercise_summary s
+                WHERE NOT EXISTS (SELECT 1 FROM workout_records r WHERE r.date = s.date AND r.exercise = s.exercise)
+            """).fetchone()[0]
+            diet_mismatches = self.conn.execute(f"""
+                SELECT COUNT(*) FROM ({EXPECTED_DIET_SUMMARY}) e
+                LEFT JOIN daily_diet_summary s ON s.date = e.date
+                WHERE s.date IS NULL OR s.item_count != e.item_count
+                   OR s.calories != e.calories OR s.carbs != e.carbs OR s.protein != e.protein OR s.fat != e.fat
+            """).fetchone()[0] + self.conn.execute("""
+                SELECT COUNT(*) FROM daily_diet_summary s
+                WHERE NOT EXISTS (SELECT 1 FROM diet_records r WHERE r.date = s.date)
+            """).fetchone()[0]
+            if not verify_only:
+                self.conn.execute("DELETE FROM daily_exercise_summary")
+                self.conn.execute(f"INSERT INTO daily_exercise_summary (date, exercise, volume, max_1rm, set_count) {EXPECTED_EXERCISE_SUMMARY}")
+                self.conn.execute("DELETE FROM daily_diet_summary")
+                self.conn.execute(f"INSERT INTO daily_diet_summary (date, calories, carbs, protein, fat, item_count) {EXPECTED_DIET_SUMMARY}")
+        return {"exercise_mismatches": exercise_mismatches, "diet_mismatches": diet_mismatches}
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    # --- 1. 운동 일지 ---
+    def insert_record(self, date, exercise, set_num, weight, reps):
+        self._execute("INSERT INTO workout_records (date, exercise, set_num, weight, reps, client_key) VALUES (?, ?, ?, ?, ?, ?)",
+                      (date, exercise, set_num, weight, reps, new_client_key()))
+
+    def insert_records(self, records):
+        # with self.conn 블록 하나 = 트랜잭션 하나 → 중간에 실패하면 전부 롤백
+        with self.lock, self.conn:
+            self.conn.executemany("INSERT INTO workout_records (date, exercise, set_num, weight, reps, client_key) VALUES (?, ?, ?, ?, ?, ?)",
+                                  [tuple(record) + (new_client_key(),) for record in records])
+
+    def get_records_by_date(self, date):
+        return self._query("SELECT exercise, set_num, weight, reps FROM workout_records WHERE date = ? ORDER BY exercise, set_num", (date,))
+
+    def get_records_page(self, before, limit, exercise=None):
+        # (date, id) 행 값 비교 + idx_workout_records_date(date, rowid) 로 OFFSET 없이 바로 이어서 읽음
+        where, params = [], []
+        if exercise:
+            where.append("exercise = ?")
+            params.append(exercise)
+        if before:
+            where.append("(date, id) < (?, ?)")
+            params.extend(before)
+        sql = "SELECT id, date, exercise, set_num, weight, reps FROM workout_records"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        return self._query(sql + " ORDER BY date DESC, id DESC LIMIT ?", (*params, limit))
+
+    def delete_exercise_records(self, date, exercise):
+        self._execute("DELETE FROM workout_records WHERE date = ? AND exercise = ?", (date, exercise))
+
+    def get_trend_rows(self, exercise, start_date, end_date):
+        return self._query("SELECT date, weight, reps FROM workout_records WHERE exercise = ? AND date BETWEEN ? AND ?",
+                           (exercise, start_date, end_date))
+
+    def get_daily_trend(self, exercise, start_date, end_date):
+        # 트리거로 유지되는 요약 테이블에서 날짜당 한 줄씩 바로 읽음
+        return self._query("SELECT date, volume, max_1rm FROM daily_exercise_summary "
+                           "WHERE exercise = ? AND date BETWEEN ? AND ? ORDER BY date",
+                           (exercise, start_date, end_date))
+
+    def get_multi_daily_trend(self, exercises, start_date, end_date):
+        placeholders = ", ".join("?" * len(exercises))
+        return self._query(f"SELECT date, exercise, volume, max_1rm FROM daily_exercise_summary "
+                           f"WHERE exercise IN ({placeholders}) AND date BETWEEN ? AND ? ORDER BY date, exercise",
+                           (*exercises, start_date, end_date))
+
+    def get_sets(self, exercise, start_date, end_date):
+        if isinstance(exercise, (list, tuple)):
+            placeholders = ", ".join("?" * len(exercise))
+            return self._query(f"SELECT date, exercise, weight, reps FROM workout_records WHERE exercise IN ({placeholders}) "
+                               f"AND date BETWEEN ? AND ? ORDER BY id", (*exercise, start_date, end_date))
+        if exercise:
+            return self._query("SELECT date, exercise, weight, reps FROM workout_records WHERE exercise = ? AND date BETWEEN ? AND ? ORDER BY id",
+                               (exercise, start_date, end_date))
+        return self._query("SELECT date, exercise, weight, reps FROM workout_records WHERE date BETWEEN ? AND ? ORDER BY id",
+                           (start_date, end_date))
+
+    def get_records_range(self, start_date, end_date):
+        return self._query("SELECT date, exercise, set_num, weight, reps FROM workout_records WHERE date BETWEEN ? AND ? "
+                           "ORDER BY date, exercise, set_num", (start_date, end_date))
+
+    def get_activity(self, start_date, end_date):
+        return self._query("SELECT date, SUM(set_count), SUM(volume) FROM daily_exercise_summary "
+                           "WHERE date BETWEEN ? AND ? GROUP BY date ORDER BY date", (start_date, end_date))
+
+    def get_exercise_summary(self, start_date, end_date):
+        return self._query("SELECT date, exercise, volume, max_1rm, set_count FROM daily_exercise_summary "
+                           "WHERE date BETWEEN ? AND ? ORDER BY date, exercise", (start_date, end_date))
+
+    # --- 2. 종목 관리 ---
+    def insert_exercise(self, name):
+        self._execute("INSERT OR IGNORE INTO exercises (name) VALUES (?)", (name,))
+
+    def get_all_exercises(self):
+        return [row[0] for row in self._query("SELECT name FROM exercises ORDER BY id")]
+
+    def delete_exercise(self, name):
+        self._execute("DELETE FROM exercises WHERE name = ?", (name,))
+
+    # --- 3. 메모장 ---
+    def save_note(self, title, content, note_id=None):
+        if note_id:
+            self._execute("UPDATE notes SET title = ?, content = ? WHERE id = ?", (title, content, note_id))
+            return note_id
+        return self._execute("INSERT INTO notes (title, content, client_key) VALUES (?, ?, ?)", (title, content, new_client_key())).lastrowid
+
+    def get_all_notes(self):
+        return self._query("SELECT id, title FROM notes ORDER BY id DESC")
+
+    def get_notes_page(self, offset, limit):
+        with self.lock:
+            rows = self.conn.execute("SELECT id, title, substr(content, 1, ?), length(content) > ? FROM notes ORDER BY id DESC LIMIT ? OFFSET ?",
+                                     (NOTE_PREVIEW_CHARS, NOTE_PREVIEW_CHARS, limit, offset)).fetchall()
+            total = self.conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+        return [(i, t, p, bool(cut)) for i, t, p, cut in rows], total
+
+    def get_note_content(self, note_id):
+        rows = self._query("SELECT title, content FROM notes WHERE id = ?", (note_id,))
+        if rows:
+            return rows[0]
+        return ("", "")
+
+    def delete_note(self, note_id):
+        self._execute("DELETE FROM notes WHERE id = ?", (note_id,))
+
+    def search_notes(self, query, limit):
+        terms = query.split()
+        if not terms:
+            return []
+        if self.fts and all(len(t) >= 3 for t in terms):
+            # 검색어마다 큰따옴표로 감싸서 FTS 문법 글자도 그대로 찾고, 모든 검색어가 들어간 노트만
+            match = " ".join('"' + t.replace('"', '""') + '"' for t in terms)
+            return self._query(f"SELECT rowid, title, snippet(notes_fts, -1, ?, ?, '…', {SNIPPET_CHARS // 3}) FROM notes_fts "
+                               f"WHERE notes_fts MATCH ? ORDER BY bm25(notes_fts, {TITLE_WEIGHT}, 1.0) LIMIT ?",
+                               (*SNIPPET_MARKS, match, limit))
+        if self.bigram_fts:
+            # 🚀 3글자 미만 검색어가 섞이면 trigram 대신 bigram 색인으로 찾고 같은 bm25 가중치로 순위를 매김
+            rows = self._query(f"SELECT n.id, n.title, n.content FROM notes_bigrams JOIN notes n ON n.id = notes_bigrams.rowid "
+                               f"WHERE notes_bigrams MATCH ? ORDER BY bm25(notes_bigrams, {TITLE_WEIGHT}, 1.0) LIMIT ?",
+                               (bigram_match(terms), limit))
+        else:
+            # 색인이 없으면 LIKE 로 훑음 (최신 노트부터)
+            where = " AND ".join("(title LIKE ? ESCAPE '\\' OR content LIKE ? ESCAPE '\\')" for _ in terms)
+            params = []
+            for t in terms:
+                pattern = "%" + t.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+                params += [pattern, pattern]
+            rows = self._query(f"SELECT id, title, content FROM notes WHERE {where} ORDER BY id DESC LIMIT ?", (*params, limit))
+        # 본문에 없고 제목에만 있으면 제목을 보여줌 (FTS snippet()과 같은 동작)
+        return [(note_id, title, note_snippet(content if any(t.lower() in content.lower() for t in terms) else title, terms))
+                for note_id, title, content in rows]
+
+    # --- 5. 식단 ---
+    def insert_diet(self, date, meal_type, food_name, cal, carbs, pro, fat):
+        self.insert_diets([(date, meal_type, food_name, cal, carbs, pro, fat)])
+
+    def insert_diets(self, records):
+        # 트랜잭션 하나로 넣으면서 새 id 를 모아 둠 → 그날 목록을 다시 읽지 않아도 됨
+        saved = []
+        with self.lock, self.conn:
+            for date, meal_type, food_name, cal, carbs, pro, fat in records:
+                cursor = self.conn.execute("INSERT INTO diet_records (date, meal_type, food_name, calories, carbs, protein, fat, client_key) "
+                                           "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (date, meal_type, food_name, cal, carbs, pro, fat, new_client_key()))
+                saved.append((cursor.lastrowid, meal_type, food_name, cal, carbs, pro, fat))
+        return saved
+
+    def get_diet_by_date(self, date):
+        return self._query("SELECT id, meal_type, food_name, calories, carbs, protein, fat FROM diet_records WHERE date = ? ORDER BY id", (date,))
+
+    def get_diet_range(self, start_date, end_date):
+        return self._query("SELECT date, id, meal_type, food_name, calories, carbs, protein, fat FROM diet_records "
+                           "WHERE date BETWEEN ? AND ? ORDER BY date, id", (start_date, end_date))
+
+    def delete_diet(self, record_id):
+        self._execute("DELETE FROM diet_records WHERE id = ?", (record_id,))
+
+    def get_food_history(self):
+        # 음식 이름마다 가장 최근 기록 한 줄 + 기록 횟수
+        return self._query("""
+            SELECT food_name, calories, carbs, protein, fat, times FROM (
+                SELECT food_name, calories, carbs, protein, fat, COUNT(*) OVER (PARTITION BY food_name) AS times,
+                       ROW_NUMBER() OVER (PARTITION BY food_name ORDER BY date DESC, id DESC) AS rn
+                FROM diet_records)
+            WHERE rn = 1""")
+
+    def get_diet_totals(self, date):
+        rows = self._query("SELECT calories, carbs, protein, fat FROM daily_diet_summary WHERE date = ?", (date,))
+        if rows:
+            return rows[0]
+        return (0, 0, 0, 0)
+
+    # --- 6. 체중 ---
+    def save_weight(self, date_str, weight):
+        self._execute("INSERT INTO body_weight (date, weight) VALUES (?, ?) ON CONFLICT(date) DO UPDATE SET weight = excluded.weight",
+                      (date_str, weight))
+
+    def get_weight(self, date_str):
+        rows = self._query("SELECT weight FROM body_weight WHERE date = ?", (date_str,))
+        if rows:
+            return rows[0][0]
+        return 0.0
+
+    def get_weight_range(self, start_date, end_date):
+        return self._query("SELECT date, weight FROM body_weight WHERE date BETWEEN ? AND ?", (start_date, end_date))
+
+    # --- 7. 식단 가이드 ---
+    def get_diet_guide(self):
+        rows = self._query("SELECT id, food_name, protein, calories FROM diet_guide ORDER BY food_name")
+        return [{"id": r[0], "food_name": r[1], "protein": r[2], "calories": r[3]} for r in rows]
+
+    def get_diet_guide_by_names(self, names):
+        """이름마다 저장된 가이드 줄 dict (names 순서, 없는 이름은 빠짐)"""
+        found = {}
+        names = list(names)
+        for i in range(0, len(names), LOOKUP_BATCH):
+            batch = names[i:i + LOOKUP_BATCH]
+            rows = self._query(f"SELECT id, food_name, protein, calories FROM diet_guide WHERE food_name IN ({', '.join('?' for _ in batch)})", batch)
+            found.update((r[1], {"id": r[0], "food_name": r[1], "protein": r[2], "calories": r[3]}) for r in rows)
+        return [found[name] for name in names if name in found]
+
+    def upsert_diet_guide(self, rows):
+        with self.lock, self.conn:
+            upsert_rows_sql(self.conn, "diet_guide", rows, "food_name")
+        return self.get_diet_guide_by_names(r["food_name"] for r in rows)
+
+    def update_diet_guide(self, guide_id, row):
+        self._execute("UPDATE diet_guide SET food_name = ?, protein = ?, calories = ? WHERE id = ?",
+                      (row["food_name"], row["protein"], row["calories"], guide_id))
+        return next(iter(self.get_diet_guide_by_names([row["food_name"]])), None)
+
+    def delete_diet_guide(self, guide_id):
+        self._execute("DELETE FROM diet_guide WHERE id = ?", (guide_id,))
+
+    # --- 8. 식단 템플릿 ---
+    def get_meal_templates(self):
+        rows = self._query("SELECT name, meal_type, items FROM meal_templates ORDER BY name")
+        return [template_from_row({"name": n, "meal_type": m, "items": i}) for n, m, i in rows]
+
+    def save_meal_template(self, name, meal_type, items):
+        with self.lock, self.conn:
+            upsert_rows_sql(self.conn, "meal_templates", [{"name": name, "meal_type": meal_type, "items": json.dumps(items, ensure_ascii=False)}], "name")
+
+    def delete_meal_template(self, name):
+        self._execute("DELETE FROM meal_templates WHERE name = ?", (name,))
+
+    def ids_by_key(self, table, key, values):
+        """{동기화 키 값: 로컬 id} (오프라인 저장 직후 새 줄의 id 를 찾을 때)"""
+        _check_columns(table, [key])
+        values = list(values)
+        found = {}
+        for i in range(0, len(values), LOOKUP_BATCH):
+            batch = values[i:i + LOOKUP_BATCH]
+            found.update(self._query(f"SELECT {key}, id FROM {table} WHERE {key} IN ({', '.join('?' for _ in batch)})", batch))
+        return found
@@ -0,0 +1,433 @@
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+
+from db_sqlite import SYNC_KEYS, TABLE_COLUMNS, delete_where_sql, new_client_key, upsert_rows_sql
+from db_supabase import StorageBackend
+
+# 🌟 오프라인 우선 저장: 쓰기는 로컬 SQLite에 먼저 저장하고 pending_writes 에 적어둔 뒤
+#    SyncWorker 가 백그라운드에서 서버로 묶어서 밀어 올림 (실패하면 점점 늦춰서 다시 시도)
+JOURNAL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pending_writes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    table_name TEXT NOT NULL,
+    op TEXT NOT NULL,
+    conflict TEXT,
+    payload TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    name TEXT PRIMARY KEY,
+    watermark TEXT
+);
+"""
+# updated_at 은 트랜잭션 시작 시각이라 늦게 커밋된 줄이 워터마크보다 앞설 수 있음 → 조금 겹쳐서 다시 읽음
+PULL_LOOKBACK = timedelta(seconds=60)
+
+
+class WriteJournal:
+    """서버에 아직 반영되지 않은 쓰기 목록 (로컬 DB 안의 pending_writes 테이블)
+
+    upsert 는 client_key / name / date 같은 고유 키를 기준으로 하고 delete 는 조건이 같으면
+    결과도 같으므로, 같은 항목을 여러 번 보내도(재시도) 서버 결과는 한 번 보낸 것과 같습니다.
+    """
+
+    def __init__(self, local):
+        self.local = local
+        with local.transaction() as conn:
+            conn.executescript(JOURNAL_SCHEMA)
+
+    def append(self, conn, table, op, payload, conflict=None):
+        # 로컬 쓰기와 같은 트랜잭션(conn) 안에서 호출 → 둘 다 저장되거나 둘 다 취소됨
+        conn.execute("INSERT INTO pending_writes (table_name, op, conflict, payload, created_at) VALUES (?, ?, ?, ?, ?)",
+                     (table, op, conflict, json.dumps(payload, ensure_ascii=False), time.time()))
+
+    def head(self, limit):
+        rows = self.local._query("SELECT id, table_name, op, conflict, payload, attempts, next_attempt_at "
+                                 "FROM pending_writes ORDER BY id LIMIT ?", (limit,))
+        return [(i, t, op, c, json.loads(p), a, n) for i, t, op, c, p, a, n in rows]
+
+    def remove(self, ids):
+        with self.local.transaction() as conn:
+            conn.executemany("DELETE FROM pending_writes WHERE id = ?", [(i,) for i in ids])
+
+    def mark_failed(self, entry_id, attempts, next_attempt_at, error):
+        with self.local.transaction() as conn:
+            conn.execute("UPDATE pending_writes SET attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                         (attempts, next_attempt_at, error, entry_id))
+
+    def retry_now(self):
+        with self.local.transaction() as conn:
+            conn.execute("UPDATE pending_writes SET next_attempt_at = 0")
+
+    def stats(self):
+        count, last_error = self.local._query(
+            "SELECT COUNT(*), (SELECT last_error FROM pending_writes ORDER BY id LIMIT 1) FROM pending_writes")[0]
+        return {"pending_writes": count, "last_sync_error": last_error}
+
+
+def _since(watermark):
+    if not watermark:
+        return None
+    return (datetime.fromisoformat(watermark) - PULL_LOOKBACK).isoformat()
+
+
+class DeltaPuller:
+    """서버에서 워터마크(테이블별 마지막 updated_at) 이후 바뀐 줄과 삭제 기록만 받아 로컬 사본에 반영
+
+    받는 양이 테이블 크기가 아니라 바뀐 양에 비례합니다. 같은 줄을 다시 받아도 upsert 라 결과는 같고,
+    값이 실제로 바뀐 테이블만 돌려주므로 겹쳐 읽은 줄 때문에 캐시가 괜히 비워지지 않습니다.
+    """
+
+    def __init__(self, local):
+        self.local = local
+
+    def watermark(self, name):
+        rows = self.local._query("SELECT watermark FROM sync_state WHERE name = ?", (name,))
+        return rows[0][0] if rows else None
+
+    def _set_watermark(self, conn, name, watermark):
+        conn.execute("INSERT INTO sync_state (name, watermark) VALUES (?, ?) "
+                     "ON CONFLICT(name) DO UPDATE SET watermark = excluded.watermark", (name, watermark))
+
+    def pull(self, remote):
+        changed = set()
+        for table, key in SYNC_KEYS.items():
+            rows = remote.get_changes(table, TABLE_COLUMNS[table], key, _since(self.watermark(table)))
+            if not rows:
+                continue
+            newest = max(row["updated_at"] for row in rows)
+            rows = [{c: row[c] for c in TABLE_COLUMNS[table]} for row in rows]
+            with self.local.transaction() as conn:
+                before = conn.total_changes
+                upsert_rows_sql(conn, table, rows, key)
+                if conn.total_changes != before:
+                    changed.add(table)
+                self._set_watermark(conn, table, newest)
+
+        tombstones = remote.get_tombstones(_since(self.watermark("sync_tombstones")))
+        if tombstones:
+            with self.local.transaction() as conn:
+                for tombstone in tombstones:
+                    table = tombstone["table_name"]
+                    if table not in SYNC_KEYS:
+                        continue
+                    before = conn.total_changes
+                    delete_where_sql(conn, table, {SYNC_KEYS[table]: tombstone["row_key"]})
+                    if conn.total_changes != before:
+                        changed.add(table)
+                self._set_watermark(conn, "sync_tombstones", max(t["deleted_at"] for t in tombstones))
+        return changed
+
+
+def group_batches(entries):
+    """앞에서부터 같은 (테이블, upsert, 충돌 키, 열 구성) 이 이어지는 항목들을 upsert 한 번으로 묶음
+
+    delete 는 한 건씩. 순서는 그대로 유지하므로 '추가 → 삭제 → 다시 추가' 도 서버에서 같은 결과가 됩니다.
+    """
+    batches = []
+    for entry_id, table, op, conflict, payload, _, _ in entries:
+        if op == "upsert":
+            key = (table, op, conflict, tuple(payload[0]))
+            if batches and batches[-1][0] == key:
+                batches[-1][1].append(entry_id)
+                batches[-1][2].extend(payload)
+                continue
+            batches.append((key, [entry_id], list(payload)))
+        else:
+            batches.append(((table, op, conflict, None), [entry_id], payload))
+    return batches
+
+
+def _dedupe(rows, conflict):
+    # 같은 키가 한 문장에 두 번 들어가면 Postgres upsert 가 실패하므로 마지막 값만 남김
+    latest = {}
+    for row in rows:
+        latest[row[conflict]] = row
+    return list(latest.values())
+
+
+class SyncWorker:
+    """pending_writes 를 백그라운드 스레드에서 서버(remote)로 밀어 올리는 작업자"""
+
+    def __init__(self, journal, remote_factory, puller=None, on_pulled=None,
+                 batch_limit=200, base_backoff=2.0, max_backoff=300.0, idle_interval=30.0):
+        self.journal = journal
+        self.puller = puller
+        self.on_pulled = on_pulled
+        self.pull_failures = 0
+        self.remote_factory = remote_factory
+        self.remote = None
+        self.batch_limit = batch_limit
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.idle_interval = idle_interval
+        self.wake = threading.Event()
+        self.stopped = threading.Event()
+        self.round_lock = threading.Lock()
+        self.thread = None
+        self.last_error = None
+        self.last_synced_at = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="db-sync", daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.wake.set()
+        if self.thread is not None:
+            self.thread.join(timeout=5)
+            self.thread = None
+
+    def notify(self):
+        """새 쓰기가 생겼으니 바로 한 번 돌아보라고 깨움"""
+        self.wake.set()
+
+    def _run(self):
+        while not self.stopped.is_set():
+            delay = self.sync_once()
+            self.wake.wait(delay)
+            self.wake.clear()
+
+    def _backoff(self, attempts):
+        # 2초, 4초, 8초 ... 최대 max_backoff, 여러 기기가 동시에 몰리지 않도록 ±20% 흔들어 줌
+        delay = min(self.max_backoff, self.base_backoff * (2 ** (attempts - 1)))
+        return delay * random.uniform(0.8, 1.2)
+
+    def sync_once(self):
+        """한 바퀴 동기화하고, 다음 시도까지 기다릴 시간(초)을 돌려줌"""
+        with self.round_lock:
+            entries = self.journal.head(self.batch_limit)
+            if not entries:
+                return self._pull()
+            now = time.time()
+            if entries[0][6] > now:
+                # 맨 앞 항목이 아직 재시도 시간이 아니면 뒤 항목도 기다림 (순서 보장)
+                return entries[0][6] - now
+
+            attempts_by_id = {entry[0]: entry[5] for entry in entries}
+            for (table, op, conflict, _), ids, payload in group_batches(entries):
+                try:
+                    if self.remote is None:
+                        self.remote = self.remote_factory()
+                    if op == "upsert":
+                        self.remote.upsert_rows(table, _dedupe(payload, conflict), conflict)
+                    else:
+                        self.remote.delete_where(table, payload)
+                except Exception as e:
+                    attempts = attempts_by_id[ids[0]] + 1
+                    delay = self._backoff(attempts)
+                    self.last_error = str(e)
+                    self.journal.mark_failed(ids[0], attempts, time.time() + delay, self.last_error)
+                    print(f"동기화 실패({attempts}번째), {delay:.0f}초 뒤 다시 시도:", e)
+                    return delay
+                self.journal.remove(ids)
+
+            self.last_error = None
+            self.last_synced_at = time.time()
+            # 한 번에 다 못 보냈으면 바로 이어서
+            if len(entries) == self.batch_limit:
+                return 0
+            return self._pull()
+
+    def _pull(self):
+        # 보낼 쓰기가 모두 빠진 뒤에만 받음 → 아직 못 보낸 로컬 변경을 서버의 옛 값으로 덮어쓰지 않음
+        if self.puller is None or self.journal.head(1):
+            return self.idle_interval
+        try:
+            if self.remote is None:
+                self.remote = self.remote_factory()
+            changed = self.puller.pull(self.remote)
+        except Exception as e:
+            self.pull_failures += 1
+            self.last_error = str(e)
+            delay = self._backoff(self.pull_failures)
+            print(f"변경분 받기 실패, {delay:.0f}초 뒤 다시 시도:", e)
+            return delay
+        self.pull_failures = 0
+        self.last_error = None
+        if changed and self.on_pulled:
+            self.on_pulled(changed)
+        return self.idle_interval
+
+    def flush(self, timeout=30.0):
+        """대기 중인 쓰기를 지금 모두 보내봄 (재시도 대기 무시). 다 보냈으면 True"""
+        deadline = time.time() + timeout
+        self.journal.retry_now()
+        while time.time() < deadline:
+            if not self.journal.head(1):
+                return True
+            self.sync_once()
+            if self.last_error is not None:
+                return False
+        return not self.journal.head(1)
+
+
+class OfflineBackend(StorageBackend):
+    """읽기/쓰기는 모두 로컬 SQLite 로 바로 처리하고, 쓰기는 SyncWorker 가 나중에 서버로 보냄
+
+    저장 지연 시간 = 로컬 디스크에 커밋하는 시간. 네트워크가 끊겨 있어도 저장은 실패하지 않습니다.
+    """
+    name = "offline"
+
+    def __init__(self, local, remote_factory, start=True, **worker_options):
+        self.local = local
+        self.journal = WriteJournal(local)
+        self.puller = DeltaPuller(local)
+        # WorkoutDB 가 등록함: 서버 변경분이 들어오면 바뀐 테이블 이름 집합으로 호출
+        self.change_listeners = []
+        self.worker = SyncWorker(self.journal, remote_factory, puller=self.puller, on_pulled=self._notify_changed, **worker_options)
+        if start:
+            self.worker.start()
+
+    def _write(self, changes):
+        """[(table, op, payload, conflict)] 를 로컬에 반영하고 같은 트랜잭션으로 기록해 둠"""
+        with self.local.transaction() as conn:
+            for table, op, payload, conflict in changes:
+                if op == "upsert":
+                    upsert_rows_sql(conn, table, payload, conflict)
+                else:
+                    delete_where_sql(conn, table, payload)
+                self.journal.append(conn, table, op, payload, conflict)
+        self.worker.notify()
+
+    def _notify_changed(self, tables):
+        for listener in list(self.change_listeners):
+            listener(tables)
+
+    def _client_key(self, table, row_id):
+        rows = self.local._query(f"SELECT client_key FROM {table} WHERE id = ?", (row_id,))
+        return rows[0][0] if rows else None
+
+    def pool_stats(self):
+        stats = dict(self.local.pool_stats())
+        stats.update(self.journal.stats())
+        stats["last_sync_error"] = stats["last_sync_error"] or self.worker.last_error
+        return stats
+
+    def flush(self, timeout=30.0):
+        return self.worker.flush(timeout)
+
+    def close(self):
+        self.worker.stop()
+        self.local.close()
+
+    # --- 쓰기: 로컬 + pending_writes ---
+    def upsert_rows(self, table, rows, on_conflict):
+        self._write([(table, "upsert", rows, on_conflict)])
+
+    def delete_where(self, table, match):
+        self._write([(table, "delete", match, None)])
+
+    def insert_record(self, date, exercise, set_num, weight, reps):
+        self.insert_records([(date, exercise, set_num, weight, reps)])
+
+    def insert_records(self, records):
+        rows = [{"date": d, "exercise": e, "set_num": s, "weight": w, "reps": r, "client_key": new_client_key()}
+                for d, e, s, w, r in records]
+        self._write([("workout_records", "upsert", rows, "client_key")])
+
+    def delete_exercise_records(self, date, exercise):
+        self._write([("workout_records", "delete", {"date": date, "exercise": exercise}, None)])
+
+    def insert_exercise(self, name):
+        self._write([("exercises", "upsert", [{"name": name}], "name")])
+
+    def delete_exercise(self, name):
+        self._write([("exercises", "delete", {"name": name}, None)])
+
+    def save_note(self, title, content, note_id=None):
+        if note_id:
+            client_key = self._client_key("notes", note_id)
+            if client_key is None:
+                return note_id # 그 사이 지워진 노트 (다른 백엔드처럼 UPDATE 0줄 → 되살리지 않음)
+        else:
+            client_key = new_client_key()
+        self._write([("notes", "upsert", [{"title": title, "content": content, "client_key": client_key}], "client_key")])
+        return self.local._query("SELECT id FROM notes WHERE client_key = ?", (client_key,))[0][0]
+
+    def delete_note(self, note_id):
+        client_key = self._client_key("notes", note_id)
+        if client_key:
+            self._write([("notes", "delete", {"client_key": client_key}, None)])
+
+    def insert_diet(self, date, meal_type, food_name, cal, carbs, pro, fat):
+        self.insert_diets([(date, meal_type, food_name, cal, carbs, pro, fat)])
+
+    def insert_diets(self, records):
+        rows = [{"date": d, "meal_type": m, "food_name": f, "calories": c, "carbs": cb, "protein": p, "fat": ft,
+                 "client_key": new_client_key()} for d, m, f, c, cb, p, ft in records]
+        self._write([("diet_records", "upsert", rows, "client_key")])
+        ids = self.local.ids_by_key("diet_records", "client_key", (row["client_key"] for row in rows))
+        return [(ids[r["client_key"]], r["meal_type"], r["food_name"], r["calories"], r["carbs"], r["protein"], r["fat"]) for r in rows]
+
+    def delete_diet(self, record_id):
+        client_key = self._client_key("diet_records", record_id)
+        if client_key:
+            self._write([("diet_records", "delete", {"client_key": client_key}, None)])
+
+    def upsert_diet_guide(self, rows):
+        self._write([("diet_guide", "upsert", rows, "food_name")])
+        return self.local.get_diet_guide_by_names(r["food_name"] for r in rows)
+
+    def update_diet_guide(self, guide_id, row):
+        old = self._guide_name(guide_id)
+        if old is None:
+            return None
+        # 가이드는 이름이 동기화 키라서 이름을 바꾸면 서버에서는 '옛 이름 삭제 + 새 이름 추가'
+        changes = [("diet_guide", "delete", {"food_name": old}, None)] if old != row["food_name"] else []
+        self._write(changes + [("diet_guide", "upsert", [row], "food_name")])
+        return next(iter(self.local.get_diet_guide_by_names([row["food_name"]])), None)
+
+    def delete_diet_guide(self, guide_id):
+        # 로컬 id 와 서버 id 는 다를 수 있으므로 동기화 키(음식 이름)로 지움
+        name = self._guide_name(guide_id)
+        if name is not None:
+            self._write([("diet_guide", "delete", {"food_name": name}, None)])
+
+    def _guide_name(self, guide_id):
+        rows = self.local._query("SELECT food_name FROM diet_guide WHERE id = ?", (guide_id,))
+        return rows[0][0] if rows else None
+
+    def save_weight(self, date_str, weight):
+        self._write([("body_weight", "upsert", [{"date": date_str, "weight": weight}], "date")])
+
+    def save_meal_template(self, name, meal_type, items):
+        row = {"name": name, "meal_type": meal_type, "items": json.dumps(items, ensure_ascii=False)}
+        self._write([("meal_templates", "upsert", [row], "name")])
+
+    def delete_meal_template(self, name):
+        self._write([("meal_templates", "delete", {"name": name}, None)])
+
+    # --- 읽기: 로컬에서 바로 ---
+    def get_records_by_date(self, date): return self.local.get_records_by_date(date)
+    def get_records_page(self, before, limit, exercise=None): return self.local.get_records_page(before, limit, exercise)
+    def get_trend_rows(self, exercise, start_date, end_date): return self.local.get_trend_rows(exercise, start_date, end_date)
+    def get_daily_trend(self, exercise, start_date, end_date): return self.local.get_daily_trend(exercise, start_date, end_date)
+    def get_multi_daily_trend(self, exercises, start_date, end_date): return self.local.get_multi_daily_trend(exercises, start_date, end_date)
+    def get_rows_page(self, table, columns, key, after, limit): return self.local.get_rows_page(table, columns, key, after, limit)
+    def get_exercise_summary(self, start_date, end_date): return self.local.get_exercise_summary(start_date, end_date)
+    def get_sets(self, exercise, start_date, end_date): return self.local.get_sets(exercise, start_date, end_date)
+    def get_records_range(self, start_date, end_date): return self.local.get_records_range(start_date, end_date)
+    def get_activity(self, start_date, end_date): return self.local.get_activity(start_date, end_date)
+    def rebuild_daily_summary(self, verify_only=False): return self.local.rebuild_daily_summary(verify_only)
+    def get_all_exercises(self): return self.local.get_all_exercises()
+    def get_all_notes(self): return self.local.get_all_notes()
+    def get_notes_page(self, offset, limit): return self.local.get_notes_page(offset, limit)
+    def get_note_content(self, note_id): return self.local.get_note_content(note_id)
+    def search_notes(self, query, limit): return self.local.search_notes(query, limit)
+    def get_diet_by_date(self, date): return self.local.get_diet_by_date(date)
+    def get_diet_range(self, start_date, end_date): return self.local.get_diet_range(start_date, end_date)
+    def get_diet_totals(self, date): return self.local.get_diet_totals(date)
+    def get_weight(self, date_str): return self.local.get_weight(date_str)
+    def get_weight_range(self, start_date, end_date): return self.local.get_weight_range(start_date, end_date)
+    def get_diet_guide(self): return self.local.get_diet_guide()
+    def get_food_history(self): return self.local.get_food_history()
+    def get_meal_templates(self): return self.local.get_meal_templates()
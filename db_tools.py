@@ -0,0 +1,118 @@
+import argparse
+import os
+import sys
+
+from db_io import CHUNK_SIZE, TABLE_SCHEMAS, Progress, detect_format, export_table, import_file, seed_guide
+from db_supabase import WorkoutDB
+
+
+def cmd_rebuild_summary(db, args):
+    result = db.rebuild_daily_summary(verify_only=args.verify_only)
+    print(f"운동 요약 불일치: {result['exercise_mismatches']}줄 / 식단 요약 불일치: {result['diet_mismatches']}줄")
+    if args.verify_only:
+        return 1 if result['exercise_mismatches'] or result['diet_mismatches'] else 0
+    print("✅ 요약 테이블을 원본 기록 기준으로 다시 만들었습니다.")
+    return 0
+
+
+def _table_paths(args):
+    # 'all' 이면 path 를 폴더로 보고 테이블마다 <폴더>/<테이블>.<형식> 파일
+    if args.table != "all":
+        return [(args.table, args.path)]
+    extension = args.format or "csv"
+    return [(table, os.path.join(args.path, f"{table}.{extension}")) for table in TABLE_SCHEMAS]
+
+
+def _flush(db):
+    # 오프라인 저장소면 서버로 보낼 때까지 기다림 (CLI는 바로 끝나므로)
+    flush = getattr(db.backend, "flush", None)
+    if flush is not None and not flush():
+        print("⚠️ 아직 서버로 보내지 못한 변경이 있습니다. 다음 실행 때 이어서 보냅니다.")
+
+
+def cmd_import(db, args):
+    failed = False
+    for table, path in _table_paths(args):
+        if args.table == "all" and not os.path.exists(path):
+            continue
+        try:
+            imported, skipped, examples = import_file(db, table, path, detect_format(path, args.format), args.chunk_size,
+                                                      Progress(f"{table} ← {os.path.basename(path)}"))
+        except (ValueError, RuntimeError) as e:
+            print(f"❌ {table}: {e}")
+            failed = True
+            continue
+        print(f"✅ {table}: {imported:,}줄 저장" + (f", 잘못된 {skipped:,}줄 건너뜀" if skipped else ""))
+        for line, message in examples:
+            print(f"    {line}번째 줄: {message}")
+        failed = failed or (args.strict and skipped > 0)
+    _flush(db)
+    return 1 if failed else 0
+
+
+def cmd_export(db, args):
+    if args.table == "all":
+        os.makedirs(args.path, exist_ok=True)
+    for table, path in _table_paths(args):
+        try:
+            exported = export_table(db, table, path, detect_format(path, args.format), args.chunk_size,
+                                    Progress(f"{table} → {os.path.basename(path)}"))
+        except RuntimeError as e:
+            print(f"❌ {table}: {e}")
+            return 1
+        print(f"✅ {table}: {exported:,}줄 → {path}")
+    return 0
+
+
+def cmd_seed_guide(db, args):
+    columns = {"food_name": args.name_col, "protein": args.protein_col, "calories": args.calories_col}
+    try:
+        seeded, skipped, examples = seed_guide(db, args.path, columns, detect_format(args.path, args.format), args.chunk_size,
+                                               Progress(f"diet_guide ← {os.path.basename(args.path)}"))
+    except (ValueError, RuntimeError) as e:
+        print(f"❌ diet_guide: {e}")
+        return 1
+    print(f"✅ diet_guide: 음식 {seeded:,}개 저장" + (f", 잘못된 {skipped:,}줄 건너뜀" if skipped else ""))
+    for line, message in examples:
+        print(f"    {line}번째 줄: {message}")
+    _flush(db)
+    return 0
+
+
+def main(argv=None):
+    # 🛠️ 저장소 관리 명령 모음 (WORKOUT_DB_BACKEND 설정을 그대로 따름)
+    parser = argparse.ArgumentParser(description="나만의 운동일지 DB 관리 도구")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("rebuild-summary", help="날짜별 요약 테이블을 원본과 비교하고 다시 만들기")
+    p.add_argument("--verify-only", action="store_true", help="비교만 하고 고치지 않음 (불일치가 있으면 종료 코드 1)")
+    p.set_defaults(func=cmd_rebuild_summary)
+
+    # 📦 가져오기/내보내기: 파일을 chunk-size 줄씩 읽고 써서 100만 줄도 메모리를 조금만 씀
+    for name, func, help_text in (("import", cmd_import, "CSV/Parquet 파일을 테이블로 가져오기 (검증 후 조각마다 한꺼번에 저장)"),
+                                  ("export", cmd_export, "테이블을 CSV/Parquet 파일로 내보내기 (백업)")):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("table", choices=list(TABLE_SCHEMAS) + ["all"], help="'all' 이면 path 는 폴더 (테이블마다 <테이블>.csv)")
+        p.add_argument("path")
+        p.add_argument("--format", choices=["csv", "parquet"], help="기본: 확장자로 판단 (.parquet 이 아니면 CSV)")
+        p.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help=f"한 번에 읽고 저장할 줄 수 (기본 {CHUNK_SIZE})")
+        if name == "import":
+            p.add_argument("--strict", action="store_true", help="잘못된 줄이 하나라도 있으면 종료 코드 1")
+        p.set_defaults(func=func)
+
+    # 🥩 영양성분 DB(예: 식품의약품안전처 식품영양성분 DB 내려받기 파일)로 식단 가이드 한꺼번에 채우기
+    p = sub.add_parser("seed-guide", help="영양성분 DB 파일로 식단 가이드 채우기 (같은 음식 이름은 값만 바꿈)")
+    p.add_argument("path")
+    p.add_argument("--name-col", default="food_name", help="음식 이름 열 (예: 식품명)")
+    p.add_argument("--protein-col", default="protein", help="단백질(g) 열 (예: '단백질(g)')")
+    p.add_argument("--calories-col", default="calories", help="칼로리 열 (예: '에너지(kcal)')")
+    p.add_argument("--format", choices=["csv", "parquet"], help="기본: 확장자로 판단 (.parquet 이 아니면 CSV)")
+    p.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help=f"한 번에 저장할 음식 수 (기본 {CHUNK_SIZE})")
+    p.set_defaults(func=cmd_seed_guide)
+
+    args = parser.parse_args(argv)
+    return args.func(WorkoutDB(), args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,123 @@
+import datetime
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class _TaskSignals(QObject):
+    # (task, result, error) : 작업 스레드에서 보내고 GUI 스레드에서 받음
+    done = pyqtSignal(object, object, object)
+
+
+class _DBTask(QRunnable):
+    def __init__(self, channel, generation, fn, args, kwargs, on_done, on_error):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.channel = channel
+        self.generation = generation
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.on_done = on_done
+        self.on_error = on_error
+        self.cancelled = False
+        self.signals = _TaskSignals()
+
+    def run(self):
+        if self.cancelled:
+            return
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.done.emit(self, None, e)
+            return
+        self.signals.done.emit(self, result, None)
+
+
+class DBRunner(QObject):
+    """WorkoutDB 호출을 작업 스레드 풀에서 돌리고 결과를 GUI 스레드로 돌려주는 실행기
+
+    같은 channel로 새 요청이 들어오면 이전 요청은 취소(또는 결과 무시)되어
+    달력을 빠르게 여러 번 눌러도 마지막 날짜의 결과만 화면에 그려집니다.
+    channel=None 인 요청(저장/삭제 등)은 절대 취소되지 않습니다.
+    """
+    busy_changed = pyqtSignal(str, bool)
+
+    def __init__(self, parent=None, pool=None):
+        super().__init__(parent)
+        self.pool = pool or QThreadPool.globalInstance()
+        self.generations = {}
+        self.pending = {}
+        self.running = set()
+
+    def submit(self, channel, fn, *args, on_done=None, on_error=None, **kwargs):
+        generation = None
+        if channel is not None:
+            self.cancel(channel)
+            generation = self.generations.get(channel, 0) + 1
+            self.generations[channel] = generation
+
+        task = _DBTask(channel, generation, fn, args, kwargs, on_done, on_error)
+        task.signals.done.connect(self._on_task_done)
+        self.running.add(task)
+        if channel is not None:
+            self.pending[channel] = task
+            self.busy_changed.emit(channel, True)
+        self.pool.start(task)
+        return task
+
+    def cancel(self, channel):
+        """아직 끝나지 않은 channel 요청 취소 (이미 실행 중이면 결과만 버림)"""
+        task = self.pending.pop(channel, None)
+        if task is None:
+            return
+        task.cancelled = True
+        if self.pool.tryTake(task):
+            self.running.discard(task)
+        self.busy_changed.emit(channel, False)
+
+    def is_busy(self, channel):
+        return channel in self.pending
+
+    def _on_task_done(self, task, result, error):
+        self.running.discard(task)
+        if task.channel is not None:
+            # 그 사이 더 새로운 요청이 들어왔다면 오래된 결과는 그리지 않음
+            if task.cancelled or self.generations.get(task.channel) != task.generation:
+                return
+            self.pending.pop(task.channel, None)
+            self.busy_changed.emit(task.channel, False)
+
+        if error is not None:
+            if task.on_error:
+                task.on_error(error)
+            else:
+                print("DB 작업 실패:", error)
+        elif task.on_done:
+            task.on_done(result)
+
+
+class Prefetcher:
+    """날짜를 옮길 때마다 앞뒤 radius일치를 작업 스레드에서 미리 읽어 WorkoutDB 캐시에 넣어두는 도우미
+
+    이미 캐시에 있는 날은 건너뛰고, 빠진 날들만 기간 쿼리 한 번으로 채웁니다.
+    캐시는 QueryCache(LRU, max_entries)라서 오래 안 본 날짜부터 밀려나므로 메모리가 한없이 늘지 않습니다.
+    """
+    # 종류 → (캐시 테이블, 캐시 이름, WorkoutDB 채우기 함수 이름)
+    KINDS = {
+        "records": ("workout_records", "by_date", "prefetch_records"),
+        "diet": ("diet_records", "by_date", "prefetch_diet"),
+    }
+
+    def __init__(self, runner, db, radius=3):
+        self.runner = runner
+        self.db = db
+        self.radius = radius
+
+    def around(self, kind, date_str):
+        table, name, loader = self.KINDS[kind]
+        center = datetime.date.fromisoformat(date_str)
+        days = [(center + datetime.timedelta(days=offset)).isoformat() for offset in range(-self.radius, self.radius + 1)]
+        missing = [day for day in days if not self.db.is_cached(table, name, (day,))]
+        if missing:
+            # 채널 하나만 쓰므로 날짜를 빠르게 넘기면 이전 프리패치는 취소됨
+            self.runner.submit('prefetch_' + kind, getattr(self.db, loader), missing[0], missing[-1])
@@ -0,0 +1,250 @@
+"""🍽️ 음식 이름 자동완성 색인 (식단 가이드 + 내가 먹었던 음식)
+
+한글은 자모 단위로 풀어서 비교하므로 글자를 치는 도중("닭가ㅅ", "달")에도 맞고,
+초성만 쳐도("ㄷㄱㅅㅅ") 찾으며, 자모 trigram 으로 오타나 중간 글자("가슴살")도 찾습니다.
+한 번 만든 뒤에는 음식 하나씩 add/remove 로 고치므로 다시 만들 필요가 없습니다.
+"""
+import bisect
+import math
+from collections import Counter
+from itertools import islice
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+# 겹모음/겹받침은 자판에서 치는 순서대로 풀어 둠 (ㅘ = ㅗ+ㅏ, ㄺ = ㄹ+ㄱ)
+JUNGSEONG = ["ㅏ", "ㅐ", "ㅑ", "ㅒ", "ㅓ", "ㅔ", "ㅕ", "ㅖ", "ㅗ", "ㅗㅏ", "ㅗㅐ", "ㅗㅣ", "ㅛ", "ㅜ", "ㅜㅓ", "ㅜㅔ", "ㅜㅣ",
+             "ㅠ", "ㅡ", "ㅡㅣ", "ㅣ"]
+JONGSEONG = ["", "ㄱ", "ㄲ", "ㄱㅅ", "ㄴ", "ㄴㅈ", "ㄴㅎ", "ㄷ", "ㄹ", "ㄹㄱ", "ㄹㅁ", "ㄹㅂ", "ㄹㅅ", "ㄹㅌ", "ㄹㅍ", "ㄹㅎ",
+             "ㅁ", "ㅂ", "ㅂㅅ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+COMPOUND_JAMO = {"ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ", "ㄾ": "ㄹㅌ",
+                 "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ", "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ",
+                 "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ"}
+HANGUL_START, HANGUL_END = 0xAC00, 0xD7A3
+MAX_PREFIX_SCAN = 300  # 접두어가 짧아서 후보가 이보다 많으면 자주 먹은 음식 + 가나다순 앞쪽만 봄
+MAX_FUZZY_SCAN = 200   # 비슷한 이름 후보도 이만큼만 점수를 매김 (먹어 본 음식은 항상 포함)
+FUZZY_MIN_SCORE = 0.5  # 검색어 trigram 중 이 비율 이상이 겹쳐야 비슷한 이름으로 봄
+EMPTY = frozenset()
+
+
+def _syllables():
+    for code in range(HANGUL_END - HANGUL_START + 1):
+        yield chr(HANGUL_START + code), code // 588, code // 28 % 21, code % 28
+
+
+# 🚀 글자마다 파이썬 반복문을 돌지 않도록 str.translate 표를 미리 만들어 둠 (공백은 지움)
+WHITESPACE = {ord(ch): None for ch in " \t\r\n\u3000"}
+JAMO_TABLE = {**{ord(ch): CHOSEONG[i] + JUNGSEONG[m] + JONGSEONG[f] for ch, i, m, f in _syllables()},
+              **{ord(ch): parts for ch, parts in COMPOUND_JAMO.items()}, **WHITESPACE}
+INITIALS_TABLE = {**{ord(ch): CHOSEONG[i] for ch, i, _, _ in _syllables()}, **WHITESPACE}
+
+
+def to_jamo(text):
+    """'닭 가슴살' → 'ㄷㅏㄹㄱㄱㅏㅅㅡㅁㅅㅏㄹ' (공백은 빼고 영문은 소문자로)"""
+    return text.lower().translate(JAMO_TABLE)
+
+
+def to_initials(text):
+    """'닭가슴살' → 'ㄷㄱㅅㅅ' (한글이 아닌 글자는 그대로)"""
+    return text.lower().translate(INITIALS_TABLE)
+
+
+def is_initials(text):
+    return bool(text) and all(ch in CHOSEONG or ch.isspace() for ch in text)
+
+
+def trigrams(jamo):
+    return {jamo[i:i + 3] for i in range(len(jamo) - 2)}
+
+
+class FoodIndex:
+    """음식 이름 → {name, calories, carbs, protein, fat, count, guide}
+
+    count: diet_records 에 기록한 횟수 (많이 먹은 음식이 먼저), guide: 식단 가이드에 있는지
+    영양 정보는 내가 마지막으로 기록한 값이 있으면 그 값, 없으면 가이드 값
+    """
+
+    def __init__(self):
+        self.foods = {}
+        self.keys = []          # 정렬된 (자모 키, 이름) - 이름 전체와 띄어쓴 낱말마다
+        self.initial_keys = []  # 정렬된 (초성 키, 이름)
+        self.eaten_keys = []    # keys 중 먹은 적 있는 음식만 (짧은 접두어일 때 먼저 훑음)
+        self.eaten = set()      # 먹은 적 있는 음식 이름
+        self.postings = {}      # 자모 trigram → 이름 set
+        self.bulk = False       # build() 중에는 정렬하지 않고 붙이기만 한 뒤 마지막에 한 번 정렬
+
+    @classmethod
+    def build(cls, guide_rows=(), history_rows=()):
+        """guide_rows: get_diet_guide() 의 dict 들, history_rows: get_food_history() 의 (이름, 칼, 탄, 단, 지, 횟수)"""
+        index = cls()
+        index.bulk = True
+        for row in guide_rows:
+            index.add_guide(row)
+        for name, cal, carbs, pro, fat, count in history_rows:
+            index.add_eaten(name, cal, carbs, pro, fat, count)
+        for sorted_keys in (index.keys, index.initial_keys, index.eaten_keys):
+            sorted_keys.sort()
+        index.bulk = False
+        return index
+
+    def __len__(self):
+        return len(self.foods)
+
+    def get(self, name):
+        return self.foods.get(name.strip())
+
+    # --- 색인 고치기 (음식 하나씩) ---
+    def _word_keys(self, name):
+        words = name.split()
+        starts = [" ".join(words[i:]) for i in range(len(words))]
+        return {to_jamo(s) for s in starts}, {to_initials(s) for s in starts}
+
+    def _add_key(self, sorted_keys, item):
+        if self.bulk:
+            sorted_keys.append(item)
+        else:
+            bisect.insort(sorted_keys, item)
+
+    def _insert(self, entry):
+        name = entry["name"]
+        self.foods[name] = entry
+        jamo_keys, initial_keys = self._word_keys(name)
+        for key in jamo_keys:
+            self._add_key(self.keys, (key, name))
+        for key in initial_keys:
+            self._add_key(self.initial_keys, (key, name))
+        for gram in trigrams(to_jamo(name)):
+            self.postings.setdefault(gram, set()).add(name)
+
+    def _delete(self, name):
+        entry = self.foods.pop(name)
+        jamo_keys, initial_keys = self._word_keys(name)
+        for sorted_keys, keys in ((self.keys, jamo_keys), (self.initial_keys, initial_keys)):
+            for key in keys:
+                del sorted_keys[bisect.bisect_left(sorted_keys, (key, name))]
+        if entry["count"]:
+            self._set_eaten(name, False)
+        for gram in trigrams(to_jamo(name)):
+            names = self.postings[gram]
+            names.discard(name)
+            if not names:
+                del self.postings[gram]
+
+    def _set_eaten(self, name, eaten):
+        if eaten:
+            self.eaten.add(name)
+        else:
+            self.eaten.discard(name)
+        for key in self._word_keys(name)[0]:
+            if eaten:
+                self._add_key(self.eaten_keys, (key, name))
+            else:
+                del self.eaten_keys[bisect.bisect_left(self.eaten_keys, (key, name))]
+
+    def _entry(self, name):
+        entry = self.foods.get(name)
+        if entry is None:
+            entry = {"name": name, "calories": 0, "carbs": 0, "protein": 0, "fat": 0, "count": 0, "guide": False}
+            self._insert(entry)
+        return entry
+
+    def add_guide(self, row):
+        """식단 가이드 한 줄 추가/수정 (가이드에는 단백질/칼로리만 있음)"""
+        name = (row.get("food_name") or "").strip()
+        if not name:
+            return
+        entry = self._entry(name)
+        entry["guide"] = True
+        if not entry["count"]:
+            entry.update(calories=row.get("calories") or 0, carbs=0, protein=row.get("protein") or 0, fat=0)
+
+    def remove_guide(self, name):
+        entry = self.foods.get(name.strip())
+        if entry is None:
+            return
+        if entry["count"]:
+            entry["guide"] = False  # 먹은 기록이 있으면 자동완성에는 남김
+        else:
+            self._delete(entry["name"])
+
+    def add_eaten(self, name, cal, carbs, pro, fat, times=1):
+        """식단 기록 저장 후 호출 - 영양 정보는 이번 값으로, 먹은 횟수는 늘림"""
+        name = name.strip()
+        if not name:
+            return
+        entry = self._entry(name)
+        if not entry["count"]:
+            self._set_eaten(name, True)
+        entry.update(calories=cal, carbs=carbs, protein=pro, fat=fat, count=entry["count"] + times)
+
+    def sync_guide(self, guide_rows):
+        """가이드 전체 목록과 비교해서 생긴/바뀐/사라진 음식만 고침 → 고친 음식 수"""
+        rows = {(r.get("food_name") or "").strip(): r for r in guide_rows}
+        rows.pop("", None)
+        changed = 0
+        for name in [n for n, e in self.foods.items() if e["guide"] and n not in rows]:
+            self.remove_guide(name)
+            changed += 1
+        for name, row in rows.items():
+            entry = self.foods.get(name)
+            if entry is None or not entry["guide"] or \
+                    (not entry["count"] and (entry["protein"], entry["calories"]) != (row.get("protein") or 0, row.get("calories") or 0)):
+                self.add_guide(row)
+                changed += 1
+        return changed
+
+    # --- 찾기 ---
+    @staticmethod
+    def _prefix_range(sorted_keys, prefix):
+        lo = bisect.bisect_left(sorted_keys, (prefix,))
+        hi = bisect.bisect_left(sorted_keys, (prefix + "\uffff",), lo)
+        return lo, hi
+
+    def _rank(self, names):
+        # 많이 먹은 음식 → 짧은 이름 → 가나다순
+        return sorted(names, key=lambda n: (-self.foods[n]["count"], len(n), n))
+
+    def lookup(self, query, limit=10):
+        """검색어에 맞는 음식 dict 목록 (앞부분이 맞는 음식 먼저, 모자라면 비슷한 이름)"""
+        query = query.strip()
+        if not query:
+            return []
+        if is_initials(query):
+            sorted_keys, prefix = self.initial_keys, to_initials(query)
+        else:
+            sorted_keys, prefix = self.keys, to_jamo(query)
+        lo, hi = self._prefix_range(sorted_keys, prefix)
+        if hi - lo <= MAX_PREFIX_SCAN:
+            found = {name for _, name in sorted_keys[lo:hi]}
+        else:
+            # 후보가 너무 많으면 (한두 글자) 먹어 본 음식은 모두, 나머지는 가나다순 앞쪽만
+            found = {name for _, name in sorted_keys[lo:lo + MAX_PREFIX_SCAN]}
+            if sorted_keys is self.keys:
+                e_lo, e_hi = self._prefix_range(self.eaten_keys, prefix)
+                found.update(name for _, name in self.eaten_keys[e_lo:e_hi])
+        results = self._rank(found)[:limit]
+        if len(results) < limit and sorted_keys is self.keys:
+            results += self._fuzzy(prefix, found, limit - len(results))
+        return [self.foods[name] for name in results]
+
+    def _fuzzy(self, jamo, exclude, limit):
+        """자모 trigram 이 많이 겹치는 이름 (오타, 이름 중간부터 친 경우)"""
+        grams = trigrams(jamo)
+        if not grams:
+            return []
+        lists = sorted((self.postings.get(gram, EMPTY) for gram in grams), key=len)
+        need = max(1, math.ceil(len(lists) * FUZZY_MIN_SCORE))
+        # need 개 이상 겹치는 이름은 반드시 가장 드문 (전체 - need + 1)개 목록 중 하나에 들어 있음
+        seeds = [names for names in lists[:len(lists) - need + 1] if names]
+        pool = set()
+        for names in seeds:
+            pool |= self.eaten & names
+        for names in seeds:
+            if len(pool) >= MAX_FUZZY_SCAN:
+                break
+            pool.update(islice(names, MAX_FUZZY_SCAN - len(pool)))
+        pool -= exclude
+        # 후보끼리만 교집합을 세므로 목록이 커도 후보 수 × trigram 수 만큼만 일함
+        hits = Counter()
+        for names in lists:
+            hits.update(pool & names)
+        scored = sorted((-count, -self.foods[name]["count"], len(name), name) for name, count in hits.items() if count >= need)
+        return [name for *_, name in scored[:limit]]
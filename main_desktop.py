@@ -1,50 +1,108 @@
+import time
+STARTED = time.perf_counter() # ⏱️ 시작 시간 측정 기준 (다른 import 보다 먼저)
+
+import importlib
 import sys
+import threading
 from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QStackedWidget
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QEvent, QTimer
 from PyQt5.QtGui import QFont
 
-from ui_record import RecordWindow
-from ui_manage import ExerciseManager
-from ui_memo import MemoWindow
-from ui_analysis import AnalysisWindow
-from ui_diet import DietWindow # 🌟 식단 UI 불러오기!
+from db_supabase import get_shared_db
+
+# 🚀 화면 이름 → (모듈, 클래스, 들어갈 때 부를 메서드)
+#    홈 화면만 먼저 띄우고 나머지 화면(과 matplotlib/pandas 같은 무거운 import)은 처음 들어갈 때 만듦
+PAGES = {
+    "record": ("ui_record", "RecordWindow", "load_tags"),
+    "manage": ("ui_manage", "ExerciseManager", "load_list"),
+    "memo": ("ui_memo", "MemoWindow", "refresh_list"),
+    "analysis": ("ui_analysis", "AnalysisWindow", "load_exercises"),
+    "diet": ("ui_diet", "DietWindow", "load_diet_data"), # 🌟 식단 관리 화면
+    "history": ("ui_history", "HistoryWindow", "load_history"), # 🌟 전체 운동 기록 화면
+}
+# 분석 화면에서 쓰는 무거운 라이브러리는 홈 화면을 보는 동안 뒤에서 미리 import (Qt를 건드리지 않는 것만)
+PRELOAD_MODULES = ("numpy", "pandas", "matplotlib.figure", "analytics")
+
+
+class StartupTimer:
+    """프로그램 시작부터 각 단계까지 걸린 시간 기록 (콘솔에 출력)"""
+
+    def __init__(self, started=STARTED):
+        self.started = started
+        self.marks = []
+
+    def mark(self, label):
+        self.marks.append((label, time.perf_counter() - self.started))
+
+    def report(self):
+        print("⏱️ 시작 시간: " + " → ".join(f"{label} {elapsed * 1000:.0f}ms" for label, elapsed in self.marks))
+
+
+def preload_modules():
+    for name in PRELOAD_MODULES:
+        importlib.import_module(name)
+
 
 class AppController(QWidget):
-    def __init__(self):
+    def __init__(self, timer=None):
         super().__init__()
         self.setWindowTitle('나만의 운동일지') 
         self.resize(1100, 750) 
+        self.timer = timer or StartupTimer()
+
+        # 🌟 모든 화면이 DB 연결 하나를 같이 씀 (화면마다 새로 연결하지 않음)
+        #    Supabase 클라이언트 import/연결은 홈 화면이 그려진 다음에 만듦 (warm_up 참고)
+        self.db = None
+        self.pages = {}
 
         self.stacked_widget = QStackedWidget()
 
         self.home_page = self.create_home_page()
         self.stacked_widget.addWidget(self.home_page)
-
-        self.record_page = RecordWindow()
-        self.stacked_widget.addWidget(self.record_page)
-        self.record_page.go_back_signal.connect(self.go_home)
-
-        self.manage_page = ExerciseManager()
-        self.stacked_widget.addWidget(self.manage_page)
-        self.manage_page.go_back_signal.connect(self.go_home)
-
-        self.memo_page = MemoWindow()
-        self.stacked_widget.addWidget(self.memo_page)
-        self.memo_page.go_back_signal.connect(self.go_home)
-
-        self.analysis_page = AnalysisWindow()
-        self.stacked_widget.addWidget(self.analysis_page)
-        self.analysis_page.go_back_signal.connect(self.go_home)
-
-        # 🌟 [인덱스 5] 식단 관리 화면 추가
-        self.diet_page = DietWindow()
-        self.stacked_widget.addWidget(self.diet_page)
-        self.diet_page.go_back_signal.connect(self.go_home)
+        self.home_page.installEventFilter(self)
 
         layout = QVBoxLayout()
         layout.setContentsMargins(0, 0, 0, 0)
         layout.addWidget(self.stacked_widget)
         self.setLayout(layout)
+        self.timer.mark("홈 화면 생성")
+
+    def eventFilter(self, obj, event):
+        if obj is self.home_page and event.type() == QEvent.Paint:
+            # 홈 화면이 처음 그려진 순간 → 기록하고 나머지 준비는 이벤트 루프가 한가할 때
+            self.home_page.removeEventFilter(self)
+            self.timer.mark("첫 화면 표시")
+            QTimer.singleShot(0, self.warm_up)
+        return super().eventFilter(obj, event)
+
+    def warm_up(self):
+        self.get_db()
+        self.timer.mark("DB 준비")
+        self.timer.report()
+        print("DB 연결 상태:", self.db.pool_stats())
+        threading.Thread(target=preload_modules, daemon=True).start()
+
+    def get_db(self):
+        if self.db is None:
+            self.db = get_shared_db()
+        return self.db
+
+    def page(self, name):
+        """화면을 처음 찾을 때만 모듈을 불러와 만들고, 그 뒤로는 만들어 둔 것을 그대로 씀"""
+        if name not in self.pages:
+            started = time.perf_counter()
+            module_name, class_name, _ = PAGES[name]
+            window = getattr(importlib.import_module(module_name), class_name)(self.get_db())
+            window.go_back_signal.connect(self.go_home)
+            self.stacked_widget.addWidget(window)
+            self.pages[name] = window
+            print(f"⏱️ '{name}' 화면 첫 생성: {(time.perf_counter() - started) * 1000:.0f}ms")
+        return self.pages[name]
+
+    def open_page(self, name):
+        window = self.page(name)
+        getattr(window, PAGES[name][2])()
+        self.stacked_widget.setCurrentWidget(window)
 
     def create_home_page(self):
         page = QWidget()
@@ -102,7 +160,14 @@ class AppController(QWidget):
         btn_manage.setCursor(Qt.PointingHandCursor)
         btn_manage.clicked.connect(self.go_to_manage)
 
+        btn_history = QPushButton('📜 전체 기록')
+        btn_history.setMinimumHeight(70) 
+        btn_history.setStyleSheet("QPushButton { background-color: #805AD5; color: white; border-radius: 35px; font-size: 18px; font-weight: bold; } QPushButton:hover { background-color: #6B46C1; }")
+        btn_history.setCursor(Qt.PointingHandCursor)
+        btn_history.clicked.connect(self.go_to_history)
+
         bottom_btn_layout.addWidget(btn_memo)
+        bottom_btn_layout.addWidget(btn_history)
         bottom_btn_layout.addWidget(btn_manage)
         
         layout.addLayout(bottom_btn_layout)
@@ -111,30 +176,32 @@ class AppController(QWidget):
         return page
 
     def go_to_record(self):
-        self.record_page.load_tags() 
-        self.stacked_widget.setCurrentIndex(1)
+        self.open_page("record")
 
     def go_to_manage(self):
-        self.manage_page.load_list() 
-        self.stacked_widget.setCurrentIndex(2)
+        self.open_page("manage")
 
     def go_to_memo(self):
-        self.memo_page.refresh_list()
-        self.stacked_widget.setCurrentIndex(3)
+        self.open_page("memo")
 
     def go_to_analysis(self):
-        self.analysis_page.load_exercises()
-        self.stacked_widget.setCurrentIndex(4)
+        self.open_page("analysis")
 
     def go_to_diet(self): # 🌟 식단 창으로 이동
-        self.diet_page.load_diet_data()
-        self.stacked_widget.setCurrentIndex(5)
+        self.open_page("diet")
+
+    def go_to_history(self):
+        self.open_page("history")
 
     def go_home(self):
-        self.stacked_widget.setCurrentIndex(0)
+        self.stacked_widget.setCurrentWidget(self.home_page)
 
 if __name__ == '__main__':
+    timer = StartupTimer()
     app = QApplication(sys.argv)
-    ex = AppController()
+    timer.mark("QApplication")
+    ex = AppController(timer)
     ex.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    exit_code = app.exec_()
+    print("DB 캐시 통계:", ex.get_db().cache_stats())
+    sys.exit(exit_code)
\ No newline at end of file
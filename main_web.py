@@ -2,7 +2,9 @@ import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
 from datetime import date, timedelta
-from db_supabase import WorkoutDB
+from analytics import FORMULA_LABELS, rolling_average, record_flags
+from chart_render import COMPARE_COLORS, decimate_many
+import web_cache as wc # 🌟 조회는 st.cache_data 캐시를 거치고, 쓰기는 바뀐 날짜/종목 캐시만 비움
 
 # ==========================================
 # 0. 기본 세팅 (화면 및 DB)
@@ -13,12 +15,6 @@ st.set_page_config(page_title="나만의 운동일지", page_icon="💪", layout
 plt.rcParams['font.family'] = 'Malgun Gothic'
 plt.rcParams['axes.unicode_minus'] = False
 
-# DB 연결 (새로고침할 때마다 DB를 여러 번 부르지 않게 캐싱)
-@st.cache_resource
-def get_db():
-    return WorkoutDB()
-db = get_db()
-
 # ==========================================
 # 1. 📱 사이드바 메뉴
 # ==========================================
@@ -34,28 +30,38 @@ if page == "💪 운동 일지":
     
     col1, col2 = st.columns(2)
     record_date = col1.date_input("📅 날짜", date.today())
-    selected_ex = col2.selectbox("📌 종목", db.get_all_exercises())
+    selected_ex = col2.selectbox("📌 종목", wc.get_all_exercises())
     
-    c1, c2, c3 = st.columns(3)
+    c1, c2, c3, c4 = st.columns(4)
     weight = c1.number_input("무게 (kg)", min_value=0.0, step=2.5, value=60.0)
     reps = c2.number_input("횟수", min_value=1, step=1, value=10)
     set_num = c3.number_input("세트", min_value=1, step=1, value=1)
+    set_count = c4.number_input("반복 세트 수", min_value=1, step=1, value=1)
     
     if st.button("💾 이 세트 저장하기", use_container_width=True, type="primary"):
-        db.insert_record(record_date.strftime("%Y-%m-%d"), selected_ex, set_num, weight, reps)
-        st.success(f"{selected_ex} {set_num}세트 ({weight}kg x {reps}회) 저장 완료! 🔥")
+        # 같은 무게/횟수 세트를 여러 개 적어도 한 번의 요청으로 저장
+        date_str = record_date.strftime("%Y-%m-%d")
+        sets = [(date_str, selected_ex, set_num + i, weight, reps) for i in range(set_count)]
+        try:
+            wc.insert_records(sets)
+        except Exception as e:
+            st.error(f"저장 실패! 아무 세트도 저장되지 않았습니다. ({e})")
+        else:
+            last_set = set_num + set_count - 1
+            set_text = f"{set_num}세트" if set_count == 1 else f"{set_num}~{last_set}세트"
+            st.success(f"{selected_ex} {set_text} ({weight}kg x {reps}회) 저장 완료! 🔥")
         
     st.divider()
     
     st.subheader("📝 오늘 완료한 운동")
-    today_records = db.get_records_by_date(record_date.strftime("%Y-%m-%d"))
+    today_records = wc.get_records_by_date(record_date.strftime("%Y-%m-%d"))
     if today_records:
         df = pd.DataFrame(today_records, columns=["종목", "세트", "무게(kg)", "횟수"])
         st.dataframe(df, use_container_width=True, hide_index=True)
         
         del_ex = st.selectbox("🗑️ 기록 삭제할 종목 선택", df['종목'].unique())
         if st.button("해당 종목 기록 전체 삭제"):
-            db.delete_exercise_records(record_date.strftime("%Y-%m-%d"), del_ex)
+            wc.delete_exercise_records(record_date.strftime("%Y-%m-%d"), del_ex)
             st.rerun() 
     else:
         st.info("아직 오늘 기록된 운동이 없습니다. 얼른 쇠질하러 가시죠!")
@@ -67,21 +73,51 @@ elif page == "📊 심층 분석":
     st.title("📊 데이터 심층 분석")
     st.write("나의 점진적 과부하를 눈으로 확인하세요!")
     
-    selected_ex = st.selectbox("📌 분석할 종목", db.get_all_exercises())
+    exercises = wc.get_all_exercises()
+    selected_ex = st.selectbox("📌 분석할 종목", exercises)
+    compare = st.multiselect("🆚 함께 비교할 종목 (추정 1RM 겹쳐 보기)", [e for e in exercises if e != selected_ex])
     
-    col1, col2 = st.columns(2)
+    col1, col2, col3 = st.columns(3)
     start_date = col1.date_input("시작일", date.today() - timedelta(days=30))
     end_date = col2.date_input("종료일", date.today())
+    formula = col3.selectbox("🧮 1RM 공식", list(FORMULA_LABELS), format_func=FORMULA_LABELS.get)
         
-    if st.button("📈 그래프 조회하기", use_container_width=True, type="primary"):
-        data = db.get_volume_and_1rm_trend(selected_ex, start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"))
+    clicked = st.button("📈 그래프 조회하기", use_container_width=True, type="primary")
+    if clicked and compare:
+        # 🌟 선택 종목 + 비교 종목을 쿼리 한 번으로 읽어서 같은 날짜 축에 겹쳐 그림
+        dailies = wc.get_multi_daily([selected_ex] + compare, start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"), formula)
+        shown, unit = decimate_many(dailies)
+
+        if all(d['one_rm'].isna().all() for d in shown.values()):
+            st.warning("선택하신 기간 내에 기록이 없습니다.")
+        else:
+            fig, ax = plt.subplots(figsize=(8, 4))
+            for i, (name, daily) in enumerate(shown.items()):
+                points = daily['one_rm'].dropna()
+                ax.plot(points.index, points.round(1), marker='o', markersize=4, linewidth=2.5,
+                        color=COMPARE_COLORS[i % len(COMPARE_COLORS)], label=f"{name} ({FORMULA_LABELS[formula]})")
+            ax.set_ylabel('추정 1RM (kg)', color='#4A5568', fontweight='bold')
+            ax.set_title("종목별 추정 1RM 비교" + (f" ({unit} 단위로 묶음)" if unit else ""), fontsize=14, fontweight='bold', pad=15)
+            ax.grid(axis='y', linestyle='--', alpha=0.3)
+            ax.legend(loc='upper left')
+            fig.autofmt_xdate()
+            st.pyplot(fig)
+
+            # 같은 날짜 index로 맞춰져 있으므로 표로도 바로 비교 가능
+            st.dataframe(pd.DataFrame({name: d['one_rm'].round(1) for name, d in shown.items()}).dropna(how='all'),
+                         use_container_width=True)
+
+    elif clicked:
+        daily = wc.get_daily(selected_ex, start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"), formula)
         
-        if not data:
+        if daily.empty:
             st.warning("선택하신 기간 내에 기록이 없습니다.")
         else:
-            dates = [d[0][-5:] for d in data]
-            volumes = [d[1] for d in data]
-            onerms = [round(d[2], 1) for d in data]
+            dates = list(daily.index.strftime('%m-%d'))
+            volumes = daily['volume'].tolist()
+            onerms = daily['one_rm'].round(1).tolist()
+            trend_avg = rolling_average(daily).tolist()
+            records = record_flags(daily)
 
             fig, ax1 = plt.subplots(figsize=(8, 4))
             ax2 = ax1.twinx()
@@ -91,7 +127,10 @@ elif page == "📊 심층 분석":
             max_vol = max(volumes)
             ax1.set_ylim(0, 100 if max_vol == 0 else max_vol * 1.3)
             
-            ax2.plot(dates, onerms, marker='o', color='#E53E3E', linewidth=3, markersize=6, label='추정 1RM (kg)')
+            ax2.plot(dates, onerms, marker='o', color='#E53E3E', linewidth=3, markersize=6, label=f'추정 1RM (kg, {FORMULA_LABELS[formula]})')
+            ax2.plot(dates, trend_avg, linestyle='--', color='#805AD5', linewidth=2, label='1RM 7회 이동평균')
+            ax2.scatter([d for d, r in zip(dates, records) if r], [v for v, r in zip(onerms, records) if r],
+                        marker='*', s=180, color='#D69E2E', zorder=5, label='최고 기록 갱신')
             ax2.set_ylabel('추정 1RM (kg)', color='#E53E3E', fontweight='bold')
             for i, v in enumerate(onerms):
                 ax2.text(i, v + (max(onerms)*0.03), f"{v}kg", ha='center', va='bottom', color='#C53030', fontweight='bold', fontsize=9)
@@ -117,7 +156,7 @@ elif page == "🥗 식단 트래커":
 
     # ⭐ 체중 기록 섹션
     with st.expander("⚖️ 오늘의 체중 기록", expanded=True):
-        current_weight = db.get_weight(date_str)
+        current_weight = wc.get_weight(date_str)
         col_w1, col_w2 = st.columns([3, 1])
         with col_w1:
             # 안전장치: 체중이 없으면 0.0으로 표시
@@ -126,7 +165,7 @@ elif page == "🥗 식단 트래커":
             st.write("") # 패딩용
             st.write("") 
             if st.button("저장", use_container_width=True):
-                db.save_weight(date_str, new_weight)
+                wc.save_weight(date_str, new_weight)
                 st.success("완료!")
                 st.rerun() # 새로고침하면 아래 단백질 로직에서 즉시 반영됨!
 
@@ -143,12 +182,8 @@ elif page == "🥗 식단 트래커":
         goal_pro = 150 # 기본값 유지
         pro_guide_text = "💡 윗칸에 체중을 입력하고 [저장]을 누르면 단백질 권장량이 자동 계산됩니다."
 
-    # DB에서 오늘 먹은 음식 가져오기
-    records = db.get_diet_by_date(date_str)
-    tot_cal = sum([r[3] for r in records])
-    tot_carbs = sum([r[4] for r in records])
-    tot_pro = sum([r[5] for r in records])
-    tot_fat = sum([r[6] for r in records])
+    # DB에서 오늘 먹은 음식과 하루 합계(요약 테이블) 가져오기
+    records, (tot_cal, tot_carbs, tot_pro, tot_fat) = wc.get_diet_day(date_str)
     
     st.subheader("🔥 오늘의 영양 달성도")
     st.write(f"**총 칼로리:** {tot_cal} / {goal_cal} kcal")
@@ -180,12 +215,36 @@ elif page == "🥗 식단 트래커":
     
     if st.button("➕ 식단 추가", use_container_width=True, type="primary"):
         if food_name:
-            db.insert_diet(date_str, meal_type, food_name, cal, carbs, pro, fat)
+            wc.insert_diet(date_str, meal_type, food_name, cal, carbs, pro, fat)
             st.success("음식이 추가되었습니다!")
             st.rerun()
         else:
             st.warning("음식 이름을 적어주세요!")
 
+    # 🍱 매일 같은 식사는 템플릿으로 저장해 두고 버튼 한 번(insert 한 번)으로 기록
+    templates = {t["name"]: t for t in wc.get_meal_templates()}
+    with st.expander("🍱 식단 템플릿", expanded=bool(templates)):
+        if templates:
+            t1, t2 = st.columns([3, 1])
+            picked = t1.selectbox("템플릿", list(templates), format_func=lambda n: (
+                f"{n} ({templates[n]['meal_type']} · {len(templates[n]['items'])}가지 · {sum(i[1] for i in templates[n]['items'])} kcal)"))
+            if t2.button("🍱 한 번에 기록", use_container_width=True, type="primary"):
+                rows = wc.log_meal_template(date_str, picked)
+                st.success(f"'{picked}' 음식 {len(rows)}가지를 기록했습니다!")
+                st.rerun()
+            if t2.button("🗑️ 템플릿 삭제", use_container_width=True):
+                wc.delete_meal_template(picked)
+                st.rerun()
+        meal_items = [r for r in records if r[1] == meal_type]
+        template_name = st.text_input("새 템플릿 이름", placeholder=f"예: 평일 {meal_type}")
+        if st.button(f"💾 오늘 {meal_type} {len(meal_items)}가지를 템플릿으로 저장", disabled=not meal_items):
+            if template_name.strip():
+                wc.save_meal_template(template_name, meal_type, [r[2:7] for r in meal_items])
+                st.success("템플릿이 저장되었습니다!")
+                st.rerun()
+            else:
+                st.warning("템플릿 이름을 적어주세요!")
+
     if records:
         df_diet = pd.DataFrame(records, columns=["ID", "식사", "음식명", "칼로리", "탄", "단", "지"]).drop(columns=["ID"])
         st.dataframe(df_diet, use_container_width=True, hide_index=True)
@@ -200,20 +259,52 @@ elif page == "📝 필기 노트":
     new_content = st.text_area("내용")
     if st.button("💾 노트 저장하기", type="primary"):
         if new_title:
-            db.save_note(new_title, new_content)
+            wc.save_note(new_title, new_content)
             st.success("노트가 저장되었습니다!")
             st.rerun()
             
     st.divider()
     st.subheader("📚 내 노트 목록")
-    notes = db.get_all_notes()
-    for note_id, title in notes:
-        with st.expander(f"📌 {title}"):
-            full_note = db.get_note_content(note_id)
-            st.write(full_note[1]) 
-            if st.button("🗑️ 삭제", key=f"del_{note_id}"):
-                db.delete_note(note_id)
-                st.rerun()
+    query = st.text_input("🔍 노트 검색", placeholder="제목이나 본문에 들어간 말 (예: 데드 그립)").strip()
+    if query:
+        # 🚀 검색어가 있으면 전체 목록 대신 색인 검색 결과만 (찾은 말 주변 본문만, 찾은 말은 굵게)
+        results = wc.search_notes(query)
+        if not results:
+            st.info("검색어가 들어간 노트가 없습니다.")
+        for note_id, title, excerpt in results:
+            with st.expander(f"📌 {title}"):
+                st.markdown(excerpt.replace("【", "**").replace("】", "**"))
+                if st.button("📖 전체 보기", key=f"find_{note_id}"):
+                    st.write(wc.get_note_content(note_id)[1])
+                if st.button("🗑️ 삭제", key=f"del_{note_id}"):
+                    wc.delete_note(note_id)
+                    st.rerun()
+    else:
+        # 🚀 한 페이지(제목 + 본문 앞부분)를 쿼리 한 번으로 받고, 긴 본문은 [전체 보기]를 눌렀을 때만 불러옴
+        NOTES_PER_PAGE = 20
+        opened = st.session_state.setdefault("opened_notes", set())
+        page_no = st.session_state.get("notes_page", 1)
+        notes, total = wc.get_notes_page((page_no - 1) * NOTES_PER_PAGE, NOTES_PER_PAGE)
+        for note_id, title, preview, truncated in notes:
+            with st.expander(f"📌 {title}"):
+                if truncated and note_id in opened:
+                    st.write(wc.get_note_content(note_id)[1])
+                else:
+                    st.write(preview + ("..." if truncated else ""))
+                    if truncated and st.button("📖 전체 보기", key=f"open_{note_id}"):
+                        opened.add(note_id)
+                        st.rerun()
+                if st.button("🗑️ 삭제", key=f"del_{note_id}"):
+                    wc.delete_note(note_id)
+                    st.rerun()
+
+        pages = max(1, -(-total // NOTES_PER_PAGE))
+        if page_no > pages:
+            # 마지막 쪽 노트를 지워서 쪽 수가 줄어든 경우
+            st.session_state["notes_page"] = pages
+            st.rerun()
+        if pages > 1:
+            st.number_input(f"페이지 (전체 {pages}쪽, 노트 {total}개)", min_value=1, max_value=pages, step=1, key="notes_page")
 
 # ==========================================
 # 6. ⚙️ 설정 및 종목 화면
@@ -227,15 +318,15 @@ elif page == "⚙️ 설정 및 종목":
         st.subheader("➕ 종목 추가")
         new_ex = st.text_input("새로운 운동 이름")
         if st.button("추가하기"):
-            db.insert_exercise(new_ex)
+            wc.insert_exercise(new_ex)
             st.success(f"'{new_ex}' 추가 완료!")
             st.rerun()
             
     with col2:
         st.subheader("🗑️ 종목 삭제")
-        exercises = db.get_all_exercises()
+        exercises = wc.get_all_exercises()
         del_ex = st.selectbox("삭제할 운동 이름", exercises)
         if st.button("삭제하기"):
-            db.delete_exercise(del_ex)
+            wc.delete_exercise(del_ex)
             st.warning(f"'{del_ex}' 삭제 완료!")
             st.rerun()
\ No newline at end of file
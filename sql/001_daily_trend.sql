@@ -0,0 +1,21 @@
+-- 📊 종목별 일일 볼륨 / 최고 추정 1RM(Epley) 집계
+-- 세트 전체를 내려받지 않고 날짜당 한 줄만 돌려줍니다.
+-- SupabaseBackend.get_daily_trend() 가 rpc('daily_trend') 로 호출합니다 (1000줄씩 .range() 로 나눠 받음).
+
+create index if not exists idx_workout_records_date on workout_records (date);
+create index if not exists idx_workout_records_exercise_date on workout_records (exercise, date);
+create index if not exists idx_diet_records_date_meal on diet_records (date, meal_type);
+
+create or replace function daily_trend(p_exercise text, p_start date, p_end date)
+returns table (date date, volume double precision, max_1rm double precision)
+language sql stable
+as $$
+    select r.date,
+           sum(r.weight::double precision * r.reps) as volume,
+           max(r.weight::double precision * (1.0 + r.reps::double precision / 30.0)) as max_1rm
+    from workout_records r
+    where r.exercise = p_exercise
+      and r.date between p_start and p_end
+    group by r.date
+    order by r.date;
+$$;
@@ -0,0 +1,171 @@
+-- 🌟 날짜별 요약 테이블 (트리거로 쓰기 때마다 조금씩 갱신)
+-- daily_exercise_summary : 날짜·종목별 볼륨 / 최고 추정 1RM / 세트 수
+-- daily_diet_summary     : 날짜별 칼로리·탄·단·지 합계
+
+create table if not exists daily_exercise_summary (
+    date date not null,
+    exercise text not null,
+    volume double precision not null default 0,
+    max_1rm double precision not null default 0,
+    set_count integer not null default 0,
+    primary key (date, exercise)
+);
+create index if not exists idx_daily_exercise_summary_exercise_date on daily_exercise_summary (exercise, date);
+
+create table if not exists daily_diet_summary (
+    date date primary key,
+    calories numeric not null default 0,
+    carbs numeric not null default 0,
+    protein numeric not null default 0,
+    fat numeric not null default 0,
+    item_count integer not null default 0
+);
+
+-- (date, exercise) 한 칸을 원본 기준으로 다시 계산
+create or replace function refresh_exercise_summary(p_date date, p_exercise text)
+returns void
+language plpgsql security definer
+as $$
+begin
+    delete from daily_exercise_summary where date = p_date and exercise = p_exercise;
+    insert into daily_exercise_summary (date, exercise, volume, max_1rm, set_count)
+    select r.date, r.exercise,
+           sum(r.weight::double precision * r.reps),
+           max(r.weight::double precision * (1.0 + r.reps::double precision / 30.0)),
+           count(*)
+    from workout_records r
+    where r.date = p_date and r.exercise = p_exercise
+    group by r.date, r.exercise;
+end;
+$$;
+
+create or replace function workout_records_summary_trigger()
+returns trigger
+language plpgsql security definer
+as $$
+begin
+    if tg_op = 'INSERT' then
+        insert into daily_exercise_summary as s (date, exercise, volume, max_1rm, set_count)
+        values (new.date, new.exercise,
+                new.weight::double precision * new.reps,
+                new.weight::double precision * (1.0 + new.reps::double precision / 30.0),
+                1)
+        on conflict (date, exercise) do update
+            set volume = s.volume + excluded.volume,
+                max_1rm = greatest(s.max_1rm, excluded.max_1rm),
+                set_count = s.set_count + 1;
+        return new;
+    end if;
+
+    -- 삭제/수정은 해당 날짜·종목 한 칸만 다시 계산 (최고 1RM은 빼기로 되돌릴 수 없으므로)
+    perform refresh_exercise_summary(old.date, old.exercise);
+    if tg_op = 'UPDATE' then
+        perform refresh_exercise_summary(new.date, new.exercise);
+        return new;
+    end if;
+    return old;
+end;
+$$;
+
+drop trigger if exists trg_workout_records_summary on workout_records;
+create trigger trg_workout_records_summary
+after insert or update or delete on workout_records
+for each row execute function workout_records_summary_trigger();
+
+create or replace function diet_records_summary_trigger()
+returns trigger
+language plpgsql security definer
+as $$
+begin
+    if tg_op in ('UPDATE', 'DELETE') then
+        update daily_diet_summary
+           set calories = calories - old.calories,
+               carbs = carbs - old.carbs,
+               protein = protein - old.protein,
+               fat = fat - old.fat,
+               item_count = item_count - 1
+         where date = old.date;
+        delete from daily_diet_summary where date = old.date and item_count <= 0;
+    end if;
+
+    if tg_op in ('INSERT', 'UPDATE') then
+        insert into daily_diet_summary as s (date, calories, carbs, protein, fat, item_count)
+        values (new.date, new.calories, new.carbs, new.protein, new.fat, 1)
+        on conflict (date) do update
+            set calories = s.calories + excluded.calories,
+                carbs = s.carbs + excluded.carbs,
+                protein = s.protein + excluded.protein,
+                fat = s.fat + excluded.fat,
+                item_count = s.item_count + 1;
+        return new;
+    end if;
+    return old;
+end;
+$$;
+
+drop trigger if exists trg_diet_records_summary on diet_records;
+create trigger trg_diet_records_summary
+after insert or update or delete on diet_records
+for each row execute function diet_records_summary_trigger();
+
+-- 요약 검증 + 재구축: 어긋난 줄 수를 돌려주고, p_verify_only = false 면 원본 기준으로 다시 만듦
+create or replace function rebuild_daily_summary(p_verify_only boolean default false)
+returns table (exercise_mismatches bigint, diet_mismatches bigint)
+language plpgsql security definer
+as $$
+begin
+    drop table if exists expected_exercise;
+    drop table if exists expected_diet;
+
+    create temp table expected_exercise on commit drop as
+    select r.date, r.exercise,
+           sum(r.weight::double precision * r.reps) as volume,
+           max(r.weight::double precision * (1.0 + r.reps::double precision / 30.0)) as max_1rm,
+           count(*)::integer as set_count
+    from workout_records r
+    group by r.date, r.exercise;
+
+    create temp table expected_diet on commit drop as
+    select r.date, sum(r.calories) as calories, sum(r.carbs) as carbs, sum(r.protein) as protein,
+           sum(r.fat) as fat, count(*)::integer as item_count
+    from diet_records r
+    group by r.date;
+
+    select count(*) into exercise_mismatches
+    from expected_exercise e
+    full outer join daily_exercise_summary s on s.date = e.date and s.exercise = e.exercise
+    where e.date is null or s.date is null or s.set_count <> e.set_count
+       or abs(s.volume - e.volume) > 1e-6 or abs(s.max_1rm - e.max_1rm) > 1e-6;
+
+    select count(*) into diet_mismatches
+    from expected_diet e
+    full outer join daily_diet_summary s on s.date = e.date
+    where e.date is null or s.date is null or s.item_count <> e.item_count
+       or s.calories <> e.calories or s.carbs <> e.carbs or s.protein <> e.protein or s.fat <> e.fat;
+
+    if not p_verify_only then
+        delete from daily_exercise_summary;
+        insert into daily_exercise_summary (date, exercise, volume, max_1rm, set_count)
+        select date, exercise, volume, max_1rm, set_count from expected_exercise;
+        delete from daily_diet_summary;
+        insert into daily_diet_summary (date, calories, carbs, protein, fat, item_count)
+        select date, calories, carbs, protein, fat, item_count from expected_diet;
+    end if;
+    return next;
+end;
+$$;
+
+-- 처음 적용할 때 기존 기록으로 채우기
+select * from rebuild_daily_summary(false);
+
+-- daily_trend RPC도 이제 원본 대신 요약 테이블에서 읽음
+create or replace function daily_trend(p_exercise text, p_start date, p_end date)
+returns table (date date, volume double precision, max_1rm double precision)
+language sql stable
+as $$
+    select s.date, s.volume, s.max_1rm
+    from daily_exercise_summary s
+    where s.exercise = p_exercise
+      and s.date between p_start and p_end
+    order by s.date;
+$$;
@@ -0,0 +1,21 @@
+-- 🌟 오프라인 우선 저장(WORKOUT_DB_BACKEND=offline) 용 고유 키
+-- 로컬에서 만든 줄은 client_key 로 서버의 같은 줄을 찾아 upsert 하므로
+-- 동기화가 중간에 끊겨 같은 묶음을 다시 보내도 중복이 생기지 않음
+
+alter table workout_records add column if not exists client_key text;
+alter table diet_records add column if not exists client_key text;
+alter table notes add column if not exists client_key text;
+
+-- 웹 등 다른 곳에서 client_key 없이 넣은 줄도 키를 갖도록 기본값 + 기존 줄 채우기
+alter table workout_records alter column client_key set default gen_random_uuid()::text;
+alter table diet_records alter column client_key set default gen_random_uuid()::text;
+alter table notes alter column client_key set default gen_random_uuid()::text;
+update workout_records set client_key = gen_random_uuid()::text where client_key is null;
+update diet_records set client_key = gen_random_uuid()::text where client_key is null;
+update notes set client_key = gen_random_uuid()::text where client_key is null;
+
+-- upsert(on_conflict=...) 대상이 되는 열은 unique 제약이 있어야 함
+create unique index if not exists idx_workout_records_client_key on workout_records (client_key);
+create unique index if not exists idx_diet_records_client_key on diet_records (client_key);
+create unique index if not exists idx_notes_client_key on notes (client_key);
+create unique index if not exists idx_exercises_name on exercises (name);
@@ -0,0 +1,67 @@
+-- 🌟 델타 동기화: 줄마다 마지막 변경 시각(updated_at) + 삭제 기록(sync_tombstones)
+-- 앱은 테이블별 워터마크 이후 바뀐 줄과 삭제 기록만 받아서 로컬 사본(SQLite)에 반영함
+-- (sql/003_offline_sync.sql 이후에 실행)
+
+create table if not exists sync_tombstones (
+    id bigserial primary key,
+    table_name text not null,
+    row_key text not null,
+    deleted_at timestamptz not null default now()
+);
+create index if not exists idx_sync_tombstones_deleted_at on sync_tombstones (deleted_at);
+
+create or replace function touch_updated_at()
+returns trigger
+language plpgsql
+as $$
+begin
+    new.updated_at := now();
+    return new;
+end;
+$$;
+
+-- 삭제된 줄의 동기화 키(client_key / name / date / id)를 남김. 키 열 이름은 트리거 인자로 받음
+create or replace function record_tombstone()
+returns trigger
+language plpgsql security definer
+as $$
+begin
+    insert into sync_tombstones (table_name, row_key)
+    values (tg_table_name, to_jsonb(old) ->> tg_argv[0]);
+    return old;
+end;
+$$;
+
+do $$
+declare
+    t record;
+begin
+    for t in select * from (values
+        ('workout_records', 'client_key'),
+        ('exercises', 'name'),
+        ('notes', 'client_key'),
+        ('diet_records', 'client_key'),
+        ('body_weight', 'date'),
+        ('diet_guide', 'id')
+    ) as v(table_name, key_column)
+    loop
+        execute format('alter table %I add column if not exists updated_at timestamptz not null default now()', t.table_name);
+        execute format('create index if not exists %I on %I (updated_at)', 'idx_' || t.table_name || '_updated_at', t.table_name);
+        execute format('drop trigger if exists trg_touch_updated_at on %I', t.table_name);
+        execute format('create trigger trg_touch_updated_at before update on %I for each row execute function touch_updated_at()', t.table_name);
+        execute format('drop trigger if exists trg_record_tombstone on %I', t.table_name);
+        execute format('create trigger trg_record_tombstone after delete on %I for each row execute function record_tombstone(%L)', t.table_name, t.key_column);
+    end loop;
+end;
+$$;
+
+-- 오래된 삭제 기록 정리 (이보다 오래 동기화하지 않은 기기는 로컬 DB를 새로 받아야 함)
+create or replace function prune_sync_tombstones(p_keep interval default interval '90 days')
+returns bigint
+language sql security definer
+as $$
+    with deleted as (
+        delete from sync_tombstones where deleted_at < now() - p_keep returning 1
+    )
+    select count(*) from deleted;
+$$;
@@ -0,0 +1,12 @@
+-- 🌟 노트 목록용 뷰: 제목 + 본문 앞 200자(NOTE_PREVIEW_CHARS)만 내려보냄
+-- 목록 화면은 이 뷰를 한 페이지씩 읽고, 전체 본문은 노트를 펼쳤을 때만 notes 에서 따로 읽음
+
+create or replace view notes_preview
+with (security_invoker = on)
+as
+select
+    id,
+    title,
+    left(content, 200) as preview,
+    char_length(content) > 200 as truncated
+from notes;
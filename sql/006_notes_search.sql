@@ -0,0 +1,44 @@
+-- 🔍 노트 검색: pg_trgm(3글자 조각) GIN 색인으로 띄어쓰기 없는 한글도 부분 일치 검색
+-- 색인은 notes 에 쓸 때 Postgres 가 알아서 고치므로 따로 갱신할 필요 없음
+-- 결과는 관련도(제목 유사도 → 전체 유사도 → 최신) 순, 본문은 첫 검색어 주변만 잘라서 내려보냄
+
+create extension if not exists pg_trgm;
+
+-- content 가 null 이면 title || ' ' || content 전체가 null 이 되어 제목으로도 못 찾으므로 coalesce 로 빈 문자열 처리
+-- (예전 식으로 만든 색인은 지우고 새 식으로 다시 만듦 - 검색 쿼리의 식과 똑같아야 색인을 씀)
+drop index if exists idx_notes_search_trgm;
+create index idx_notes_search_trgm
+    on notes using gin ((title || ' ' || coalesce(content, '')) gin_trgm_ops);
+
+create or replace function search_notes(p_query text, p_limit integer default 20)
+returns table (id bigint, title text, excerpt text)
+language sql
+stable
+security invoker
+as $$
+    with terms as (
+        -- 띄어쓰기로 나눈 검색어마다 like 특수문자(\ % _)를 이스케이프
+        select t as term,
+               '%' || replace(replace(replace(t, '\', '\\'), '%', '\%'), '_', '\_') || '%' as pattern
+        from regexp_split_to_table(btrim(p_query), '\s+') as t
+        where t <> ''
+    ),
+    first_term as (
+        select term, pattern from terms limit 1
+    )
+    select
+        n.id::bigint,
+        n.title,
+        substr(coalesce(n.content, ''), greatest(strpos(lower(coalesce(n.content, '')), lower((select term from first_term))) - 20, 1), 120) as excerpt
+    from notes n
+    -- 첫 검색어는 색인으로 후보를 좁히고, 나머지 검색어는 후보 안에서만 확인
+    where (n.title || ' ' || coalesce(n.content, '')) ilike (select pattern from first_term)
+      and not exists (
+          select 1 from terms
+          where (n.title || ' ' || coalesce(n.content, '')) not ilike terms.pattern
+      )
+    order by similarity(n.title, p_query) desc,
+             word_similarity(p_query, n.title || ' ' || coalesce(n.content, '')) desc,
+             n.id desc
+    limit p_limit;
+$$;
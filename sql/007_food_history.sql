@@ -0,0 +1,15 @@
+-- 🌟 음식 자동완성용 뷰: 음식 이름마다 가장 최근에 기록한 영양 정보 + 기록 횟수
+-- 앱은 처음 한 번 이 뷰를 읽어 메모리 색인(food_index.py)을 만들고, 그 뒤로는 저장할 때마다 색인만 고침
+
+create or replace view food_history
+with (security_invoker = on)
+as
+select distinct on (food_name)
+    food_name,
+    calories,
+    carbs,
+    protein,
+    fat,
+    count(*) over (partition by food_name) as times
+from diet_records
+order by food_name, date desc, id desc;
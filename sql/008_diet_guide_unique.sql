@@ -0,0 +1,18 @@
+-- 🌟 식단 가이드: 음식 이름(food_name)을 고유 키로
+-- 앱은 이름 기준 upsert 로 추가/수정/대량 시딩을 하고, 오프라인 동기화도 id 대신 이름으로 같은 줄을 찾음
+-- (sql/004_delta_sync.sql 이후에 실행)
+
+-- 앞뒤 공백을 지운 뒤 같은 이름이 여러 줄이면 가장 최근(id 가 큰) 줄만 남김
+update diet_guide set food_name = btrim(food_name) where food_name <> btrim(food_name);
+
+delete from diet_guide a
+using diet_guide b
+where a.food_name = b.food_name and a.id < b.id;
+
+alter table diet_guide drop constraint if exists diet_guide_food_name_key;
+alter table diet_guide add constraint diet_guide_food_name_key unique (food_name);
+
+-- 삭제 기록도 이름으로 남겨야 다른 기기가 같은 음식을 지울 수 있음
+drop trigger if exists trg_record_tombstone on diet_guide;
+create trigger trg_record_tombstone after delete on diet_guide
+    for each row execute function record_tombstone('food_name');
@@ -0,0 +1,21 @@
+-- 🍱 식단 템플릿: 매일 같은 아침/쉐이크를 음식 여러 개를 한 번에 기록
+-- 템플릿 하나 = 한 줄 (items 는 [[음식 이름, 칼로리, 탄, 단, 지], ...] JSON 글자)
+-- 이름(name)이 고유 키라 저장은 이름 기준 upsert, 오프라인 동기화도 이름으로 같은 줄을 찾음
+-- (sql/004_delta_sync.sql 이후에 실행)
+
+create table if not exists meal_templates (
+    id bigserial primary key,
+    name text not null unique,
+    meal_type text not null,
+    items text not null default '[]',
+    updated_at timestamptz not null default now()
+);
+create index if not exists idx_meal_templates_updated_at on meal_templates (updated_at);
+
+drop trigger if exists trg_touch_updated_at on meal_templates;
+create trigger trg_touch_updated_at before update on meal_templates
+    for each row execute function touch_updated_at();
+
+drop trigger if exists trg_record_tombstone on meal_templates;
+create trigger trg_record_tombstone after delete on meal_templates
+    for each row execute function record_tombstone('name');
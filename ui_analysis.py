@@ -1,23 +1,30 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
-                             QComboBox, QFrame, QGraphicsDropShadowEffect, QDateEdit)
+                             QComboBox, QFrame, QGraphicsDropShadowEffect, QDateEdit,
+                             QToolButton, QMenu, QStackedWidget)
 from PyQt5.QtCore import Qt, pyqtSignal, QDate
 from PyQt5.QtGui import QColor
 
-import matplotlib.pyplot as plt
+import matplotlib
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
 
-from db_supabase import WorkoutDB
+from db_supabase import get_shared_db
+from analytics import FORMULA_LABELS, load_daily, load_multi_daily
+from chart_render import CompareChart, TrendChart
+from db_worker import DBRunner
 
 # 한글 폰트 깨짐 방지 세팅
-plt.rcParams['font.family'] = 'Malgun Gothic'
-plt.rcParams['axes.unicode_minus'] = False
+matplotlib.rcParams['font.family'] = 'Malgun Gothic'
+matplotlib.rcParams['axes.unicode_minus'] = False
 
 class AnalysisWindow(QWidget):
     go_back_signal = pyqtSignal()
 
-    def __init__(self):
+    def __init__(self, db=None):
         super().__init__()
-        self.db = WorkoutDB()
+        self.db = db or get_shared_db()
+        self.runner = DBRunner(self)
+        self.runner.busy_changed.connect(self.on_busy_changed)
         self.initUI()
 
     def initUI(self):
@@ -82,6 +89,24 @@ class AnalysisWindow(QWidget):
         self.exercise_selector = QComboBox()
         self.exercise_selector.setStyleSheet("padding: 8px; font-size: 14px; border-radius: 5px; border: 1px solid #CBD5E0; min-width: 130px;")
         control_layout.addWidget(self.exercise_selector)
+
+        # 4. 추정 1RM 공식 선택
+        control_layout.addWidget(QLabel("🧮 1RM:"))
+        self.formula_selector = QComboBox()
+        for key, label in FORMULA_LABELS.items():
+            self.formula_selector.addItem(label, key)
+        self.formula_selector.setStyleSheet("padding: 8px; font-size: 14px; border-radius: 5px; border: 1px solid #CBD5E0;")
+        control_layout.addWidget(self.formula_selector)
+
+        # 5. 함께 비교할 종목 (여러 개 체크 → 한 번의 조회로 1RM 선을 겹쳐 그림)
+        self.compare_btn = QToolButton()
+        self.compare_btn.setText("🆚 비교")
+        self.compare_btn.setPopupMode(QToolButton.InstantPopup)
+        self.compare_btn.setStyleSheet("padding: 8px; font-size: 14px; border-radius: 5px; border: 1px solid #CBD5E0;")
+        self.compare_menu = QMenu(self.compare_btn)
+        self.compare_menu.triggered.connect(self.on_compare_changed)
+        self.compare_btn.setMenu(self.compare_menu)
+        control_layout.addWidget(self.compare_btn)
         
         self.draw_btn = QPushButton("📈 조회하기")
         self.draw_btn.setStyleSheet("background-color: #3182CE; color: white; padding: 8px 20px; border-radius: 8px; font-weight: bold; font-size: 14px;")
@@ -93,10 +118,16 @@ class AnalysisWindow(QWidget):
         graph_layout.addLayout(control_layout)
 
         # Matplotlib 캔버스 준비
-        self.figure, self.ax1 = plt.subplots(figsize=(9, 5))
-        self.ax2 = self.ax1.twinx()
+        # pyplot(전역 그림 관리자)을 거치지 않고 캔버스에 붙일 Figure만 직접 만듦
+        self.figure = Figure(figsize=(9, 5))
         self.canvas = FigureCanvas(self.figure)
-        graph_layout.addWidget(self.canvas)
+        # 🚀 막대/선/글자는 한 번만 만들고 조회할 때마다 데이터만 바꿔 끼움
+        self.chart = TrendChart(self.figure, self.canvas)
+        # 비교 차트는 처음 비교할 때 만들어서 같은 자리에 번갈아 보여줌
+        self.compare_chart = None
+        self.chart_stack = QStackedWidget()
+        self.chart_stack.addWidget(self.canvas)
+        graph_layout.addWidget(self.chart_stack)
 
         main_layout.addWidget(graph_card, 1)
         self.setLayout(main_layout)
@@ -111,8 +142,25 @@ class AnalysisWindow(QWidget):
         return shadow
 
     def load_exercises(self):
+        self.runner.submit('exercises', self.db.get_all_exercises, on_done=self.show_exercises)
+
+    def show_exercises(self, exercises):
         self.exercise_selector.clear()
-        self.exercise_selector.addItems(self.db.get_all_exercises())
+        self.exercise_selector.addItems(exercises)
+        checked = set(self.compare_exercises())
+        self.compare_menu.clear()
+        for name in exercises:
+            action = self.compare_menu.addAction(name)
+            action.setCheckable(True)
+            action.setChecked(name in checked)
+        self.on_compare_changed()
+
+    def compare_exercises(self):
+        return [action.text() for action in self.compare_menu.actions() if action.isChecked()]
+
+    def on_compare_changed(self, action=None):
+        count = len(self.compare_exercises())
+        self.compare_btn.setText(f"🆚 비교 ({count})" if count else "🆚 비교")
 
     def update_date_range(self):
         """콤보박스 선택에 따라 시작/종료 날짜를 자동으로 바꿔줍니다."""
@@ -142,41 +190,35 @@ class AnalysisWindow(QWidget):
         start_str = self.start_date_edit.date().toString("yyyy-MM-dd")
         end_str = self.end_date_edit.date().toString("yyyy-MM-dd")
 
-        self.ax1.clear()
-        self.ax2.clear()
-
-        # DB에서 해당 구간 데이터만 뽑아오기
-        data = self.db.get_volume_and_1rm_trend(ex, start_str, end_str)
-        
-        if not data:
-            self.ax1.text(0.5, 0.5, f"선택하신 기간({start_str} ~ {end_str}) 내에\n해당 종목의 기록이 없습니다.", 
-                          ha='center', va='center', fontsize=14, color='gray')
+        formula = self.formula_selector.currentData()
+
+        compare = [name for name in self.compare_exercises() if name != ex]
+        if compare:
+            # 선택 종목 + 비교 종목을 쿼리 한 번으로 읽어서 겹쳐 그림
+            self.runner.submit('graph', load_multi_daily, self.db, [ex] + compare, start_str, end_str, formula,
+                               on_done=lambda dailies: self.paint_compare(formula, dailies))
+            return
+
+        # DB에서 해당 구간 데이터만 뽑아오기 (작업 스레드에서, 마지막 조회만 그림)
+        self.runner.submit('graph', load_daily, self.db, ex, start_str, end_str, formula,
+                           on_done=lambda daily: self.paint_graph(ex, start_str, end_str, formula, daily))
+
+    def on_busy_changed(self, channel, busy):
+        if channel == 'graph':
+            self.draw_btn.setText("⏳ 조회 중..." if busy else "📈 조회하기")
+
+    def paint_compare(self, formula, dailies):
+        if self.compare_chart is None:
+            figure = Figure(figsize=(9, 5))
+            self.compare_chart = CompareChart(figure, FigureCanvas(figure))
+            self.chart_stack.addWidget(self.compare_chart.canvas)
+        self.chart_stack.setCurrentWidget(self.compare_chart.canvas)
+        self.compare_chart.update(dailies, FORMULA_LABELS[formula])
+
+    def paint_graph(self, ex, start_str, end_str, formula, daily):
+        self.chart_stack.setCurrentWidget(self.canvas)
+        if daily.empty:
+            self.chart.show_empty(f"선택하신 기간({start_str} ~ {end_str}) 내에\n해당 종목의 기록이 없습니다.")
         else:
-            # X축(날짜) 텍스트 명확하게 표시 ('MM-DD' 형식)
-            dates = [d[0][-5:] for d in data] 
-            volumes = [d[1] for d in data]
-            onerms = [round(d[2], 1) for d in data]
-
-            bars = self.ax1.bar(dates, volumes, color='#E2E8F0', edgecolor='#CBD5E0', label='총 볼륨 (kg)', width=0.5)
-            self.ax1.set_ylabel('총 볼륨 (kg)', color='#718096', fontweight='bold', fontsize=12)
-            self.ax1.tick_params(axis='y', labelcolor='#718096')
-            self.ax1.set_ylim(0, max(volumes) * 1.3)
-            
-            lines = self.ax2.plot(dates, onerms, marker='o', color='#E53E3E', linewidth=3, markersize=8, label='추정 1RM (kg)')
-            self.ax2.set_ylabel('추정 1RM (kg)', color='#E53E3E', fontweight='bold', fontsize=12)
-            self.ax2.tick_params(axis='y', labelcolor='#E53E3E')
-            
-            for i, v in enumerate(onerms):
-                self.ax2.text(i, v + (max(onerms)*0.02), f"{v}kg", ha='center', va='bottom', color='#C53030', fontweight='bold')
-
-            # 🌟 X축 설명 텍스트 (사용자가 쉽게 이해하도록)
-            self.ax1.set_xlabel('운동한 날짜 (월-일)', fontweight='bold', fontsize=11, color='#4A5568')
-            self.ax1.set_title(f"🚀 '{ex}' 성장 퍼포먼스", fontsize=16, fontweight='bold', pad=20)
-            self.ax1.grid(axis='y', linestyle='--', alpha=0.3)
-            
-            lines_1, labels_1 = self.ax1.get_legend_handles_labels()
-            lines_2, labels_2 = self.ax2.get_legend_handles_labels()
-            self.ax1.legend(lines_1 + lines_2, labels_1 + labels_2, loc='upper left')
-
-        self.figure.tight_layout()
-        self.canvas.draw()
\ No newline at end of file
+            # 수백 일이 넘으면 주/월 단위로 묶고 글자는 k번째 점마다만 (chart_render 참고)
+            self.chart.update(daily, ex, FORMULA_LABELS[formula])
\ No newline at end of file
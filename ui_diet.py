@@ -1,19 +1,39 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
                              QComboBox, QLineEdit, QSpinBox, QFrame, QGraphicsDropShadowEffect, 
-                             QProgressBar, QTableWidget, QTableWidgetItem, QHeaderView, QDateEdit, QMessageBox,
-                             QDialog)
-from PyQt5.QtCore import Qt, pyqtSignal, QDate
-from PyQt5.QtGui import QColor
-
-from db_supabase import WorkoutDB
+                             QProgressBar, QTableView, QHeaderView, QDateEdit, QMessageBox,
+                             QDialog, QAbstractItemView, QCompleter, QInputDialog)
+from PyQt5.QtCore import Qt, pyqtSignal, QDate, QModelIndex
+from PyQt5.QtGui import QColor, QStandardItemModel, QStandardItem
+
+from db_supabase import diet_totals, get_shared_db
+from db_worker import DBRunner, Prefetcher
+from food_index import FoodIndex
+from ui_table import KeyedTableModel, DeleteButtonDelegate
+
+
+def create_table_view(model, delete_column, on_delete):
+    # 🚀 줄마다 위젯을 만들지 않는 표: 삭제 버튼도 델리게이트가 그리기만 함
+    view = QTableView()
+    view.setModel(model)
+    view.setSelectionBehavior(QAbstractItemView.SelectRows)
+    view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+    view.verticalHeader().setVisible(False)
+    view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+    delegate = DeleteButtonDelegate(view)
+    delegate.clicked.connect(on_delete)
+    view.setItemDelegateForColumn(delete_column, delegate)
+    view.horizontalHeader().setSectionResizeMode(delete_column, QHeaderView.ResizeToContents)
+    return view
 
 # ==========================================
 # 🌟 1. 식단 가이드 팝업 창
 # ==========================================
 class DietGuideDialog(QDialog):
-    def __init__(self):
+    def __init__(self, db=None):
         super().__init__()
-        self.db = WorkoutDB()
+        self.db = db or get_shared_db()
+        self.runner = DBRunner(self)
+        self.editing_id = None # 표에서 고른 줄을 고치는 중이면 그 줄의 id
         self.setWindowTitle("🥩 실시간 식단 가이드 (from DB)")
         self.setFixedSize(500, 500)
         self.initUI()
@@ -26,15 +46,20 @@ class DietGuideDialog(QDialog):
         title.setStyleSheet("font-size: 18px; font-weight: bold; color: #2D3748; margin-bottom: 5px;")
         layout.addWidget(title)
 
-        self.table = QTableWidget()
-        self.table.setColumnCount(3)
-        self.table.setHorizontalHeaderLabels(["식재료명", "단백질 (g)", "칼로리 (kcal)"])
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.model = KeyedTableModel([
+            ("식재료명", lambda g: g.get('food_name', '')),
+            ("단백질 (g)", lambda g: str(g.get('protein') or 0)),
+            ("칼로리 (kcal)", lambda g: str(g.get('calories') or 0)),
+            ("삭제", lambda g: ""),
+        ], key=lambda g: g.get('id'), parent=self)
+        self.table = create_table_view(self.model, 3, self.delete_guide)
+        for column in range(3):
+            self.table.horizontalHeader().setSectionResizeMode(column, QHeaderView.Stretch)
         self.table.setStyleSheet("""
-            QTableWidget { border: 1px solid #CBD5E0; border-radius: 5px; gridline-color: #E2E8F0; }
+            QTableView { border: 1px solid #CBD5E0; border-radius: 5px; gridline-color: #E2E8F0; }
             QHeaderView::section { background-color: #EDF2F7; padding: 5px; font-weight: bold; border: none; }
         """)
+        self.table.clicked.connect(self.edit_guide)
         layout.addWidget(self.table)
 
         add_layout = QHBoxLayout()
@@ -50,14 +75,14 @@ class DietGuideDialog(QDialog):
         self.inp_new_cal.setRange(0, 5000)
         self.inp_new_cal.setSuffix(" kcal")
         
-        btn_add_new = QPushButton("➕ 추가")
-        btn_add_new.setStyleSheet("background-color: #48BB78; color: white; font-weight: bold; padding: 5px; border-radius: 5px;")
-        btn_add_new.clicked.connect(self.add_new_guide)
+        self.btn_add_new = QPushButton("➕ 추가")
+        self.btn_add_new.setStyleSheet("background-color: #48BB78; color: white; font-weight: bold; padding: 5px; border-radius: 5px;")
+        self.btn_add_new.clicked.connect(self.add_new_guide)
 
         add_layout.addWidget(self.inp_new_name, 2)
         add_layout.addWidget(self.inp_new_pro)
         add_layout.addWidget(self.inp_new_cal)
-        add_layout.addWidget(btn_add_new)
+        add_layout.addWidget(self.btn_add_new)
         
         layout.addLayout(add_layout)
 
@@ -70,26 +95,71 @@ class DietGuideDialog(QDialog):
         self.load_table_data()
 
     def load_table_data(self):
-        guide_data = self.db.get_diet_guide()
-        if not guide_data:
-            self.table.setRowCount(0)
-        else:
-            self.table.setRowCount(len(guide_data))
-            for i, item in enumerate(guide_data):
-                self.table.setItem(i, 0, QTableWidgetItem(item.get('food_name', '')))
-                self.table.setItem(i, 1, QTableWidgetItem(str(item.get('protein', 0))))
-                self.table.setItem(i, 2, QTableWidgetItem(str(item.get('calories', 0))))
+        self.runner.submit('guide', self.db.get_diet_guide, on_done=self.show_table_data,
+                           on_error=lambda e: QMessageBox.warning(self, "불러오기 실패", f"가이드를 불러오지 못했습니다.\n{e}"))
+
+    def show_table_data(self, guide_data):
+        # 이전 목록과 비교해서 바뀐 줄만 반영
+        self.model.set_rows(guide_data or [])
+
+    def delete_guide(self, row):
+        # 누르자마자 그 줄만 표에서 빼고, 실패했을 때만 목록을 다시 읽음
+        guide_id = self.model.row_at(row).get('id')
+        self.model.remove_key(guide_id)
+        if guide_id == self.editing_id:
+            self.reset_inputs()
+        self.runner.submit(None, self.db.delete_diet_guide, guide_id, on_error=lambda e: self.on_delete_failed(e))
+
+    def on_delete_failed(self, error):
+        QMessageBox.warning(self, "삭제 실패", f"가이드를 삭제하지 못했습니다.\n{error}")
+        self.load_table_data()
+
+    def edit_guide(self, index):
+        # 표에서 줄을 누르면 입력칸에 채우고 [수정] 으로 저장
+        if index.column() == 3:
+            return
+        guide = self.model.row_at(index.row())
+        self.editing_id = guide.get('id')
+        self.inp_new_name.setText(guide.get('food_name', ''))
+        self.inp_new_pro.setValue(guide.get('protein') or 0); self.inp_new_cal.setValue(guide.get('calories') or 0)
+        self.btn_add_new.setText("💾 수정")
+
+    def reset_inputs(self):
+        self.editing_id = None
+        self.inp_new_name.clear(); self.inp_new_pro.setValue(0); self.inp_new_cal.setValue(0)
+        self.btn_add_new.setText("➕ 추가")
+        self.table.clearSelection()
 
     def add_new_guide(self):
-        name = self.inp_new_name.text()
+        name = self.inp_new_name.text().strip()
         pro = self.inp_new_pro.value()
         cal = self.inp_new_cal.value()
         if not name:
             QMessageBox.warning(self, "입력 오류", "음식 이름을 입력해주세요!")
             return
-        if self.db.add_diet_guide(name, pro, cal):
-            self.inp_new_name.clear(); self.inp_new_pro.setValue(0); self.inp_new_cal.setValue(0)
+        editing_id = self.editing_id
+        if editing_id is None:
+            # 이미 있는 이름이면 추가 대신 값만 바뀜 (음식 이름은 가이드에서 하나뿐)
+            self.runner.submit(None, self.db.add_diet_guide, name, pro, cal,
+                               on_done=lambda guide: self.on_guide_saved(guide, None), on_error=self.on_save_failed)
+        else:
+            self.runner.submit(None, self.db.update_diet_guide, editing_id, name, pro, cal,
+                               on_done=lambda guide: self.on_guide_saved(guide, editing_id), on_error=self.on_save_failed)
+
+    def on_guide_saved(self, guide, old_id):
+        if guide is None: # 고치는 사이 다른 곳에서 지워진 줄
+            self.reset_inputs()
             self.load_table_data()
+            return
+        if old_id is not None and old_id != guide['id']:
+            self.model.remove_key(old_id) # 오프라인 저장소에서 이름을 바꾸면 id 가 새로 생김
+        # 🚀 목록을 다시 읽지 않고 저장된 줄 하나만 이름 순서 자리에 반영
+        self.model.put_row(guide, sort_key=lambda g: g.get('food_name', ''))
+        if old_id == self.editing_id:
+            self.reset_inputs()
+
+    def on_save_failed(self, error):
+        QMessageBox.warning(self, "저장 실패", f"가이드를 저장하지 못했습니다.\n{error}")
 
 # ==========================================
 # 🌟 2. 메인 식단 기록 화면
@@ -97,9 +167,14 @@ class DietGuideDialog(QDialog):
 class DietWindow(QWidget):
     go_back_signal = pyqtSignal()
 
-    def __init__(self):
+    def __init__(self, db=None):
         super().__init__()
-        self.db = WorkoutDB()
+        self.db = db or get_shared_db()
+        self.runner = DBRunner(self)
+        self.prefetcher = Prefetcher(self.runner, self.db) # 🚀 고른 날짜 앞뒤 3일을 미리 읽어둠
+        self.food_index = None # 🚀 음식 자동완성 색인 (작업 스레드에서 한 번 만들고, 이후엔 저장할 때마다 하나씩 고침)
+        self.templates = {} # 🍱 이름 → 식단 템플릿
+        self.day_totals = (0, 0, 0, 0) # 지금 보고 있는 날짜의 (칼로리, 탄, 단, 지) - 저장/삭제 때 그 줄만큼 더하고 뺌
         self.goal_cal = 2500
         self.goal_carbs = 300
         self.goal_pro = 150 # 기본값 (체중 입력 시 자동 변경됨)
@@ -191,6 +266,24 @@ class DietWindow(QWidget):
 
         # --- 식단 입력 폼 ---
         guide_layout = QHBoxLayout()
+        # 🍱 식단 템플릿: 자주 먹는 식사를 골라 음식 여러 개를 한 번에 기록
+        self.combo_template = QComboBox()
+        self.combo_template.setMinimumWidth(180)
+        self.combo_template.setStyleSheet("padding: 8px; font-size: 14px;")
+        self.combo_template.currentTextChanged.connect(self.on_template_picked)
+        self.btn_log_template = QPushButton("🍱 한 번에 기록")
+        self.btn_log_template.setStyleSheet("background-color: #48BB78; color: white; padding: 8px 15px; border-radius: 8px; font-weight: bold;")
+        self.btn_log_template.clicked.connect(self.log_template)
+        btn_save_template = QPushButton("💾 템플릿 저장")
+        btn_save_template.setToolTip("지금 고른 분류(아침/점심...)로 오늘 기록한 음식들을 템플릿으로 저장")
+        btn_save_template.setStyleSheet("background-color: #EDF2F7; color: #2D3748; padding: 8px 15px; border-radius: 8px; font-weight: bold; border: 1px solid #CBD5E0;")
+        btn_save_template.clicked.connect(self.save_template)
+        self.btn_delete_template = QPushButton("🗑️")
+        self.btn_delete_template.setStyleSheet("background: transparent; font-size: 16px;")
+        self.btn_delete_template.clicked.connect(self.delete_template)
+        for widget in (self.combo_template, self.btn_log_template, btn_save_template, self.btn_delete_template):
+            widget.setCursor(Qt.PointingHandCursor)
+            guide_layout.addWidget(widget)
         guide_layout.addStretch()
         self.btn_guide = QPushButton("📋 식단 가이드 보기 & 추가")
         self.btn_guide.setStyleSheet("background-color: #EDF2F7; color: #2D3748; padding: 8px 15px; border-radius: 8px; font-weight: bold; border: 1px solid #CBD5E0;")
@@ -207,6 +300,15 @@ class DietWindow(QWidget):
         self.inp_food = QLineEdit()
         self.inp_food.setPlaceholderText("음식 이름 (예: 닭가슴살 100g)")
         self.inp_food.setStyleSheet("padding: 8px; font-size: 14px;")
+        # 🍽️ 음식 이름 자동완성: 후보는 FoodIndex 가 고르고, 고르면 칼로리/탄단지를 채움
+        self.food_model = QStandardItemModel(self)
+        self.completer = QCompleter(self.food_model, self)
+        self.completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.completer.setCompletionRole(Qt.UserRole) # 목록엔 영양 정보까지, 입력칸엔 이름만
+        self.completer.activated[QModelIndex].connect(lambda index: self.fill_food(index.data(Qt.UserRole)))
+        self.inp_food.setCompleter(self.completer)
+        self.inp_food.textEdited.connect(self.suggest_foods)
+        self.inp_food.editingFinished.connect(self.fill_typed_food)
 
         self.spin_cal = self.create_spin("kcal")
         self.spin_carbs = self.create_spin("탄(g)")
@@ -227,15 +329,26 @@ class DietWindow(QWidget):
         main_layout.addLayout(input_layout)
 
         # --- 하단 테이블 ---
-        self.table = QTableWidget(0, 8)
-        self.table.setHorizontalHeaderLabels(["ID", "분류", "음식 이름", "칼로리", "탄수화물", "단백질", "지방", "삭제"])
-        self.table.setColumnHidden(0, True)
-        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
+        # record: (id, 분류, 음식 이름, 칼로리, 탄, 단, 지) → id로 줄을 구분해 바뀐 줄만 다시 그림
+        self.diet_model = KeyedTableModel([
+            ("분류", lambda r: r[1]),
+            ("음식 이름", lambda r: r[2]),
+            ("칼로리", lambda r: f"{r[3]} kcal"),
+            ("탄수화물", lambda r: f"{r[4]} g"),
+            ("단백질", lambda r: f"{r[5]} g"),
+            ("지방", lambda r: f"{r[6]} g"),
+            ("삭제", lambda r: ""),
+        ], key=lambda r: r[0], parent=self)
+        self.diet_model.align_center_from = 2
+        self.table = create_table_view(self.diet_model, 6, self.on_delete_clicked)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
         self.table.setStyleSheet("background-color: white; border-radius: 10px;")
         main_layout.addWidget(self.table)
 
         self.setLayout(main_layout)
         self.load_diet_data()
+        self.load_templates()
+        self.runner.submit('food_index', self.build_food_index, on_done=self.set_food_index)
 
     # --- UI 헬퍼 함수들 ---
     def create_shadow(self):
@@ -260,8 +373,102 @@ class DietWindow(QWidget):
         return spin
 
     def show_guide(self):
-        dialog = DietGuideDialog()
+        dialog = DietGuideDialog(self.db)
         dialog.exec_()
+        if self.food_index is not None:
+            # 가이드에서 추가/삭제한 음식만 자동완성 색인에 반영
+            self.food_index.sync_guide(dialog.model.rows)
+
+    # --- 🍽️ 음식 자동완성 ---
+    def build_food_index(self):
+        # 작업 스레드에서 실행됨 (가이드 + 먹었던 음식으로 한 번만)
+        return FoodIndex.build(self.db.get_diet_guide(), self.db.get_food_history())
+
+    def set_food_index(self, index):
+        self.food_index = index
+
+    def suggest_foods(self, text):
+        if self.food_index is None:
+            return
+        self.food_model.clear()
+        for food in self.food_index.lookup(text):
+            item = QStandardItem(f"{food['name']}   {food['calories']}kcal · 탄 {food['carbs']} · 단 {food['protein']} · 지 {food['fat']}")
+            item.setData(food['name'], Qt.UserRole)
+            self.food_model.appendRow(item)
+
+    def fill_food(self, name):
+        food = self.food_index.get(name) if self.food_index is not None and name else None
+        if food is None:
+            return
+        self.inp_food.setText(food['name'])
+        self.spin_cal.setValue(food['calories']); self.spin_carbs.setValue(food['carbs'])
+        self.spin_pro.setValue(food['protein']); self.spin_fat.setValue(food['fat'])
+
+    def fill_typed_food(self):
+        # 목록에서 고르지 않고 이름을 끝까지 쳤을 때도, 영양 정보를 아직 안 넣었으면 채움
+        if not any(spin.value() for spin in (self.spin_cal, self.spin_carbs, self.spin_pro, self.spin_fat)):
+            self.fill_food(self.inp_food.text())
+
+    # --- 🍱 식단 템플릿 ---
+    def load_templates(self, select=None):
+        self.runner.submit('templates', self.db.get_meal_templates, on_done=lambda templates: self.set_templates(templates, select))
+
+    def set_templates(self, templates, select=None):
+        current = select or self.combo_template.currentText()
+        self.templates = {t['name']: t for t in templates}
+        self.combo_template.blockSignals(True)
+        self.combo_template.clear()
+        for name, template in self.templates.items():
+            kcal = sum(item[1] for item in template['items'])
+            self.combo_template.addItem(f"{name} ({template['meal_type']} · {len(template['items'])}가지 · {kcal} kcal)", name)
+        self.combo_template.setCurrentIndex(max(self.combo_template.findData(current), 0))
+        self.combo_template.blockSignals(False)
+        if not self.templates:
+            self.combo_template.setPlaceholderText("저장된 템플릿 없음")
+        self.btn_log_template.setEnabled(bool(self.templates))
+        self.btn_delete_template.setEnabled(bool(self.templates))
+        self.on_template_picked()
+
+    def current_template(self):
+        return self.templates.get(self.combo_template.currentData())
+
+    def on_template_picked(self, *_):
+        # 템플릿을 고르면 분류도 그 템플릿의 분류로 (바꾸면 바꾼 분류로 기록됨)
+        template = self.current_template()
+        if template is not None:
+            self.combo_meal.setCurrentText(template['meal_type'])
+
+    def log_template(self):
+        template = self.current_template()
+        if template is None:
+            return
+        date = self.date_picker.date().toString("yyyy-MM-dd")
+        # 🚀 음식 개수와 상관없이 insert 한 번
+        self.runner.submit(None, self.db.log_meal_template, date, template['name'], self.combo_meal.currentText(),
+                           on_done=lambda rows: self.on_foods_saved(date, rows), on_error=self.on_save_failed)
+
+    def save_template(self):
+        meal = self.combo_meal.currentText()
+        items = [record[2:7] for record in self.diet_model.rows if record[1] == meal]
+        if not items:
+            QMessageBox.warning(self, "템플릿 저장", f"먼저 오늘 {meal}에 음식을 기록해주세요!")
+            return
+        picked = self.current_template()
+        name, ok = QInputDialog.getText(self, "템플릿 저장", f"오늘 {meal} {len(items)}가지를 템플릿으로 저장합니다.\n템플릿 이름:",
+                                        text=picked['name'] if picked and picked['meal_type'] == meal else f"평일 {meal}")
+        if not ok or not name.strip():
+            return
+        self.runner.submit(None, self.db.save_meal_template, name, meal, items,
+                           on_done=lambda _: self.load_templates(select=name.strip()), on_error=self.on_save_failed)
+
+    def delete_template(self):
+        template = self.current_template()
+        if template is None:
+            return
+        if QMessageBox.question(self, "템플릿 삭제", f"'{template['name']}' 템플릿을 삭제할까요?") != QMessageBox.Yes:
+            return
+        self.runner.submit(None, self.db.delete_meal_template, template['name'], on_done=lambda _: self.load_templates(),
+                           on_error=self.on_save_failed)
 
     # 🚀 핵심 동기화: 체중 기반으로 목표 단백질량(self.goal_pro) 자동 변경
     def update_protein_guide_ui(self, weight):
@@ -281,14 +488,17 @@ class DietWindow(QWidget):
         date = self.date_picker.date().toString("yyyy-MM-dd")
         try:
             val = float(self.inp_weight.text())
-            self.db.save_weight(date, val)
-            QMessageBox.information(self, "성공", f"{date} 체중이 저장되었습니다!")
-            
-            # 🚀 체중 저장 직후 전체 데이터를 새로고침하여 목표 단백질량 게이지를 완벽 반영
-            self.load_diet_data() 
-            
         except ValueError:
             QMessageBox.warning(self, "경고", "체중을 숫자로 입력해주세요!")
+            return
+
+        self.runner.submit(None, self.db.save_weight, date, val, on_done=lambda _: self.on_weight_saved(date))
+
+    def on_weight_saved(self, date):
+        QMessageBox.information(self, "성공", f"{date} 체중이 저장되었습니다!")
+
+        # 🚀 체중 저장 직후 전체 데이터를 새로고침하여 목표 단백질량 게이지를 완벽 반영
+        self.load_diet_data()
 
     def add_food(self):
         date = self.date_picker.date().toString("yyyy-MM-dd")
@@ -300,40 +510,53 @@ class DietWindow(QWidget):
         pro = self.spin_pro.value()
         fat = self.spin_fat.value()
 
-        self.db.insert_diet(date, meal, food, cal, carbs, pro, fat)
+        self.runner.submit(None, self.db.insert_diet, date, meal, food, cal, carbs, pro, fat,
+                           on_done=lambda row: self.on_foods_saved(date, [row]), on_error=self.on_save_failed)
         self.inp_food.clear()
         self.spin_cal.setValue(0); self.spin_carbs.setValue(0); self.spin_pro.setValue(0); self.spin_fat.setValue(0)
-        self.load_diet_data()
+
+    def on_foods_saved(self, date, rows):
+        # 🚀 저장된 줄(id 포함)을 받아 표에 끼우고 합계에 더하기만 함 (그날 기록을 다시 읽지 않음)
+        if self.food_index is not None:
+            for _, _, food, cal, carbs, pro, fat in rows:
+                self.food_index.add_eaten(food, cal, carbs, pro, fat) # 다음 자동완성부터 이 값으로
+        if date != self.date_picker.date().toString("yyyy-MM-dd"):
+            return # 저장하는 사이 날짜를 바꿨으면 그 날짜 화면은 그대로
+        for row in rows:
+            self.diet_model.put_row(tuple(row))
+        self.add_to_totals(diet_totals(rows))
+
+    def on_save_failed(self, error):
+        QMessageBox.warning(self, "저장 실패", f"식단을 저장하지 못했습니다.\n{error}")
+
+    def fetch_day(self, date):
+        # 작업 스레드에서 실행됨 (체중 + 식단을 한 번에, 하루 합계는 받은 목록으로 바로 계산 → 요약 테이블 조회 없음)
+        records = self.db.get_diet_by_date(date)
+        return self.db.get_weight(date), records, diet_totals(records)
 
     def load_diet_data(self):
+        # 🌟 날짜를 빠르게 바꿔도 마지막으로 고른 날짜의 결과만 그려짐
         date = self.date_picker.date().toString("yyyy-MM-dd")
-        
+        self.lbl_cal.setText("⏳ 불러오는 중...")
+        self.runner.submit('day', self.fetch_day, date, on_done=lambda result: self.show_diet_data(*result))
+
+    def show_diet_data(self, weight, records, totals):
+        self.prefetcher.around('diet', self.date_picker.date().toString("yyyy-MM-dd"))
         # 체중 불러오기 및 단백질 목표치 업데이트
-        weight = self.db.get_weight(date)
         self.inp_weight.setText(str(weight) if weight > 0 else "")
         self.update_protein_guide_ui(weight) 
 
-        records = self.db.get_diet_by_date(date)
-        self.table.setRowCount(0)
-        tot_cal, tot_carbs, tot_pro, tot_fat = 0, 0, 0, 0
+        # 표는 이전 목록과 비교해서 추가/삭제/변경된 줄만 반영 (음식 하나 추가 = 한 줄 삽입)
+        self.diet_model.set_rows(tuple(record) for record in records)
+        self.day_totals = tuple(totals)
+        self.show_totals()
 
-        for row, record in enumerate(records):
-            r_id, meal, food, cal, carbs, pro, fat = record
-            tot_cal += cal; tot_carbs += carbs; tot_pro += pro; tot_fat += fat
-            
-            self.table.insertRow(row)
-            self.table.setItem(row, 0, QTableWidgetItem(str(r_id)))
-            self.table.setItem(row, 1, QTableWidgetItem(meal))
-            self.table.setItem(row, 2, QTableWidgetItem(food))
-            self.table.setItem(row, 3, QTableWidgetItem(f"{cal} kcal"))
-            self.table.setItem(row, 4, QTableWidgetItem(f"{carbs} g"))
-            self.table.setItem(row, 5, QTableWidgetItem(f"{pro} g"))
-            self.table.setItem(row, 6, QTableWidgetItem(f"{fat} g"))
-            
-            del_btn = QPushButton("❌")
-            del_btn.setStyleSheet("color: red; border: none; font-size: 16px;")
-            del_btn.clicked.connect(lambda _, r=r_id: self.delete_record(r))
-            self.table.setCellWidget(row, 7, del_btn)
+    def add_to_totals(self, delta, sign=1):
+        self.day_totals = tuple(total + sign * value for total, value in zip(self.day_totals, delta))
+        self.show_totals()
+
+    def show_totals(self):
+        tot_cal, tot_carbs, tot_pro, tot_fat = self.day_totals
 
         # 🚀 변경된 self.goal_pro를 바탕으로 게이지 바와 텍스트가 올바르게 그려짐
         self.cal_bar.setValue(int(min(100, (tot_cal / self.goal_cal) * 100)))
@@ -352,6 +575,20 @@ class DietWindow(QWidget):
         self.lbl_pro.setText(f"🍗 단백질: {tot_pro} / {self.goal_pro} g")
         self.lbl_fat.setText(f"🥑 지방: {tot_fat} / {self.goal_fat} g")
 
-    def delete_record(self, record_id):
-        self.db.delete_diet(record_id)
+    def on_delete_clicked(self, row):
+        # 누르자마자 그 줄만 화면에서 빼고, 저장소 삭제가 끝나면 그 줄만큼 합계에서 뺌
+        record = self.diet_model.remove_key(self.diet_model.row_at(row)[0])
+        self.delete_record(record)
+
+    def delete_record(self, record):
+        date = self.date_picker.date().toString("yyyy-MM-dd")
+        self.runner.submit(None, self.db.delete_diet, record[0], on_done=lambda _: self.on_food_deleted(date, record),
+                           on_error=lambda e: self.on_delete_failed(e))
+
+    def on_food_deleted(self, date, record):
+        if date == self.date_picker.date().toString("yyyy-MM-dd"):
+            self.add_to_totals(diet_totals([record]), sign=-1)
+
+    def on_delete_failed(self, error):
+        QMessageBox.warning(self, "삭제 실패", f"기록을 삭제하지 못했습니다.\n{error}")
         self.load_diet_data()
\ No newline at end of file
@@ -0,0 +1,180 @@
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox,
+                             QTableView, QHeaderView, QAbstractItemView, QFrame, QGraphicsDropShadowEffect)
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+from PyQt5.QtGui import QColor
+from db_supabase import get_shared_db
+from db_worker import DBRunner
+
+ALL_EXERCISES = "전체 종목"
+
+
+class HistoryModel(QAbstractTableModel):
+    """전체 운동 기록을 최신순으로 한 페이지씩 이어 붙이는 표 모델
+
+    줄마다 위젯을 만들지 않고 QTableView가 보이는 칸만 그리므로 수만 세트도 가볍게 스크롤되고,
+    맨 아래에 닿으면 fetchMore()가 다음 페이지를 작업 스레드에서 불러옵니다.
+    """
+    HEADERS = ["날짜", "종목", "세트", "무게 (kg)", "횟수", "볼륨 (kg)"]
+    loaded = pyqtSignal(int, bool)  # (지금까지 불러온 세트 수, 끝까지 다 불러왔는지)
+
+    def __init__(self, db, runner, page_size=200, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.runner = runner
+        self.page_size = page_size
+        self.rows = []
+        self.exercise = None
+        self.exhausted = False
+        self.loading = False
+
+    def reset(self, exercise=None):
+        self.beginResetModel()
+        self.rows = []
+        self.exercise = exercise
+        self.exhausted = False
+        self.loading = False
+        self.endResetModel()
+        self.fetchMore(QModelIndex())
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        _, date, exercise, set_num, weight, reps = self.rows[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            return (date, exercise, f"{set_num}세트", f"{weight:g}", f"{reps}회", f"{weight * reps:g}")[column]
+        if role == Qt.TextAlignmentRole and column >= 2:
+            return Qt.AlignCenter
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.exhausted and not self.loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self.exhausted or self.loading:
+            return
+        self.loading = True
+        before = (self.rows[-1][1], self.rows[-1][0]) if self.rows else None
+        self.runner.submit('page', self.db.get_records_page, before, self.page_size, self.exercise, on_done=self.append_page)
+
+    def append_page(self, page):
+        self.loading = False
+        if len(page) < self.page_size:
+            self.exhausted = True
+        if page:
+            self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(page) - 1)
+            self.rows.extend(page)
+            self.endInsertRows()
+        self.loaded.emit(len(self.rows), self.exhausted)
+
+
+class HistoryWindow(QWidget):
+    go_back_signal = pyqtSignal() # 🌟 메인으로 돌아가는 신호기
+
+    def __init__(self, db=None):
+        super().__init__()
+        self.db = db or get_shared_db()
+        self.runner = DBRunner(self)
+        self.model = HistoryModel(self.db, self.runner, parent=self)
+        self.model.loaded.connect(self.on_loaded)
+        self.initUI()
+
+    def initUI(self):
+        self.setStyleSheet("background-color: #E8F0FE; font-family: 'Malgun Gothic';")
+        main_layout = QVBoxLayout()
+        main_layout.setContentsMargins(30, 40, 30, 40)
+
+        # 🌟 상단 헤더 (뒤로가기 버튼 & 제목)
+        header_layout = QHBoxLayout()
+        self.back_btn = QPushButton("⬅️ 홈으로")
+        self.back_btn.setStyleSheet("QPushButton { background: transparent; color: #3182CE; font-weight: bold; font-size: 15px; text-align: left; } QPushButton:hover { color: #2B6CB0; }")
+        self.back_btn.setCursor(Qt.PointingHandCursor)
+        self.back_btn.clicked.connect(self.go_back_signal.emit)
+
+        title = QLabel("📜 전체 운동 기록")
+        title.setStyleSheet("font-size: 18px; font-weight: bold; color: #1A365D;")
+
+        header_layout.addWidget(self.back_btn)
+        header_layout.addStretch()
+        header_layout.addWidget(title)
+        main_layout.addLayout(header_layout)
+        main_layout.addSpacing(20)
+
+        content_card = QFrame()
+        content_card.setStyleSheet("QFrame { background-color: white; border-radius: 20px; }")
+        shadow = QGraphicsDropShadowEffect()
+        shadow.setBlurRadius(20); shadow.setXOffset(0); shadow.setYOffset(6)
+        shadow.setColor(QColor(0, 0, 0, 15))
+        content_card.setGraphicsEffect(shadow)
+
+        content_layout = QVBoxLayout(content_card)
+        content_layout.setContentsMargins(30, 30, 30, 30)
+
+        # 종목 필터 & 불러온 개수
+        filter_layout = QHBoxLayout()
+        self.exercise_selector = QComboBox()
+        self.exercise_selector.setStyleSheet("padding: 8px; border-radius: 8px; border: 1px solid #CBD5E0; background: #F8FAFC; font-size: 14px;")
+        self.exercise_selector.currentIndexChanged.connect(self.on_filter_changed)
+        self.count_label = QLabel("")
+        self.count_label.setStyleSheet("color: #718096; font-size: 13px;")
+        filter_layout.addWidget(self.exercise_selector)
+        filter_layout.addStretch()
+        filter_layout.addWidget(self.count_label)
+        content_layout.addLayout(filter_layout)
+        content_layout.addSpacing(10)
+
+        # 🚀 줄 높이를 고정해 두면 뷰가 줄마다 크기를 재지 않아 스크롤이 가벼움
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setStyleSheet("QTableView { background-color: #F8FAFC; border: 1px solid #CBD5E0; border-radius: 10px; font-size: 14px; gridline-color: #E2E8F0; } QHeaderView::section { background-color: #EDF2F7; color: #2D3748; font-weight: bold; border: none; padding: 6px; }")
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setAlternatingRowColors(True)
+        self.table.verticalHeader().setVisible(False)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(30)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        content_layout.addWidget(self.table)
+
+        main_layout.addWidget(content_card)
+        self.setLayout(main_layout)
+
+    def load_history(self):
+        """화면에 들어올 때마다 종목 목록과 첫 페이지를 새로 불러옴"""
+        self.runner.submit('exercises', self.db.get_all_exercises, on_done=self.show_exercises)
+        self.model.reset(self.current_exercise())
+
+    def show_exercises(self, exercises):
+        current = self.exercise_selector.currentText()
+        self.exercise_selector.blockSignals(True)
+        self.exercise_selector.clear()
+        self.exercise_selector.addItem(ALL_EXERCISES)
+        self.exercise_selector.addItems(exercises)
+        index = self.exercise_selector.findText(current)
+        self.exercise_selector.setCurrentIndex(max(index, 0))
+        self.exercise_selector.blockSignals(False)
+        if index < 0 and current and current != ALL_EXERCISES:
+            # 보고 있던 종목이 삭제됐으면 전체 보기로
+            self.model.reset(None)
+
+    def current_exercise(self):
+        text = self.exercise_selector.currentText()
+        return None if not text or text == ALL_EXERCISES else text
+
+    def on_filter_changed(self):
+        self.model.reset(self.current_exercise())
+        self.table.scrollToTop()
+
+    def on_loaded(self, count, exhausted):
+        self.count_label.setText(f"{count}세트" + ("" if exhausted else " (아래로 내리면 더 불러옴)"))
@@ -2,14 +2,16 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QListWidget,
                              QLineEdit, QPushButton, QLabel, QFrame, QGraphicsDropShadowEffect)
 from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QColor
-from db_supabase import WorkoutDB
+from db_supabase import get_shared_db
+from db_worker import DBRunner
 
 class ExerciseManager(QWidget):
     go_back_signal = pyqtSignal() # 🌟 메인으로 돌아가는 신호기
 
-    def __init__(self):
+    def __init__(self, db=None):
         super().__init__()
-        self.db = WorkoutDB()
+        self.db = db or get_shared_db()
+        self.runner = DBRunner(self)
         self.initUI()
 
     def initUI(self):
@@ -75,19 +77,19 @@ class ExerciseManager(QWidget):
         self.setLayout(main_layout)
 
     def load_list(self):
+        self.runner.submit('list', self.db.get_all_exercises, on_done=self.show_list)
+
+    def show_list(self, exercises):
         self.list_widget.clear()
-        exercises = self.db.get_all_exercises()
         self.list_widget.addItems(exercises)
 
     def add_exercise(self):
         name = self.input_field.text().strip()
         if name:
-            self.db.insert_exercise(name)
+            self.runner.submit(None, self.db.insert_exercise, name, on_done=lambda _: self.load_list())
             self.input_field.clear()
-            self.load_list()
 
     def delete_exercise(self):
         selected = self.list_widget.currentItem()
         if selected:
-            self.db.delete_exercise(selected.text())
-            self.load_list()
\ No newline at end of file
+            self.runner.submit(None, self.db.delete_exercise, selected.text(), on_done=lambda _: self.load_list())
\ No newline at end of file
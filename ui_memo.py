@@ -1,16 +1,67 @@
+import hashlib
+
 from PyQt5.QtWidgets import (QWidget, QHBoxLayout, QVBoxLayout, QListWidget, QListWidgetItem,
                              QLabel, QLineEdit, QTextEdit, QPushButton, QFrame, QGraphicsDropShadowEffect)
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QColor
-from db_supabase import WorkoutDB
+from db_supabase import get_shared_db
+from db_worker import DBRunner
+
+SEARCH_DELAY_MS = 250 # 타자를 멈추고 이만큼 지나야 검색 (글자마다 쿼리하지 않음)
+AUTOSAVE_DELAY_MS = 1500 # 타자를 멈추고 이만큼 지나면 자동 저장 (그 사이 고친 내용은 한 번에)
+UNTITLED = "제목 없는 노트"
+
+def content_hash(title, content):
+    return hashlib.sha1(f"{title}\0{content}".encode("utf-8")).hexdigest()
+
+class NoteDraft:
+    """편집 중인 노트 하나의 저장 상태
+
+    마지막으로 저장(요청)한 내용의 해시와 비교해서 바뀌었을 때만 쓰고,
+    저장 중에 또 고친 내용은 pending 에 모아 두었다가 저장이 끝나면 한 번만 더 씀
+    (새 노트의 첫 저장이 끝나기 전에 또 저장해서 노트가 두 개 생기는 일이 없음)
+    """
+
+    def __init__(self, note_id=None, title="", content=""):
+        self.note_id = note_id
+        self.latest = (title, content) # 편집기에 마지막으로 있던 내용
+        self.written_hash = content_hash(title, content)
+        self.pending = None
+        self.saving = False
+        self.deleted = False
+
+    def stage(self, title, content):
+        self.latest = (title, content)
+        digest = content_hash(title, content)
+        self.pending = None if digest == self.written_hash else (title, content, digest)
+
+    def take(self):
+        """지금 쓸 (제목, 본문) - 저장 중이거나 바뀐 게 없으면 None"""
+        if self.saving or self.pending is None or self.deleted:
+            return None
+        title, content, self.written_hash = self.pending
+        self.pending = None
+        self.saving = True
+        return title, content
+
+    def failed(self, title, content):
+        # 다음 자동 저장 때 다시 시도 (그 사이 더 고친 내용이 있으면 그쪽이 우선)
+        self.saving = False
+        self.written_hash = None
+        if self.pending is None:
+            self.pending = (title, content, content_hash(title, content))
+
 
 class MemoWindow(QWidget):
     go_back_signal = pyqtSignal()
 
-    def __init__(self):
+    def __init__(self, db=None):
         super().__init__()
-        self.db = WorkoutDB()
+        self.db = db or get_shared_db()
+        self.runner = DBRunner(self)
         self.current_note_id = None # 현재 열려있는 노트의 ID
+        self.draft = NoteDraft() # 🌟 현재 노트의 자동 저장 상태 (노트를 불러오는 중엔 None)
+        self.busy_drafts = {} # 저장이 아직 안 끝난 노트 id → NoteDraft
         self.initUI()
 
     def initUI(self):
@@ -30,7 +81,7 @@ class MemoWindow(QWidget):
         self.back_btn = QPushButton("⬅️ 홈으로")
         self.back_btn.setStyleSheet("QPushButton { background: transparent; color: #3182CE; font-weight: bold; font-size: 18px; text-align: left; } QPushButton:hover { color: #2B6CB0; }")
         self.back_btn.setCursor(Qt.PointingHandCursor)
-        self.back_btn.clicked.connect(self.go_back_signal.emit)
+        self.back_btn.clicked.connect(self.go_back)
         
         cal_title = QLabel("📚 내 노트 목록")
         cal_title.setStyleSheet("font-size: 20px; font-weight: bold; color: #1A365D;")
@@ -48,6 +99,19 @@ class MemoWindow(QWidget):
         left_layout.addWidget(self.new_btn)
         left_layout.addSpacing(10)
 
+        # 🔍 노트 검색 (제목 + 본문, 타자를 멈추면 검색)
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("🔍 노트 검색 (제목, 본문)")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.setStyleSheet("QLineEdit { border: 1px solid #CBD5E0; border-radius: 8px; padding: 8px; font-size: 15px; background-color: #F8FAFC; }")
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.refresh_list)
+        self.search_input.textChanged.connect(self.search_timer.start)
+        left_layout.addWidget(self.search_input)
+        left_layout.addSpacing(5)
+
         self.list_widget = QListWidget()
         self.list_widget.setStyleSheet("QListWidget { border: 1px solid #E2E8F0; border-radius: 10px; padding: 5px; font-size: 16px; background-color: #F8FAFC; } QListWidget::item { padding: 10px; border-bottom: 1px solid #E2E8F0; } QListWidget::item:selected { background-color: #3182CE; color: white; border-radius: 5px; }")
         self.list_widget.itemClicked.connect(self.load_note)
@@ -86,6 +150,18 @@ class MemoWindow(QWidget):
         self.content_input.setStyleSheet("QTextEdit { border: 1px solid #CBD5E0; border-radius: 8px; padding: 15px; font-size: 16px; background-color: #F8FAFC; }")
         right_layout.addWidget(self.content_input)
 
+        # 💾 자동 저장: 고칠 때마다 타이머를 다시 시작해서 타자를 멈췄을 때 한 번만 저장
+        self.autosave_timer = QTimer(self)
+        self.autosave_timer.setSingleShot(True)
+        self.autosave_timer.setInterval(AUTOSAVE_DELAY_MS)
+        self.autosave_timer.timeout.connect(self.autosave)
+        self.title_input.textChanged.connect(self.autosave_timer.start)
+        self.content_input.textChanged.connect(self.autosave_timer.start)
+
+        self.status_label = QLabel("")
+        self.status_label.setStyleSheet("font-size: 13px; color: #718096;")
+        right_layout.addWidget(self.status_label)
+
         self.save_btn = QPushButton('노트 저장하기')
         self.save_btn.setStyleSheet("QPushButton { background-color: #3182CE; color: white; border-radius: 15px; padding: 15px; font-weight: bold; font-size: 16px; margin-top: 10px; } QPushButton:hover { background-color: #2B6CB0; }")
         self.save_btn.setCursor(Qt.PointingHandCursor)
@@ -104,39 +180,166 @@ class MemoWindow(QWidget):
         return shadow
 
     def refresh_list(self):
+        # 검색어가 있으면 검색 결과, 없으면 전체 목록 (같은 'list' 작업이라 마지막 요청 결과만 표시)
+        query = self.search_input.text().strip()
+        if query:
+            self.runner.submit('list', self.db.search_notes, query, on_done=self.show_results)
+        else:
+            self.runner.submit('list', self.db.get_all_notes, on_done=self.show_list)
+
+    def show_list(self, notes):
         self.list_widget.clear()
-        notes = self.db.get_all_notes()
         for note_id, title in notes:
             item = QListWidgetItem(title)
             item.setData(Qt.UserRole, note_id) # 눈에 안보이게 ID값을 숨겨둠
             self.list_widget.addItem(item)
 
+    def show_results(self, results):
+        self.list_widget.clear()
+        for note_id, title, excerpt in results:
+            item = QListWidgetItem(f"{title}\n{excerpt}")
+            item.setData(Qt.UserRole, note_id)
+            self.list_widget.addItem(item)
+        if not results:
+            item = QListWidgetItem("검색어가 들어간 노트가 없습니다.")
+            item.setFlags(Qt.NoItemFlags)
+            self.list_widget.addItem(item)
+
+    def update_list_item(self, note_id, title):
+        """저장한 노트 한 줄만 고치기 (목록 전체를 다시 읽지 않음)"""
+        for row in range(self.list_widget.count()):
+            item = self.list_widget.item(row)
+            if item.data(Qt.UserRole) == note_id:
+                # 검색 결과 줄은 '제목\n찾은 부분' 이라 첫 줄만 바꿈
+                item.setText("\n".join([title] + item.text().split("\n", 1)[1:]))
+                return item
+        if self.search_input.text().strip():
+            return None # 검색 중이면 새 노트가 검색어에 맞는지 모르므로 그대로 둠
+        item = QListWidgetItem(title)
+        item.setData(Qt.UserRole, note_id)
+        self.list_widget.insertItem(0, item) # 목록은 최신 노트부터
+        return item
+
+    def remove_list_item(self, note_id):
+        for row in range(self.list_widget.count()):
+            if self.list_widget.item(row).data(Qt.UserRole) == note_id:
+                self.list_widget.takeItem(row)
+                return
+
+    def editor_values(self):
+        return self.title_input.text().strip(), self.content_input.toPlainText().strip()
+
+    def autosave(self):
+        """바뀐 내용이 있으면 지금 저장 (노트를 바꾸거나 화면을 떠날 때도 먼저 호출)"""
+        self.autosave_timer.stop()
+        draft = self.draft
+        if draft is None:
+            return
+        title, content = self.editor_values()
+        if draft.note_id is None and not title and not content:
+            return # 아무것도 안 쓴 새 노트는 저장하지 않음
+        draft.stage(title, content)
+        self.write_draft(draft)
+
+    def write_draft(self, draft):
+        values = draft.take()
+        if values is None:
+            return
+        title, content = values
+        if draft.note_id is not None:
+            self.busy_drafts[draft.note_id] = draft
+        if draft is self.draft:
+            self.status_label.setText("💾 저장 중...")
+        self.runner.submit(None, self.db.save_note, title or UNTITLED, content, draft.note_id,
+                           on_done=lambda note_id: self.on_saved(draft, note_id, title),
+                           on_error=lambda error: self.on_save_failed(draft, title, content, error))
+
+    def on_saved(self, draft, note_id, title):
+        draft.saving = False
+        draft.note_id = note_id
+        if draft.deleted:
+            return
+        item = self.update_list_item(note_id, title or UNTITLED)
+        if draft is self.draft:
+            self.current_note_id = note_id
+            self.del_btn.show()
+            self.status_label.setText("✅ 자동 저장됨")
+            if item is not None:
+                self.list_widget.setCurrentItem(item)
+        self.write_draft(draft) # 저장하는 동안 또 고친 내용이 있으면 한 번 더
+        if not draft.saving:
+            self.busy_drafts.pop(note_id, None)
+
+    def on_save_failed(self, draft, title, content, error):
+        print("노트 저장 실패:", error)
+        draft.failed(title, content)
+        if draft is self.draft:
+            self.status_label.setText("⚠️ 저장 실패 - 잠시 후 다시 저장합니다")
+        QTimer.singleShot(AUTOSAVE_DELAY_MS, lambda: self.write_draft(draft))
+
+    def fill_editor(self, title, content):
+        self.title_input.setText(title)
+        self.content_input.setText(content)
+        self.del_btn.show()
+
     def clear_editor(self):
+        self.autosave() # 쓰던 노트는 먼저 저장
+        self.runner.cancel('note') # 아직 불러오는 중인 노트가 새 노트 화면을 덮어쓰지 않도록
+        self.draft = NoteDraft()
         self.current_note_id = None
         self.title_input.clear()
         self.content_input.clear()
+        self.status_label.clear()
         self.del_btn.hide()
         self.list_widget.clearSelection()
 
     def load_note(self, item):
-        self.current_note_id = item.data(Qt.UserRole)
-        title, content = self.db.get_note_content(self.current_note_id)
-        self.title_input.setText(title)
-        self.content_input.setText(content)
-        self.del_btn.show()
+        # 노트를 연달아 눌러도 마지막으로 누른 노트만 열림
+        note_id = item.data(Qt.UserRole)
+        if note_id is None: # '검색 결과 없음' 안내 줄
+            return
+        if note_id == self.current_note_id and self.draft is not None:
+            return # 이미 열려 있는 노트
+        self.autosave()
+        self.current_note_id = note_id
+        self.status_label.clear()
+        busy = self.busy_drafts.get(note_id)
+        if busy is not None:
+            # 아직 저장 중인 노트는 DB에서 읽으면 예전 내용일 수 있으므로 마지막으로 쓴 내용을 그대로 보여줌
+            self.runner.cancel('note')
+            self.draft = busy
+            self.fill_editor(*busy.latest)
+            return
+        self.draft = None # 불러오는 동안엔 자동 저장하지 않음
+        self.runner.submit('note', self.db.get_note_content, note_id,
+                           on_done=lambda result: self.show_note(note_id, *result))
+
+    def show_note(self, note_id, title, content):
+        if note_id != self.current_note_id:
+            return # 불러오는 사이 새 노트/삭제/다른 노트로 바뀜
+        self.draft = NoteDraft(self.current_note_id, title.strip(), content.strip())
+        self.fill_editor(title, content)
 
     def save_current_note(self):
-        title = self.title_input.text().strip()
-        content = self.content_input.toPlainText().strip()
-        if not title:
-            title = "제목 없는 노트"
-            
-        self.db.save_note(title, content, self.current_note_id)
-        self.refresh_list()
-        self.clear_editor() # 저장 후 초기화
+        # 자동 저장을 기다리지 않고 바로 저장한 뒤 새 노트 (바뀐 게 없으면 쓰지 않음)
+        self.clear_editor()
 
     def delete_current_note(self):
         if self.current_note_id:
-            self.db.delete_note(self.current_note_id)
-            self.refresh_list()
-            self.clear_editor()
\ No newline at end of file
+            note_id = self.current_note_id
+            if self.draft is not None:
+                self.draft.deleted = True # 저장이 끝나지 않은 내용은 버림
+            self.draft = None
+            self.busy_drafts.pop(note_id, None)
+            self.runner.submit(None, self.db.delete_note, note_id)
+            self.remove_list_item(note_id)
+            self.clear_editor()
+
+    def go_back(self):
+        self.autosave()
+        self.go_back_signal.emit()
+
+    def hideEvent(self, event):
+        # 다른 화면으로 가거나 창을 닫을 때 쓰던 내용을 잃지 않도록
+        self.autosave()
+        super().hideEvent(event)
\ No newline at end of file
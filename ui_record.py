@@ -1,9 +1,13 @@
 from PyQt5.QtWidgets import (QWidget, QHBoxLayout, QVBoxLayout, QCalendarWidget, 
                              QLabel, QSpinBox, QPushButton, 
-                             QFrame, QGraphicsDropShadowEffect, QScrollArea, QStackedWidget)
+                             QFrame, QGraphicsDropShadowEffect, QScrollArea, QStackedWidget, QMessageBox)
 from PyQt5.QtCore import Qt, QDate, pyqtSignal
-from PyQt5.QtGui import QColor
-from db_supabase import WorkoutDB
+from PyQt5.QtGui import QColor, QTextCharFormat, QBrush
+from db_supabase import get_shared_db, month_range
+from db_worker import DBRunner, Prefetcher
+
+# 🌟 달력 히트맵 색 (그 달 최고 볼륨 대비 25% / 50% / 75% / 100% 까지)
+HEAT_COLORS = ["#EBF8FF", "#BEE3F8", "#90CDF4", "#63B3ED"]
 
 class SetRow(QWidget):
     def __init__(self, set_num, prev_weight=0, prev_reps=0):
@@ -106,9 +110,11 @@ class ExerciseBlock(QFrame):
 class RecordWindow(QWidget):
     go_back_signal = pyqtSignal()
 
-    def __init__(self):
+    def __init__(self, db=None):
         super().__init__()
-        self.db = WorkoutDB()
+        self.db = db or get_shared_db()
+        self.runner = DBRunner(self)
+        self.prefetcher = Prefetcher(self.runner, self.db) # 🚀 고른 날짜 앞뒤 3일을 미리 읽어둠
         self.initUI()
 
     def initUI(self):
@@ -143,6 +149,7 @@ class RecordWindow(QWidget):
         self.calendar.setGridVisible(True)
         self.calendar.setStyleSheet("QCalendarWidget QWidget { background-color: white; } QCalendarWidget QAbstractItemView:enabled { font-size: 14px; selection-background-color: #3182CE; selection-color: white; border-radius: 5px; }")
         self.calendar.clicked[QDate].connect(self.on_date_clicked)
+        self.calendar.currentPageChanged.connect(self.load_month)
         left_layout.addWidget(self.calendar)
         left_layout.addStretch()
 
@@ -218,6 +225,7 @@ class RecordWindow(QWidget):
         main_layout.addWidget(right_card, 6) 
         self.setLayout(main_layout)
         self.on_date_clicked(QDate.currentDate())
+        self.load_month(self.calendar.yearShown(), self.calendar.monthShown())
 
     def create_shadow(self):
         shadow = QGraphicsDropShadowEffect()
@@ -226,12 +234,14 @@ class RecordWindow(QWidget):
         return shadow
 
     def load_tags(self):
+        self.runner.submit('tags', self.db.get_all_exercises, on_done=self.show_tags)
+
+    def show_tags(self, exercises):
         while self.tags_layout.count():
             item = self.tags_layout.takeAt(0)
             widget = item.widget()
             if widget: widget.deleteLater()
         
-        exercises = self.db.get_all_exercises()
         for ex in exercises:
             btn = QPushButton(ex)
             btn.setStyleSheet("QPushButton { background-color: #E2E8F0; color: #2D3748; border-radius: 12px; padding: 8px 12px; font-weight: bold; font-size: 13px; } QPushButton:hover { background-color: #CBD5E0; }")
@@ -258,17 +268,61 @@ class RecordWindow(QWidget):
         self.toggle_btn.setText('➕ 새 운동 추가')
         self.load_records()
 
+    def fetch_month(self, year, month):
+        # 작업 스레드에서 실행: 한 달 활동 요약 1번 + 운동한 달이면 그 달 세트 전체 1번 (날짜별 캐시 채우기)
+        activity = self.db.get_month_activity(year, month)
+        if activity:
+            self.db.prefetch_records(*month_range(year, month))
+        return activity
+
+    def load_month(self, year, month):
+        self.runner.submit('month', self.fetch_month, year, month, on_done=lambda activity: self.show_month(year, month, activity))
+
+    def show_month(self, year, month, activity):
+        self.calendar.setDateTextFormat(QDate(), QTextCharFormat()) # 이전 색칠 지우기
+        if not activity:
+            return
+        max_volume = max(volume for _, volume in activity.values()) or 1
+        for date_str, (sets, volume) in activity.items():
+            level = min(len(HEAT_COLORS) - 1, int(volume / max_volume * len(HEAT_COLORS) - 1e-9))
+            fmt = QTextCharFormat()
+            fmt.setBackground(QBrush(QColor(HEAT_COLORS[max(level, 0)])))
+            fmt.setFontWeight(75)
+            self.calendar.setDateTextFormat(QDate.fromString(str(date_str), 'yyyy-MM-dd'), fmt)
+
+    def reload_month(self):
+        self.load_month(self.calendar.yearShown(), self.calendar.monthShown())
+
     def add_exercise_block(self, exercise_name):
         block = ExerciseBlock(exercise_name)
         self.blocks_layout.addWidget(block)
 
-    def load_records(self):
+    def clear_records_view(self):
         for i in reversed(range(self.view_records_layout.count())):
             widget = self.view_records_layout.itemAt(i).widget()
             if widget:
                 widget.setParent(None)
 
-        records = self.db.get_records_by_date(self.selected_date)
+    def load_records(self):
+        # 🚀 이번 달 활동 요약에 없는 날은 기록이 없다는 뜻이므로 조회하지 않음
+        #    요약은 WorkoutDB 캐시에서만 봄 → 다른 기기/웹/동기화로 기록이 바뀌면 무효화나 TTL 로 사라져 다시 조회함
+        date = QDate.fromString(self.selected_date, 'yyyy-MM-dd')
+        activity = self.db.peek_month_activity(date.year(), date.month())
+        if activity is not None and self.selected_date not in activity:
+            self.runner.cancel('records')
+            self.show_records([])
+            return
+
+        # 🌟 조회는 작업 스레드에서! 날짜를 연달아 눌러도 마지막 날짜 결과만 그려짐
+        self.clear_records_view()
+        loading_label = QLabel("⏳ 기록을 불러오는 중...")
+        loading_label.setStyleSheet("color: #718096; font-size: 16px; margin-top: 20px;")
+        self.view_records_layout.addWidget(loading_label)
+        self.runner.submit('records', self.db.get_records_by_date, self.selected_date, on_done=self.show_records)
+
+    def show_records(self, records):
+        self.prefetcher.around('records', self.selected_date)
+        self.clear_records_view()
         if not records:
             empty_label = QLabel("저장된 기록이 없습니다.\n\n우측 상단의 [➕ 새 운동 추가] 버튼을 눌러보세요!")
             empty_label.setStyleSheet("color: #718096; font-size: 16px; margin-top: 20px;") 
@@ -314,8 +368,13 @@ class RecordWindow(QWidget):
             self.view_records_layout.addWidget(card)
 
     def delete_record_from_db(self, exercise_name):
-        self.db.delete_exercise_records(self.selected_date, exercise_name)
-        self.load_records() 
+        self.runner.submit(None, self.db.delete_exercise_records, self.selected_date, exercise_name,
+                           on_done=lambda _: self.on_records_changed())
+
+    def on_records_changed(self):
+        # 기록이 바뀌면 캐시의 이번 달 요약도 비워지므로 달력 색칠을 다시 불러옴
+        self.reload_month()
+        self.load_records()
 
     def save_workout(self):
         blocks_to_save = []
@@ -325,7 +384,9 @@ class RecordWindow(QWidget):
                 widget = item.widget()
                 if isinstance(widget, ExerciseBlock):
                     blocks_to_save.append(widget)
-                    
+
+        # 🌟 모든 세트를 먼저 모은 뒤 한 번에 저장 (세트마다 DB를 부르지 않음)
+        records = []
         for widget in blocks_to_save:
             exercise = widget.exercise_name
             actual_set_num = 1
@@ -334,10 +395,26 @@ class RecordWindow(QWidget):
                 if isinstance(set_item, SetRow):
                     weight = set_item.weight_input.value()
                     reps = set_item.reps_input.value()
-                    self.db.insert_record(self.selected_date, exercise, actual_set_num, weight, reps)
+                    records.append((self.selected_date, exercise, actual_set_num, weight, reps))
                     actual_set_num += 1
-                    
+
+        self.save_btn.setEnabled(False)
+        self.save_btn.setText('⏳ 저장 중...')
+        self.runner.submit(None, self.db.insert_records, records,
+                           on_done=lambda _: self.on_workout_saved(blocks_to_save),
+                           on_error=self.on_workout_save_failed)
+
+    def on_workout_saved(self, blocks):
+        self.save_btn.setEnabled(True)
+        self.save_btn.setText('선택한 운동 모두 저장하기')
+        for widget in blocks:
             widget.delete_block()
-                
-        self.load_records()
-        self.toggle_mode()
\ No newline at end of file
+
+        self.on_records_changed()
+        self.toggle_mode()
+
+    def on_workout_save_failed(self, error):
+        # 저장 실패 시 아무것도 저장되지 않으므로 입력한 블록을 그대로 남겨둠
+        self.save_btn.setEnabled(True)
+        self.save_btn.setText('선택한 운동 모두 저장하기')
+        QMessageBox.warning(self, "저장 실패", f"운동 기록을 저장하지 못했습니다.\n{error}")
\ No newline at end of file
@@ -0,0 +1,122 @@
+import bisect
+from difflib import SequenceMatcher
+
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyle
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QEvent, pyqtSignal
+from PyQt5.QtGui import QColor
+
+
+class KeyedTableModel(QAbstractTableModel):
+    """줄마다 고유 키(id 등)가 있는 목록을 보여주는 표 모델
+
+    set_rows()는 표를 통째로 다시 만들지 않고 이전 목록과 키를 비교해서
+    새로 생긴 줄만 끼워 넣고, 사라진 줄만 빼고, 값이 바뀐 줄만 다시 그리게 합니다.
+    columns: [(헤더, row → 표시할 값)], key: row → 고유 키
+    """
+
+    def __init__(self, columns, key, parent=None):
+        super().__init__(parent)
+        self.columns = columns
+        self.key = key
+        self.rows = []
+        self.align_center_from = 1
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.columns[section][0]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return self.columns[index.column()][1](self.rows[index.row()])
+        if role == Qt.TextAlignmentRole and index.column() >= self.align_center_from:
+            return Qt.AlignCenter
+        return None
+
+    def row_at(self, row):
+        return self.rows[row]
+
+    def set_rows(self, new_rows):
+        new_rows = list(new_rows)
+        old_keys = [self.key(r) for r in self.rows]
+        new_keys = [self.key(r) for r in new_rows]
+        opcodes = SequenceMatcher(None, old_keys, new_keys, autojunk=False).get_opcodes()
+        # 뒤에서부터 적용해야 앞쪽 줄 번호가 밀리지 않음
+        for tag, i1, i2, j1, j2 in reversed(opcodes):
+            if tag == "equal":
+                self._update_range(i1, new_rows[j1:j2])
+                continue
+            if tag in ("delete", "replace"):
+                self.beginRemoveRows(QModelIndex(), i1, i2 - 1)
+                del self.rows[i1:i2]
+                self.endRemoveRows()
+            if tag in ("insert", "replace"):
+                self.beginInsertRows(QModelIndex(), i1, i1 + (j2 - j1) - 1)
+                self.rows[i1:i1] = new_rows[j1:j2]
+                self.endInsertRows()
+
+    def _update_range(self, start, rows):
+        for offset, row in enumerate(rows):
+            if self.rows[start + offset] != row:
+                self.rows[start + offset] = row
+                self.dataChanged.emit(self.index(start + offset, 0), self.index(start + offset, len(self.columns) - 1))
+
+    def put_row(self, row, sort_key=None):
+        """줄 하나만 반영: 키가 같은 줄이 있으면 그 자리에서 고치고, 없으면 sort_key 순서에 맞는 자리(없으면 맨 끝)에 끼워 넣음"""
+        key = self.key(row)
+        for index, item in enumerate(self.rows):
+            if self.key(item) == key:
+                if sort_key is None or sort_key(item) == sort_key(row):
+                    self._update_range(index, [row])
+                    return
+                # 정렬 기준(이름 등)이 바뀌었으면 빼고 새 자리에 다시 넣음
+                self.beginRemoveRows(QModelIndex(), index, index)
+                del self.rows[index]
+                self.endRemoveRows()
+                break
+        position = len(self.rows) if sort_key is None else bisect.bisect_left([sort_key(r) for r in self.rows], sort_key(row))
+        self.beginInsertRows(QModelIndex(), position, position)
+        self.rows.insert(position, row)
+        self.endInsertRows()
+
+    def remove_key(self, key):
+        """키가 같은 줄 하나만 바로 빼기 (삭제 버튼을 누르자마자 화면에서 지울 때)"""
+        for row, item in enumerate(self.rows):
+            if self.key(item) == key:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self.rows[row]
+                self.endRemoveRows()
+                return item
+        return None
+
+
+class DeleteButtonDelegate(QStyledItemDelegate):
+    """칸마다 버튼 위젯을 만들지 않고 ❌ 글자만 그린 뒤 클릭을 받아 clicked(줄 번호)로 알려줌"""
+    clicked = pyqtSignal(int)
+
+    def __init__(self, parent=None, text="❌", color="#E53E3E"):
+        super().__init__(parent)
+        self.text = text
+        self.color = QColor(color)
+
+    def paint(self, painter, option, index):
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+        painter.save()
+        painter.setPen(self.color)
+        painter.drawText(option.rect, Qt.AlignCenter, self.text)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton and option.rect.contains(event.pos()):
+            self.clicked.emit(index.row())
+            return True
+        return False
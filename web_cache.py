@@ -0,0 +1,222 @@
+import threading
+
+import streamlit as st
+
+from analytics import load_daily, load_multi_daily
+from db_supabase import diet_totals, get_shared_db
+
+# 🌟 Streamlit은 위젯을 만질 때마다 스크립트 전체를 다시 실행하므로 조회 결과를 st.cache_data 에 보관
+#    조회 함수는 (인자 + 버전 번호)로 캐시되고, 쓰기는 영향을 받는 키의 버전만 올려서
+#    그 키만 다음 실행 때 새로 읽게 함 (다른 날짜/종목 캐시는 그대로)
+CACHE_TTL = 300
+# 저장소 테이블 → 그 테이블을 읽는 캐시 키 이름들 (백그라운드 동기화로 테이블 전체가 바뀌었을 때 사용)
+TABLE_KEYS = {
+    "workout_records": ("workout_records", "trend"),
+    "exercises": ("exercises",),
+    "notes": ("notes", "note"),
+    "diet_records": ("diet_records",),
+    "body_weight": ("body_weight",),
+    "meal_templates": ("meal_templates",),
+}
+
+
+@st.cache_resource
+def _versions():
+    # 모든 접속(세션)이 같은 DB를 보므로 버전 표도 프로세스에 하나만 둠
+    versions, lock = {}, threading.Lock()
+
+    def on_backend_change(tables):
+        # 동기화 스레드에서 불리므로 st 함수를 거치지 않고 표를 직접 갱신
+        with lock:
+            for table in tables:
+                for name in TABLE_KEYS.get(table, ()):
+                    versions[(name,)] = versions.get((name,), 0) + 1
+
+    listeners = getattr(get_shared_db().backend, "change_listeners", None)
+    if listeners is not None:
+        listeners.append(on_backend_change)
+    return versions, lock
+
+
+def _version(*key):
+    # (키 이름 전체 버전, 해당 인자 버전) → 둘 중 하나만 올라가도 새 캐시 키가 됨
+    versions, lock = _versions()
+    with lock:
+        return versions.get(key[:1], 0), versions.get(key, 0)
+
+
+def _bump(*key):
+    versions, lock = _versions()
+    with lock:
+        versions[key] = versions.get(key, 0) + 1
+
+
+# --- 조회 (버전 번호는 캐시 키로만 쓰임) ---
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _exercises(version):
+    return get_shared_db().get_all_exercises()
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _records_by_date(date_str, version):
+    return get_shared_db().get_records_by_date(date_str)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _daily(exercise, start_date, end_date, formula, version):
+    return load_daily(get_shared_db(), exercise, start_date, end_date, formula)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _multi_daily(exercises, start_date, end_date, formula, version):
+    return load_multi_daily(get_shared_db(), exercises, start_date, end_date, formula)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _weight(date_str, version):
+    return get_shared_db().get_weight(date_str)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _diet_day(date_str, version):
+    # 하루 합계는 그날 목록으로 바로 계산 (요약 테이블은 기간/추이 조회용)
+    records = get_shared_db().get_diet_by_date(date_str)
+    return records, diet_totals(records)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _meal_templates(version):
+    return get_shared_db().get_meal_templates()
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _notes(version):
+    return get_shared_db().get_all_notes()
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _notes_page(offset, limit, version):
+    return get_shared_db().get_notes_page(offset, limit)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _search_notes(query, version):
+    return get_shared_db().search_notes(query)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _note_content(note_id, version):
+    return get_shared_db().get_note_content(note_id)
+
+
+def get_all_exercises():
+    return _exercises(_version("exercises"))
+
+
+def get_records_by_date(date_str):
+    return _records_by_date(date_str, _version("workout_records", date_str))
+
+
+def get_daily(exercise, start_date, end_date, formula):
+    return _daily(exercise, start_date, end_date, formula, _version("trend", exercise))
+
+
+def get_multi_daily(exercises, start_date, end_date, formula):
+    """여러 종목 {종목: daily} (모두 같은 날짜 index) - 종목 중 하나라도 기록이 바뀌면 새로 읽음"""
+    exercises = tuple(exercises)
+    return _multi_daily(exercises, start_date, end_date, formula, tuple(_version("trend", ex) for ex in exercises))
+
+
+def get_weight(date_str):
+    return _weight(date_str, _version("body_weight", date_str))
+
+
+def get_diet_day(date_str):
+    """(그날 먹은 음식 목록, (칼로리, 탄, 단, 지) 합계)"""
+    return _diet_day(date_str, _version("diet_records", date_str))
+
+
+def get_meal_templates():
+    return _meal_templates(_version("meal_templates"))
+
+
+def get_all_notes():
+    return _notes(_version("notes"))
+
+
+def get_notes_page(offset, limit):
+    """([(id, 제목, 본문 앞부분, 잘렸는지)], 전체 노트 수)"""
+    return _notes_page(offset, limit, _version("notes"))
+
+
+def search_notes(query):
+    """[(id, 제목, 찾은 부분 【】 표시)] - 노트를 저장/삭제하면 새로 검색"""
+    return _search_notes(query, _version("notes"))
+
+
+def get_note_content(note_id):
+    return _note_content(note_id, _version("note", note_id))
+
+
+# --- 쓰기: DB에 저장한 뒤 영향받는 키만 버전 올리기 ---
+def insert_records(records):
+    get_shared_db().insert_records(records)
+    for date_str, exercise in {(r[0], r[1]) for r in records}:
+        _bump("workout_records", date_str)
+        _bump("trend", exercise)
+
+
+def delete_exercise_records(date_str, exercise):
+    get_shared_db().delete_exercise_records(date_str, exercise)
+    _bump("workout_records", date_str)
+    _bump("trend", exercise)
+
+
+def insert_exercise(name):
+    get_shared_db().insert_exercise(name)
+    _bump("exercises")
+
+
+def delete_exercise(name):
+    get_shared_db().delete_exercise(name)
+    _bump("exercises")
+
+
+def save_weight(date_str, weight):
+    get_shared_db().save_weight(date_str, weight)
+    _bump("body_weight", date_str)
+
+
+def insert_diet(date_str, meal_type, food_name, cal, carbs, pro, fat):
+    get_shared_db().insert_diet(date_str, meal_type, food_name, cal, carbs, pro, fat)
+    _bump("diet_records", date_str)
+
+
+def log_meal_template(date_str, name, meal_type=None):
+    # WorkoutDB 가 그날 목록/합계 캐시에 새 줄을 더해 두므로 다음 실행의 get_diet_day 는 쿼리 없이 채워짐
+    rows = get_shared_db().log_meal_template(date_str, name, meal_type)
+    _bump("diet_records", date_str)
+    return rows
+
+
+def save_meal_template(name, meal_type, items):
+    get_shared_db().save_meal_template(name, meal_type, items)
+    _bump("meal_templates")
+
+
+def delete_meal_template(name):
+    get_shared_db().delete_meal_template(name)
+    _bump("meal_templates")
+
+
+def save_note(title, content, note_id=None):
+    note_id = get_shared_db().save_note(title, content, note_id)
+    _bump("notes")
+    _bump("note", note_id)
+    return note_id
+
+
+def delete_note(note_id):
+    get_shared_db().delete_note(note_id)
+    _bump("notes")
+    _bump("note", note_id)